@@ -1,13 +1,16 @@
 import time
 import requests
 import os
+import sys
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+
+# ChromeDriver 경로 결정은 크롤러와 같은 캐시 사용 (scripts/chromedriver_resolver.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+import chromedriver_resolver
 
 # ==========================================
 # 1. 설정 정보 (사용자 환경에 맞게 수정)
@@ -28,7 +31,7 @@ options = webdriver.ChromeOptions()
 options.add_argument("--start-maximized") # 창 최대화
 options.add_argument("--ignore-certificate-errors") # 인증서 에러 무시
 
-driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+driver = chromedriver_resolver.start_chrome(options)
 wait = WebDriverWait(driver, 20) # 대기 시간 20초로 넉넉하게 설정
 
 # Basic Auth 우회 접속
@@ -4,8 +4,11 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 import time
 
+import browser_profile
+
 options = Options()
-options.add_experimental_option("debuggerAddress", "127.0.0.1:9222")
+# 접속 주소: --debugger host:port 인자 > CRAWLER_DEBUGGER_ADDRESS > 127.0.0.1:9222
+options.add_experimental_option("debuggerAddress", browser_profile.debugger_address())
 
 try:
     driver = webdriver.Chrome(options=options)
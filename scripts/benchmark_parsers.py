@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+리뷰/Q&A 파서 오프라인 벤치마크
+저장해 둔 실제 페이지(debug_*.html)로 추출 비용을 측정합니다. 네이버에 접속하지 않습니다.
+
+측정 항목:
+    review-html/<백엔드>  - review_html_parser.parse_reviews (selectolax / lxml / bs4)
+    drission-js           - naver_review_drission.EXTRACT_REVIEWS_JS (로컬 헤드리스 크롬에서 실행)
+    qna-html              - naver_qna_remote.parse_qna_html
+
+각 항목마다 ms/page(중앙값), reviews/sec, 최대 메모리를 보고하고
+기준값(parser_benchmark_baseline.json)과 비교합니다.
+최대 메모리는 tracemalloc 기준이라 파이썬 힙만 잡힙니다 (lxml의 C 메모리는 제외).
+
+사용법:
+    python benchmark_parsers.py                     # 측정 후 기준값과 비교
+    python benchmark_parsers.py --save-baseline     # 현재 결과를 기준값으로 저장
+    python benchmark_parsers.py --repeat 10 --backend selectolax,bs4 --no-browser
+
+    --threshold N: 기준값보다 N% 이상 느려지면 종료 코드 1 (기본 25)
+"""
+
+import sys
+import json
+import time
+import platform
+import statistics
+import tracemalloc
+from pathlib import Path
+
+import review_html_parser
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+REVIEW_FIXTURES = [
+    'debug_review_page.html',
+    'scripts/debug_review_page.html',
+    'scripts/debug_drission_page.html',
+]
+QNA_FIXTURES = [
+    'page_after_qna_click.html',
+    'debug_page.html',
+]
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'parser_benchmark_baseline.json'
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 25
+MIN_REGRESSION_MS = 1.0  # 1ms 미만의 차이는 측정 오차로 간주
+
+
+def log(message):
+    print(message, file=sys.stderr, flush=True)
+
+
+def load_fixture(name):
+    return (ROOT / name).read_text(encoding='utf-8')
+
+
+def measure(func, repeat, trace_memory=True):
+    """func()를 repeat번 실행하여 시간/결과 수/최대 메모리 측정"""
+    count = len(func())  # 워밍업 (import, 캐시 등 1회성 비용 제외)
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    peak_kb = None
+    if trace_memory:
+        # tracemalloc은 실행을 느리게 하므로 시간 측정과 별도로 1회 실행
+        tracemalloc.start()
+        try:
+            func()
+            peak_kb = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        finally:
+            tracemalloc.stop()
+
+    ms_per_page = statistics.median(timings)
+    return {
+        "items": count,
+        "ms_per_page": round(ms_per_page, 2),
+        "ms_min": round(min(timings), 2),
+        "items_per_sec": round(count / (ms_per_page / 1000), 1) if ms_per_page and count else 0.0,
+        "peak_kb": peak_kb,
+    }
+
+
+def bench_review_html(fixtures, backends, repeat):
+    results = {}
+    for backend_name in backends:
+        try:
+            backend = review_html_parser.get_backend(backend_name)
+        except ImportError as e:
+            log(f"[BENCH] review-html/{backend_name}: 건너뜀 ({e})")
+            continue
+        for name, html in fixtures.items():
+            key = f"review-html/{backend_name}:{name}"
+            results[key] = measure(lambda: review_html_parser.parse_reviews(html, backend), repeat)
+            log_result(key, results[key])
+    return results
+
+
+def bench_drission_js(fixtures, repeat):
+    """저장된 페이지를 헤드리스 크롬에 띄우고 EXTRACT_REVIEWS_JS 실행 시간 측정"""
+    try:
+        from DrissionPage import ChromiumPage, ChromiumOptions
+        from naver_review_drission import EXTRACT_REVIEWS_JS
+    except ImportError as e:
+        log(f"[BENCH] drission-js: 건너뜀 ({e})")
+        return {}
+
+    results = {}
+    page = None
+    try:
+        options = ChromiumOptions()
+        options.headless()
+        options.auto_port()
+        page = ChromiumPage(options)
+        for name in fixtures:
+            page.get((ROOT / name).as_uri())
+            key = f"drission-js:{name}"
+            # 브라우저 안에서 실행되므로 파이썬 메모리는 의미가 없음
+            results[key] = measure(lambda: page.run_js(EXTRACT_REVIEWS_JS) or [], repeat, trace_memory=False)
+            log_result(key, results[key])
+    except Exception as e:
+        log(f"[BENCH] drission-js: 브라우저 실행 실패로 건너뜀 ({' '.join(str(e).split())})")
+    finally:
+        if page is not None:
+            page.quit()
+    return results
+
+
+def bench_qna_html(fixtures, repeat):
+    try:
+        from naver_qna_remote import parse_qna_html
+    except ImportError as e:
+        log(f"[BENCH] qna-html: 건너뜀 ({e})")
+        return {}
+
+    results = {}
+    for name, html in fixtures.items():
+        key = f"qna-html:{name}"
+        results[key] = measure(lambda: parse_qna_html(html), repeat)
+        log_result(key, results[key])
+    return results
+
+
+def log_result(key, result):
+    peak = f"{result['peak_kb'] / 1024:.1f}MB" if result['peak_kb'] is not None else "-"
+    log(f"[BENCH] {key:<58} {result['items']:>3} items  {result['ms_per_page']:>9.2f} ms/page  "
+        f"{result['items_per_sec']:>9.1f} items/s  peak {peak}")
+
+
+def compare(results, baseline, threshold):
+    """기준값 대비 변화율. threshold% 이상 느려진 항목을 regressions로 반환"""
+    comparison = {}
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        change = (result['ms_per_page'] - base['ms_per_page']) / base['ms_per_page'] * 100 if base['ms_per_page'] else 0.0
+        entry = {
+            "baseline_ms_per_page": base['ms_per_page'],
+            "ms_per_page": result['ms_per_page'],
+            "change_pct": round(change, 1),
+        }
+        # 추출 건수가 바뀌면 속도보다 먼저 파서 동작이 바뀐 것
+        if result['items'] != base['items']:
+            entry["items_changed"] = [base['items'], result['items']]
+        comparison[key] = entry
+        slower_ms = result['ms_per_page'] - base['ms_per_page']
+        if (change >= threshold and slower_ms >= MIN_REGRESSION_MS) or "items_changed" in entry:
+            regressions.append(key)
+    return comparison, regressions
+
+
+def main():
+    repeat = DEFAULT_REPEAT
+    threshold = DEFAULT_THRESHOLD
+    backends = list(review_html_parser.BACKENDS)
+    save_baseline = False
+    use_browser = True
+
+    # 인자 파싱
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] == '--repeat' and i + 1 < len(sys.argv):
+            repeat = max(1, int(sys.argv[i + 1]))
+            i += 2
+        elif sys.argv[i] == '--threshold' and i + 1 < len(sys.argv):
+            threshold = float(sys.argv[i + 1])
+            i += 2
+        elif sys.argv[i] == '--backend' and i + 1 < len(sys.argv):
+            backends = [b.strip() for b in sys.argv[i + 1].split(',') if b.strip()]
+            i += 2
+        elif sys.argv[i] == '--save-baseline':
+            save_baseline = True
+            i += 1
+        elif sys.argv[i] == '--no-browser':
+            use_browser = False
+            i += 1
+        else:
+            i += 1
+
+    review_fixtures = {name: load_fixture(name) for name in REVIEW_FIXTURES if (ROOT / name).exists()}
+    qna_fixtures = {name: load_fixture(name) for name in QNA_FIXTURES if (ROOT / name).exists()}
+
+    results = {}
+    results.update(bench_review_html(review_fixtures, backends, repeat))
+    if use_browser:
+        results.update(bench_drission_js(review_fixtures, repeat))
+    results.update(bench_qna_html(qna_fixtures, repeat))
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+    regressions = []
+    if save_baseline:
+        BASELINE_PATH.write_text(json.dumps(report, ensure_ascii=False, indent=2) + '\n', encoding='utf-8')
+        log(f"[BENCH] 기준값 저장: {BASELINE_PATH}")
+    elif BASELINE_PATH.exists():
+        baseline = json.loads(BASELINE_PATH.read_text(encoding='utf-8'))
+        report["comparison"], regressions = compare(results, baseline.get("results", {}), threshold)
+        for key, entry in report["comparison"].items():
+            mark = " <-- REGRESSION" if key in regressions else ""
+            log(f"[BENCH] {key:<58} {entry['change_pct']:+7.1f}%{mark}")
+        report["regressions"] = regressions
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
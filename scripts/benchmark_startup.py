@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+크롤러 진입점 기동 시간 벤치마크 (python -X importtime)
+각 진입점 모듈을 새 파이썬 프로세스에서 import하여 누적 import 시간을 측정하고,
+진입점별 시간 예산과 "불러오면 안 되는 패키지" 규칙을 검사합니다. 네이버에 접속하지 않습니다.
+
+규칙:
+    - 시간 예산(budget_ms): 모듈 import 누적 시간의 중앙값이 예산을 넘으면 실패
+    - forbidden: 해당 진입점을 import만 했는데 불러와진 무거운 패키지 (예: API 크롤러의 selenium)
+    - import 시점에 sys.stdout/sys.stderr를 바꾸면 실패 (출력 재설정은 __main__에서만)
+
+사용법:
+    python benchmark_startup.py                       # 모든 진입점 측정
+    python benchmark_startup.py --repeat 10 --only naver_review_api_crawler,crawl_batch
+
+    --budget-scale F: 느린 머신에서 모든 예산에 F배 적용 (기본 1.0)
+"""
+
+import os
+import sys
+import json
+import platform
+import statistics
+import subprocess
+from pathlib import Path
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+DEFAULT_REPEAT = 5
+
+# 브라우저/HTML 파서 스택 (해당 백엔드를 고를 때만 불러와야 함)
+BROWSER_STACK = ('selenium', 'webdriver_manager', 'DrissionPage', 'playwright', 'bs4')
+
+# 진입점 모듈 -> 예산과 금지 패키지
+ENTRY_POINTS = {
+    # API 크롤링은 브라우저 없이 동작
+    'naver_review_api_crawler': {'budget_ms': 150, 'forbidden': BROWSER_STACK},
+    # 통합 CLI, 일괄/워커/저장 스크립트는 백엔드를 고른 뒤에 불러옴 (--help는 즉시)
+    'naver_crawl.cli': {'budget_ms': 150, 'forbidden': BROWSER_STACK + ('requests',)},
+    'crawl_batch': {'budget_ms': 150, 'forbidden': BROWSER_STACK + ('requests',)},
+    'crawl_worker': {'budget_ms': 150, 'forbidden': BROWSER_STACK + ('requests',)},
+    'crawl_and_save_reviews': {'budget_ms': 150, 'forbidden': BROWSER_STACK + ('requests',)},
+    'save_reviews_to_db': {'budget_ms': 100, 'forbidden': BROWSER_STACK + ('requests',)},
+    # test_crawler.py가 crawl_naver_qna만 가져오는 경로
+    'naver_crawler': {'budget_ms': 50, 'forbidden': BROWSER_STACK + ('requests',)},
+    # 브라우저 백엔드 자체 (무거운 import는 허용, 회귀만 감시)
+    'naver_review_crawler': {'budget_ms': 1500, 'forbidden': ('DrissionPage', 'playwright', 'bs4')},
+    'naver_review_drission': {'budget_ms': 1500, 'forbidden': ('selenium', 'playwright', 'bs4')},
+    'naver_qna_crawler': {'budget_ms': 1500, 'forbidden': ('DrissionPage', 'playwright')},
+    'naver_crawler_simple': {'budget_ms': 1500, 'forbidden': ('DrissionPage', 'playwright')},
+}
+
+# import 전후로 표준 스트림이 바뀌었는지 확인 (바뀌었으면 종료 코드 3)
+STREAM_CHECK = (
+    "import sys; out, err = sys.stdout, sys.stderr; import {module}; "
+    "sys.exit(0 if sys.stdout is out and sys.stderr is err else 3)"
+)
+
+
+def log(message):
+    print(message, file=sys.stderr, flush=True)
+
+
+def parse_importtime(stderr, module):
+    """-X importtime 출력에서 모듈의 누적 시간(ms), 불러온 최상위 패키지, 직접 import한 느린 모듈 추출"""
+    rows = []
+    for line in stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package" 형식, 이름 앞 공백이 중첩 깊이
+        parts = line[len('import time:'):].split('|') if line.startswith('import time:') else []
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        _, cumulative_us, name = parts
+        depth = len(name) - len(name.lstrip())
+        rows.append((depth, name.strip(), int(cumulative_us)))
+
+    packages = {name.split('.')[0] for _, name, _ in rows}
+    target = next(((i, row) for i, row in enumerate(rows) if row[1] == module), None)
+    if target is None:
+        return None, packages, []
+    index, (depth, _, cumulative_us) = target
+
+    # importtime은 자식 모듈을 부모보다 먼저 출력하므로 거꾸로 올라가며 직접 자식을 수집
+    children = []
+    for child_depth, name, child_us in reversed(rows[:index]):
+        if child_depth <= depth:
+            break
+        if child_depth == depth + 2:
+            children.append((name, round(child_us / 1000, 2)))
+    children.sort(key=lambda pair: -pair[1])
+    return cumulative_us / 1000, packages, children[:5]
+
+
+def measure(module, repeat):
+    """새 프로세스에서 repeat번 import하여 누적 시간 중앙값과 불러온 패키지 목록 반환"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    timings = []
+    packages = set()
+    slowest = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=SCRIPTS_DIR, capture_output=True, text=True, env=env
+        )
+        if completed.returncode:
+            error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'import 실패'
+            return {"error": error}
+        ms, packages, slowest = parse_importtime(completed.stderr, module)
+        if ms is None:
+            return {"error": "importtime 출력에서 모듈을 찾지 못함"}
+        timings.append(ms)
+
+    stream_check = subprocess.run(
+        [sys.executable, '-c', STREAM_CHECK.format(module=module)],
+        cwd=SCRIPTS_DIR, capture_output=True, text=True, env=env
+    )
+    return {
+        "ms": round(statistics.median(timings), 2),
+        "ms_min": round(min(timings), 2),
+        "packages": packages,
+        "slowest_imports": slowest,
+        "rewraps_streams": stream_check.returncode == 3,
+    }
+
+
+def check(module, spec, result, budget_scale):
+    """규칙 위반 목록"""
+    if "error" in result:
+        return [result["error"]]
+    violations = []
+    budget = spec['budget_ms'] * budget_scale if spec['budget_ms'] else None
+    if budget and result['ms'] > budget:
+        violations.append(f"예산 초과 {result['ms']:.1f}ms > {budget:.0f}ms")
+    loaded = sorted(set(spec['forbidden']) & result['packages'])
+    if loaded:
+        violations.append(f"금지 패키지 import: {', '.join(loaded)}")
+    if result['rewraps_streams']:
+        violations.append("import 시점에 sys.stdout/sys.stderr 변경")
+    return violations
+
+
+def main():
+    repeat = DEFAULT_REPEAT
+    budget_scale = 1.0
+    only = None
+
+    # 인자 파싱
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] == '--repeat' and i + 1 < len(sys.argv):
+            repeat = max(1, int(sys.argv[i + 1]))
+            i += 2
+        elif sys.argv[i] == '--budget-scale' and i + 1 < len(sys.argv):
+            budget_scale = float(sys.argv[i + 1])
+            i += 2
+        elif sys.argv[i] == '--only' and i + 1 < len(sys.argv):
+            only = [m.strip() for m in sys.argv[i + 1].split(',') if m.strip()]
+            i += 2
+        else:
+            i += 1
+
+    modules = only or list(ENTRY_POINTS)
+    results = {}
+    failures = {}
+    for module in modules:
+        # 목록에 없는 모듈은 측정만 (예산/금지 패키지 없음)
+        spec = ENTRY_POINTS.get(module, {'budget_ms': None, 'forbidden': ()})
+        result = measure(module, repeat)
+        violations = check(module, spec, result, budget_scale)
+        result.pop("packages", None)
+        result["budget_ms"] = spec['budget_ms'] * budget_scale if spec['budget_ms'] else None
+        results[module] = result
+        if violations:
+            failures[module] = violations
+        status = "FAIL" if violations else "ok  "
+        ms = f"{result['ms']:>8.1f}ms" if "ms" in result else "       -  "
+        budget = f"{result['budget_ms']:.0f}ms" if result['budget_ms'] else "-"
+        log(f"[STARTUP] {status} {module:<28} {ms}  (budget {budget})"
+            + (f"  - {'; '.join(violations)}" if violations else ""))
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+        "failures": failures,
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
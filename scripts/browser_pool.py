@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+크롤러 공용 브라우저 풀
+브라우저를 매번 새로 띄우지 않고 이미 실행 중인 인스턴스를 빌려 쓰고 반납합니다.
+
+- 풀 크기: 동시에 살아있을 수 있는 브라우저 수 (CRAWLER_POOL_SIZE, 기본 2)
+  브라우저마다 디버깅 포트와 임시 프로필을 따로 쓰므로 동시에 띄워도 충돌하지 않음
+- 상태 점검: 빌려줄 때마다 health check를 실행하고 실패하면 새로 띄움
+- 재활용: N 페이지 처리 후(CRAWLER_POOL_MAX_PAGES) 또는 메모리(RSS)가
+  임계값(CRAWLER_POOL_MAX_RSS_MB)을 넘으면 반납 시점에 종료
+
+사용 예:
+    pool = get_pool('drission', create_page)
+    with pool.checkout() as lease:
+        page = lease.browser
+        page.get(url)
+        lease.pages += 1
+"""
+
+import os
+import sys
+import time
+import atexit
+import threading
+from contextlib import contextmanager
+
+import browser_profile
+
+
+DEFAULT_POOL_SIZE = int(os.environ.get('CRAWLER_POOL_SIZE', '2'))
+DEFAULT_MAX_PAGES = int(os.environ.get('CRAWLER_POOL_MAX_PAGES', '50'))
+DEFAULT_MAX_RSS_MB = int(os.environ.get('CRAWLER_POOL_MAX_RSS_MB', '1500'))
+
+
+def default_health_check(browser):
+    """브라우저가 응답하는지 확인 (DrissionPage / Selenium 모두 지원)"""
+    if hasattr(browser, 'run_js'):
+        return browser.run_js('return 1') == 1
+    if hasattr(browser, 'execute_script'):
+        return browser.execute_script('return 1') == 1
+    return True
+
+
+def default_closer(browser):
+    """브라우저 종료 (인스턴스 전용 임시 프로필이 있으면 함께 삭제)"""
+    browser_profile.quit_browser(browser)
+
+
+def browser_pid(browser):
+    """브라우저(또는 드라이버) 프로세스 ID 추출"""
+    # DrissionPage
+    pid = getattr(browser, 'process_id', None)
+    if pid:
+        return pid
+    # Selenium (chromedriver 프로세스, 크롬은 자식 프로세스)
+    try:
+        return browser.service.process.pid
+    except Exception:
+        return None
+
+
+def browser_rss_mb(browser):
+    """브라우저 프로세스 트리의 RSS 합계(MB). psutil이 없으면 None"""
+    pid = browser_pid(browser)
+    if not pid:
+        return None
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        proc = psutil.Process(pid)
+        procs = [proc] + proc.children(recursive=True)
+        total = 0
+        for p in procs:
+            try:
+                total += p.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total / (1024 * 1024)
+    except Exception:
+        return None
+
+
+class Lease:
+    """풀에서 빌린 브라우저. pages에 처리한 페이지 수를 누적"""
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.pages = 0
+        self.total_pages = 0
+        self.created_at = time.time()
+        self.broken = False
+
+
+class BrowserPool:
+    """브라우저 인스턴스 풀"""
+
+    def __init__(self, factory, size=DEFAULT_POOL_SIZE, max_pages=DEFAULT_MAX_PAGES,
+                 max_rss_mb=DEFAULT_MAX_RSS_MB, health_check=default_health_check,
+                 closer=default_closer):
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.health_check = health_check
+        self.closer = closer
+        self.idle = []
+        self.in_use = 0
+        self.closed = False
+        self.cond = threading.Condition()
+
+    def acquire(self, timeout=None):
+        """브라우저 대여. 모두 사용 중이면 반납될 때까지 대기"""
+        deadline = None if timeout is None else time.time() + timeout
+        with self.cond:
+            while True:
+                if self.closed:
+                    raise RuntimeError("브라우저 풀이 종료되었습니다.")
+                if self.idle:
+                    lease = self.idle.pop()
+                    self.in_use += 1
+                    break
+                if self.in_use < self.size:
+                    lease = None
+                    self.in_use += 1
+                    break
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("사용 가능한 브라우저가 없습니다.")
+                self.cond.wait(remaining)
+
+        try:
+            # 놀고 있던 브라우저는 상태 점검 후 대여, 실패하면 새로 실행
+            if lease is not None and not self._healthy(lease):
+                self._close(lease)
+                lease = None
+            if lease is None:
+                lease = Lease(self.factory())
+        except Exception:
+            with self.cond:
+                self.in_use -= 1
+                self.cond.notify()
+            raise
+
+        lease.pages = 0
+        return lease
+
+    def release(self, lease):
+        """브라우저 반납. 재활용 기준을 넘었으면 종료"""
+        lease.total_pages += lease.pages
+        lease.pages = 0
+
+        retire = lease.broken or self.closed
+        if not retire and self.max_pages and lease.total_pages >= self.max_pages:
+            retire = True
+        if not retire and self.max_rss_mb:
+            rss = browser_rss_mb(lease.browser)
+            if rss is not None and rss >= self.max_rss_mb:
+                retire = True
+
+        if retire:
+            self._close(lease)
+
+        with self.cond:
+            self.in_use -= 1
+            if not retire:
+                self.idle.append(lease)
+            self.cond.notify()
+
+    @contextmanager
+    def checkout(self, timeout=None):
+        """with 문으로 대여/반납. 예외가 나면 해당 브라우저는 폐기"""
+        lease = self.acquire(timeout)
+        try:
+            yield lease
+        except Exception:
+            lease.broken = True
+            raise
+        finally:
+            self.release(lease)
+
+    def close(self):
+        """놀고 있는 브라우저를 모두 종료 (사용 중인 것은 반납 시 종료)"""
+        with self.cond:
+            self.closed = True
+            idle, self.idle = self.idle, []
+            self.cond.notify_all()
+        for lease in idle:
+            self._close(lease)
+
+    def _healthy(self, lease):
+        if not self.health_check:
+            return True
+        try:
+            return bool(self.health_check(lease.browser))
+        except Exception:
+            return False
+
+    def _close(self, lease):
+        try:
+            self.closer(lease.browser)
+        except Exception as e:
+            print(f"[POOL] Failed to close browser: {e}", file=sys.stderr)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name, factory, **kwargs):
+    """이름별 프로세스 공용 풀 반환 (없으면 생성)"""
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None or pool.closed:
+            pool = BrowserPool(factory, **kwargs)
+            _pools[name] = pool
+        return pool
+
+
+def close_all_pools():
+    """모든 풀 종료 (프로세스 종료 시 자동 호출)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(close_all_pools)
@@ -0,0 +1,361 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+브라우저 인스턴스 격리 (디버깅 포트, 임시 프로필)
+크롤러를 여러 개 동시에 실행해도 서로의 브라우저에 붙거나 프로필 잠금으로 충돌하지 않도록
+인스턴스마다 비어 있는 포트와 임시 user-data-dir을 새로 할당하고, 종료 시 프로필을 삭제합니다.
+
+- free_port: OS가 골라 준 빈 로컬 포트
+- create_profile_dir / remove_profile_dir: 임시 프로필 생성/삭제 (비정상 종료로 남은 오래된 프로필도 정리)
+- quit_browser: 브라우저 종료 후 연결된 임시 프로필 삭제 (browser_pool의 기본 종료 함수)
+- debugger_address: 이미 실행 중인 크롬에 붙는 스크립트의 접속 주소
+  (--debugger host:port 인자 > CRAWLER_DEBUGGER_ADDRESS > 127.0.0.1:9222)
+
+영구 프로필 모드 (CRAWLER_PERSISTENT_PROFILE=1, 선택):
+    임시 프로필 대신 PROFILE_ROOT 아래의 프로필 슬롯(profile-0, profile-1, ...)을 잠금 파일로
+    하나씩 빌려 씁니다. 디스크 캐시가 남아 있으므로 두 번째 상품부터는 네이버 JS/CSS를 다시 받지 않습니다.
+    - 디스크 캐시 크기 제한: CRAWLER_DISK_CACHE_MB (기본 200), 슬롯이 제한의 1.5배를 넘으면 캐시 폴더 삭제
+    - 오래 쓰지 않은 슬롯(PROFILE_MAX_AGE)은 삭제
+    - 쿠키는 cookies.json에 모아 두고 브라우저 시작 시 주입, 크롤링 후/종료 시 저장
+      requests 세션도 같은 쿠키를 사용 (apply_cookie_jar)
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import shutil
+import socket
+import tempfile
+import threading
+
+
+DEFAULT_DEBUGGER_ADDRESS = '127.0.0.1:9222'
+
+PERSISTENT = os.environ.get('CRAWLER_PERSISTENT_PROFILE') == '1'
+PROFILE_ROOT = os.environ.get(
+    'CRAWLER_PROFILE_ROOT',
+    os.path.join(os.path.dirname(__file__), '..', 'prisma', 'prisma', 'browser_profiles')
+)
+COOKIE_JAR_PATH = os.path.join(PROFILE_ROOT, 'cookies.json')
+DISK_CACHE_MB = int(os.environ.get('CRAWLER_DISK_CACHE_MB', '200'))
+MAX_PROFILE_SLOTS = 8
+PROFILE_MAX_AGE = 14 * 24 * 3600  # 이 기간 동안 쓰지 않은 슬롯은 삭제
+# 잠금 파일이 이보다 오래되었고 프로세스도 확인할 수 없으면 비정상 종료로 보고 해제
+STALE_LOCK_SECONDS = 6 * 3600
+LOCK_NAME = '.crawler.lock'
+
+PROFILE_PREFIX = 'naver-crawler-profile-'
+# 이 시간보다 오래된 임시 프로필은 비정상 종료로 남은 것으로 보고 삭제
+STALE_PROFILE_SECONDS = 24 * 3600
+
+_profiles = set()
+_slots = set()       # 이 프로세스가 잠근 영구 프로필 슬롯
+_lock = threading.Lock()
+_stale_checked = False
+
+
+def free_port(host='127.0.0.1'):
+    """비어 있는 로컬 TCP 포트 번호"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def debugger_address(argv=None):
+    """기존 크롬(remote debugging)에 붙을 주소"""
+    argv = sys.argv if argv is None else argv
+    if '--debugger' in argv:
+        idx = argv.index('--debugger')
+        if idx + 1 < len(argv):
+            return argv[idx + 1]
+    return os.environ.get('CRAWLER_DEBUGGER_ADDRESS') or DEFAULT_DEBUGGER_ADDRESS
+
+
+def create_profile_dir():
+    """인스턴스 전용 임시 프로필 폴더 생성 (프로세스 종료 시 자동 삭제)"""
+    remove_stale_profiles()
+    path = tempfile.mkdtemp(prefix=PROFILE_PREFIX)
+    with _lock:
+        _profiles.add(path)
+    return path
+
+
+def remove_profile_dir(path, retries=5):
+    """프로필 폴더 삭제 (크롬 하위 프로세스가 파일을 잠시 잡고 있으면 재시도)"""
+    if not path:
+        return
+    for attempt in range(retries):
+        try:
+            shutil.rmtree(path)
+            break
+        except FileNotFoundError:
+            break
+        except OSError:
+            time.sleep(0.2 * (attempt + 1))
+    else:
+        shutil.rmtree(path, ignore_errors=True)
+    with _lock:
+        _profiles.discard(path)
+
+
+def remove_stale_profiles():
+    """이전 실행에서 정리되지 못한 오래된 임시 프로필 삭제 (프로세스당 한 번)"""
+    global _stale_checked
+    with _lock:
+        if _stale_checked:
+            return
+        _stale_checked = True
+    root = tempfile.gettempdir()
+    now = time.time()
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return
+    for name in names:
+        if not name.startswith(PROFILE_PREFIX):
+            continue
+        path = os.path.join(root, name)
+        try:
+            if now - os.path.getmtime(path) > STALE_PROFILE_SECONDS:
+                shutil.rmtree(path, ignore_errors=True)
+        except OSError:
+            continue
+
+
+def _dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                continue
+    return total
+
+
+def _pid_alive(pid):
+    """프로세스 생존 여부 (psutil이 없으면 None = 알 수 없음)"""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.pid_exists(pid)
+
+
+def _try_lock(slot_dir):
+    """슬롯 잠금 파일 생성. 이미 다른 프로세스가 쓰고 있으면 False"""
+    lock_path = os.path.join(slot_dir, LOCK_NAME)
+    for _ in range(2):
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                with open(lock_path, encoding='utf-8') as f:
+                    pid = int(f.read().strip() or 0)
+                age = time.time() - os.path.getmtime(lock_path)
+            except (OSError, ValueError):
+                pid, age = 0, STALE_LOCK_SECONDS + 1
+            alive = _pid_alive(pid) if pid else False
+            if alive or (alive is None and age < STALE_LOCK_SECONDS):
+                return False
+            # 비정상 종료로 남은 잠금
+            try:
+                os.remove(lock_path)
+            except OSError:
+                return False
+            continue
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(str(os.getpid()))
+        return True
+    return False
+
+
+def prune_profiles():
+    """오래 쓰지 않은 슬롯 삭제, 디스크 캐시가 제한을 크게 넘은 슬롯은 캐시만 삭제"""
+    try:
+        names = os.listdir(PROFILE_ROOT)
+    except OSError:
+        return
+    now = time.time()
+    for name in names:
+        slot_dir = os.path.join(PROFILE_ROOT, name)
+        if not name.startswith('profile-') or os.path.exists(os.path.join(slot_dir, LOCK_NAME)):
+            continue
+        try:
+            if now - os.path.getmtime(slot_dir) > PROFILE_MAX_AGE:
+                shutil.rmtree(slot_dir, ignore_errors=True)
+                continue
+        except OSError:
+            continue
+        if _dir_size(slot_dir) > DISK_CACHE_MB * 1024 * 1024 * 1.5:
+            for cache_name in ('Default/Cache', 'Default/Code Cache', 'Cache', 'ShaderCache', 'GrShaderCache'):
+                shutil.rmtree(os.path.join(slot_dir, cache_name), ignore_errors=True)
+
+
+def acquire_profile_dir():
+    """브라우저 인스턴스용 프로필 폴더. (경로, 영구 슬롯 여부) 반환
+
+    영구 모드가 아니거나 모든 슬롯이 사용 중이면 임시 프로필을 만듭니다.
+    """
+    if not PERSISTENT:
+        return create_profile_dir(), False
+    try:
+        os.makedirs(PROFILE_ROOT, exist_ok=True)
+        prune_profiles()
+        for slot in range(MAX_PROFILE_SLOTS):
+            slot_dir = os.path.join(PROFILE_ROOT, f'profile-{slot}')
+            os.makedirs(slot_dir, exist_ok=True)
+            if _try_lock(slot_dir):
+                os.utime(slot_dir)
+                with _lock:
+                    _slots.add(slot_dir)
+                return slot_dir, True
+    except OSError as e:
+        print(f"[PROFILE] Persistent profile unavailable: {e}", file=sys.stderr)
+    return create_profile_dir(), False
+
+
+def release_profile_dir(path, persistent):
+    """acquire_profile_dir로 받은 프로필 반납 (영구 슬롯은 잠금만 해제, 임시 프로필은 삭제)"""
+    if not persistent:
+        remove_profile_dir(path)
+        return
+    try:
+        os.remove(os.path.join(path, LOCK_NAME))
+    except OSError:
+        pass
+    with _lock:
+        _slots.discard(path)
+
+
+def chrome_profile_args(path, persistent):
+    """크롬 실행 인자 (프로필 경로 + 영구 모드의 디스크 캐시 크기 제한)"""
+    args = [f'--user-data-dir={path}']
+    if persistent:
+        args.append(f'--disk-cache-size={DISK_CACHE_MB * 1024 * 1024}')
+    return args
+
+
+def load_cookie_jar():
+    """저장된 쿠키 목록 (CDP Network.Cookie 형식, 만료된 쿠키 제외)"""
+    if not PERSISTENT:
+        return []
+    try:
+        with open(COOKIE_JAR_PATH, encoding='utf-8') as f:
+            cookies = json.load(f)
+    except (OSError, ValueError):
+        return []
+    now = time.time()
+    # expires가 -1/0이면 세션 쿠키
+    return [c for c in cookies if not c.get('expires') or c['expires'] <= 0 or c['expires'] > now]
+
+
+def save_cookie_jar(cookies):
+    """쿠키를 저장소에 병합 저장 ((도메인, 경로, 이름)이 같으면 새 값으로 교체)"""
+    if not PERSISTENT or not cookies:
+        return
+    merged = {(c.get('domain'), c.get('path'), c.get('name')): c for c in load_cookie_jar()}
+    for cookie in cookies:
+        merged[(cookie.get('domain'), cookie.get('path'), cookie.get('name'))] = cookie
+    try:
+        os.makedirs(PROFILE_ROOT, exist_ok=True)
+        tmp_path = f"{COOKIE_JAR_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(list(merged.values()), f, ensure_ascii=False)
+        os.replace(tmp_path, COOKIE_JAR_PATH)
+    except OSError as e:
+        print(f"[PROFILE] Cookie save error: {e}", file=sys.stderr)
+
+
+def _cdp(browser):
+    """브라우저 종류에 맞는 CDP 호출 함수 (Selenium / DrissionPage, 없으면 None)"""
+    if hasattr(browser, 'execute_cdp_cmd'):
+        return browser.execute_cdp_cmd
+    if hasattr(browser, 'run_cdp'):
+        return lambda method, params: browser.run_cdp(method, **params)
+    return None
+
+
+def restore_cookies(browser):
+    """저장된 쿠키를 브라우저에 주입 (Selenium, DrissionPage, Playwright BrowserContext)"""
+    cookies = load_cookie_jar()
+    if not cookies:
+        return
+    try:
+        if hasattr(browser, 'add_cookies'):
+            browser.add_cookies([
+                {k: c[k] for k in ('name', 'value', 'domain', 'path', 'expires', 'httpOnly', 'secure', 'sameSite')
+                 if c.get(k) is not None}
+                for c in cookies
+            ])
+            return
+        send = _cdp(browser)
+        if send:
+            send('Network.setCookies', {'cookies': [
+                {k: v for k, v in c.items() if k in ('name', 'value', 'domain', 'path', 'expires',
+                                                      'httpOnly', 'secure', 'sameSite')}
+                for c in cookies
+            ]})
+    except Exception as e:
+        print(f"[PROFILE] Cookie restore error: {e}", file=sys.stderr)
+
+
+def store_cookies(browser):
+    """브라우저의 현재 쿠키를 저장소에 기록 (영구 모드에서만)"""
+    if not PERSISTENT:
+        return
+    try:
+        if hasattr(browser, 'cookies') and hasattr(browser, 'add_cookies'):
+            cookies = browser.cookies()  # Playwright BrowserContext
+        else:
+            send = _cdp(browser)
+            cookies = send('Network.getAllCookies', {}).get('cookies', []) if send else []
+    except Exception as e:
+        print(f"[PROFILE] Cookie read error: {e}", file=sys.stderr)
+        return
+    save_cookie_jar(cookies)
+
+
+def apply_cookie_jar(session):
+    """저장된 쿠키를 requests 세션에 복사 (브라우저에서 받은 세션 쿠키 재사용)"""
+    for cookie in load_cookie_jar():
+        session.cookies.set(
+            cookie['name'], cookie['value'],
+            domain=cookie.get('domain', ''), path=cookie.get('path', '/')
+        )
+    return session
+
+
+def attach_profile(browser, path, persistent=False):
+    """브라우저 객체에 프로필 경로를 기록 (quit_browser에서 반납)"""
+    try:
+        browser.crawler_profile_dir = path
+        browser.crawler_profile_persistent = persistent
+    except AttributeError:
+        pass
+    return browser
+
+
+def quit_browser(browser):
+    """브라우저 종료 후 프로필 반납 (영구 모드면 쿠키를 먼저 저장)"""
+    persistent = getattr(browser, 'crawler_profile_persistent', False)
+    try:
+        if persistent:
+            store_cookies(browser)
+        browser.quit()
+    finally:
+        release_profile_dir(getattr(browser, 'crawler_profile_dir', None), persistent)
+
+
+@atexit.register
+def cleanup_profiles():
+    """남아 있는 임시 프로필 삭제, 영구 프로필 슬롯 잠금 해제 (정상 종료 시)"""
+    with _lock:
+        paths = list(_profiles)
+        slots = list(_slots)
+    for path in paths:
+        remove_profile_dir(path, retries=2)
+    for path in slots:
+        release_profile_dir(path, True)
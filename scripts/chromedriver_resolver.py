@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+ChromeDriver 경로 결정 (네트워크 없이 캐시 우선)
+ChromeDriverManager().install()은 실행할 때마다 네트워크로 버전을 조회하므로
+브라우저가 뜨기 전에 몇 초가 걸리고, 오프라인에서는 아예 실패합니다.
+
+설치된 크롬의 메이저 버전을 키로 드라이버 경로를 캐시하고, 아래 순서로 찾습니다.
+    1. CHROMEDRIVER_PATH 환경 변수 (직접 지정)
+    2. 캐시 (crawl_cache.db의 driver_cache 테이블, 파일이 사라졌으면 무효화)
+    3. PATH의 chromedriver (크롬과 메이저 버전이 같을 때만)
+    4. Selenium Manager 오프라인 모드 (~/.cache/selenium에 이미 받은 드라이버)
+    5. 네트워크: webdriver-manager (설치되어 있으면), 없으면 Selenium Manager 온라인
+찾은 경로는 캐시에 저장하므로 네트워크는 크롬이 업데이트된 뒤 처음 한 번만 사용합니다.
+크롬 버전을 알아내지 못하면 어느 버전의 드라이버인지 알 수 없으므로 캐시를 읽지도 쓰지도 않습니다.
+start_chrome()은 드라이버와 크롬 버전이 맞지 않아 세션 생성에 실패하면 캐시 항목을 지우고 한 번 더 찾습니다.
+걸린 시간과 출처는 last_resolution()으로 확인할 수 있습니다 (리뷰 크롤러 결과의 "driver").
+
+사용법:
+    python chromedriver_resolver.py              # 드라이버 경로 확인 (JSON)
+    python chromedriver_resolver.py --refresh    # 캐시를 무시하고 다시 찾기
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import sqlite3
+import threading
+import subprocess
+
+import crawl_cache
+
+
+# 크롬 실행 파일 후보 (Windows는 레지스트리에서 버전을 읽음)
+CHROME_BINARIES = [
+    'google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser',
+    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+]
+VERSION_PATTERN = re.compile(r'(\d+)\.\d+\.\d+')
+
+_lock = threading.Lock()
+_driver_path = None
+_resolution = None
+
+
+def _run_version(command):
+    """'<command> --version' 출력에서 메이저 버전 추출 (실패 시 None)"""
+    try:
+        completed = subprocess.run(
+            [command, '--version'], capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = VERSION_PATTERN.search(completed.stdout or '')
+    return match.group(1) if match else None
+
+
+def chrome_major_version():
+    """설치된 크롬의 메이저 버전 (예: '120', 찾지 못하면 None)"""
+    if sys.platform == 'win32':
+        import winreg
+        for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+            try:
+                with winreg.OpenKey(hive, r'Software\Google\Chrome\BLBeacon') as key:
+                    version, _ = winreg.QueryValueEx(key, 'version')
+                return version.split('.')[0]
+            except OSError:
+                continue
+        return None
+    for binary in CHROME_BINARIES:
+        if os.path.isabs(binary) and not os.path.exists(binary):
+            continue
+        if not os.path.isabs(binary) and not shutil.which(binary):
+            continue
+        major = _run_version(binary)
+        if major:
+            return major
+    return None
+
+
+def connect():
+    """캐시 DB 연결 (driver_cache 테이블이 없으면 생성)"""
+    conn = crawl_cache.connect()
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS driver_cache (
+            chrome_major TEXT PRIMARY KEY,
+            driver_path TEXT NOT NULL,
+            source TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        )
+    """)
+    return conn
+
+
+def _cached_path(chrome_major):
+    if not crawl_cache.ENABLED:
+        return None
+    try:
+        conn = connect()
+        try:
+            row = conn.execute(
+                "SELECT driver_path FROM driver_cache WHERE chrome_major = ?", (chrome_major,)
+            ).fetchone()
+            if row and not os.path.isfile(row[0]):
+                # 드라이버 파일이 지워졌으면 무효화
+                with conn:
+                    conn.execute("DELETE FROM driver_cache WHERE chrome_major = ?", (chrome_major,))
+                return None
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"[DRIVER] Cache read error: {e}", file=sys.stderr)
+        return None
+    return row[0] if row else None
+
+
+def _store_path(chrome_major, driver_path, source):
+    if not crawl_cache.ENABLED:
+        return
+    try:
+        conn = connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO driver_cache VALUES (?, ?, ?, ?)",
+                    (chrome_major, driver_path, source, time.time())
+                )
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"[DRIVER] Cache write error: {e}", file=sys.stderr)
+
+
+def invalidate(chrome_major=None):
+    """캐시 항목과 이 프로세스에서 찾아 둔 경로를 버림 (chrome_major를 주지 않으면 현재 크롬 버전)"""
+    global _driver_path
+    with _lock:
+        _driver_path = None
+    chrome_major = chrome_major or chrome_major_version()
+    if not chrome_major or not crawl_cache.ENABLED:
+        return
+    try:
+        conn = connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM driver_cache WHERE chrome_major = ?", (chrome_major,))
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"[DRIVER] Cache write error: {e}", file=sys.stderr)
+
+
+def _from_path(chrome_major):
+    """PATH의 chromedriver (크롬 버전을 모르면 그대로, 알면 메이저 버전이 같을 때만)"""
+    driver_path = shutil.which('chromedriver')
+    if not driver_path:
+        return None
+    if chrome_major and _run_version(driver_path) != chrome_major:
+        return None
+    return driver_path
+
+
+def _from_selenium_manager(offline):
+    """Selenium Manager로 드라이버 경로 조회 (offline이면 이미 받은 드라이버만)"""
+    try:
+        from selenium.webdriver.common.selenium_manager import SeleniumManager
+        args = ['--browser', 'chrome']
+        if offline:
+            args.append('--offline')
+        driver_path = SeleniumManager().binary_paths(args).get('driver_path')
+    except Exception:
+        return None
+    return driver_path if driver_path and os.path.isfile(driver_path) else None
+
+
+def _from_network():
+    """네트워크로 드라이버 다운로드 (webdriver-manager가 있으면 사용)"""
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+    except ImportError:
+        return _from_selenium_manager(offline=False), 'selenium-manager'
+    return ChromeDriverManager().install(), 'webdriver-manager'
+
+
+def resolve_driver_path(refresh=False):
+    """크롬 버전에 맞는 chromedriver 경로 (프로세스당 한 번 찾고 재사용)
+
+    refresh=True면 캐시를 건너뛰고 다시 찾습니다. 모두 실패하면 RuntimeError.
+    """
+    global _driver_path, _resolution
+    with _lock:
+        if _driver_path and not refresh:
+            return _driver_path
+
+        started = time.perf_counter()
+        chrome_major = chrome_major_version()
+        driver_path, source = os.environ.get('CHROMEDRIVER_PATH'), 'env'
+        if not driver_path and not refresh and chrome_major:
+            driver_path, source = _cached_path(chrome_major), 'cache'
+        if not driver_path:
+            driver_path, source = _from_path(chrome_major), 'path'
+        if not driver_path:
+            driver_path, source = _from_selenium_manager(offline=True), 'selenium-manager'
+        if not driver_path:
+            driver_path, source = _from_network()
+        if not driver_path:
+            raise RuntimeError("chromedriver를 찾을 수 없습니다. CHROMEDRIVER_PATH를 지정하세요.")
+        if source not in ('env', 'cache') and chrome_major:
+            _store_path(chrome_major, driver_path, source)
+
+        _driver_path = driver_path
+        _resolution = {
+            "source": source,
+            "chrome_major": chrome_major,
+            "driver_path": driver_path,
+            "ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        print(f"[DRIVER] chromedriver from {source} in {_resolution['ms']}ms: {driver_path}", file=sys.stderr)
+        return driver_path
+
+
+def service():
+    """resolve_driver_path()로 찾은 드라이버의 Selenium Service"""
+    from selenium.webdriver.chrome.service import Service
+    return Service(resolve_driver_path())
+
+
+def start_chrome(options):
+    """찾은 드라이버로 webdriver.Chrome 실행
+
+    캐시된 드라이버가 크롬 버전과 맞지 않아 SessionNotCreatedException이 나면
+    캐시 항목을 지우고 드라이버를 다시 찾아 한 번 더 시도합니다 (CHROMEDRIVER_PATH 지정 시 제외).
+    """
+    from selenium import webdriver
+    from selenium.common.exceptions import SessionNotCreatedException
+    from selenium.webdriver.chrome.service import Service
+
+    try:
+        return webdriver.Chrome(service=service(), options=options)
+    except SessionNotCreatedException as e:
+        if 'version' not in str(e).lower() or (_resolution or {}).get('source') == 'env':
+            raise
+        print(f"[DRIVER] chromedriver does not match Chrome, resolving again: {str(e).splitlines()[0]}",
+              file=sys.stderr)
+        invalidate((_resolution or {}).get('chrome_major'))
+        return webdriver.Chrome(service=Service(resolve_driver_path(refresh=True)), options=options)
+
+
+def last_resolution():
+    """이 프로세스에서 드라이버를 찾은 방법과 걸린 시간 (찾기 전이면 None)"""
+    return dict(_resolution) if _resolution else None
+
+
+def main():
+    refresh = '--refresh' in sys.argv[1:]
+    try:
+        resolve_driver_path(refresh=refresh)
+    except Exception as e:
+        print(json.dumps({"success": False, "error": str(e)}, ensure_ascii=False))
+        sys.exit(1)
+    print(json.dumps({"success": True, **last_resolution()}, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
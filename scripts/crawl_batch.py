@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+여러 상품 리뷰 일괄 크롤링 + DB 저장
+상품마다 프로세스를 새로 띄우지 않고, 정해진 수의 워커 프로세스가 상품을 나눠 처리합니다.
+워커마다 자기 브라우저(또는 HTTP 세션)를 한 번만 띄워 여러 상품에 재사용하고,
+리뷰는 페이지마다 바로 DB에 저장합니다.
+
+사용법:
+    python crawl_batch.py <상품URL> [<상품URL> ...] [옵션]
+    python crawl_batch.py --file urls.txt [옵션]        # 한 줄에 URL 하나 (#으로 시작하면 주석, -는 stdin)
+    python crawl_batch.py --store kproject [옵션]       # DB에 리뷰가 있는 해당 스토어의 모든 상품
+
+옵션:
+    --workers N       동시에 처리할 워커 프로세스 수 (기본 4)
+    --backend NAME    api(기본, 브라우저 없음) | network | drission | selenium | playwright | auto
+                      쉼표로 폴백 순서 지정 가능 (예: api,drission, naver_crawl 패키지 참고)
+    --pages N         상품별 최대 페이지 수 (기본 3)
+    --mode MODE       저장 모드 bulk(기본) | upsert | insert
+    --incremental     최신순으로 읽고 이미 저장된 리뷰만 남은 페이지에서 중단
+    --debug
+
+진행 상황은 상품이 끝날 때마다 stderr에, 상품별 요약은 마지막에 stdout JSON으로 출력합니다.
+하나라도 실패하면 종료 코드 1.
+"""
+
+import io
+import sys
+import json
+import time
+import contextlib
+import multiprocessing.util
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+DEFAULT_WORKERS = 4
+
+
+def init_worker():
+    """워커 프로세스 초기화 (종료 시 브라우저 풀 정리)"""
+    # 워커 프로세스는 atexit를 실행하지 않으므로 multiprocessing 종료 훅에 등록
+    import browser_pool
+    multiprocessing.util.Finalize(None, browser_pool.close_all_pools, exitpriority=10)
+
+
+def crawl_product(url, backend='api', max_pages=3, incremental=False, save_mode='bulk', debug=False):
+    """워커 프로세스에서 상품 하나를 크롤링하며 페이지마다 저장하고 요약 반환"""
+    from naver_crawl import crawl_reviews
+    from save_reviews_to_db import save_reviews_to_db
+
+    saved = {"inserted": 0, "updated": 0, "skipped": 0}
+
+    def save_page(reviews, page_number):
+        result = save_reviews_to_db([review.to_dict() for review in reviews], url, mode=save_mode)
+        for key in saved:
+            saved[key] += result.get(key, 0)
+
+    started = time.time()
+    try:
+        # 결과 채널(stdout)을 크롤러의 print가 오염시키지 않도록 stderr로 돌림
+        with contextlib.redirect_stdout(sys.stderr):
+            result = crawl_reviews(url, backend, max_pages, debug, incremental,
+                                   on_page=save_page, keep_reviews=False)
+    except Exception as e:
+        result = {"success": False, "error": str(e)}
+
+    summary = {
+        "url": url,
+        "success": bool(result.get('success')),
+        "backend": result.get('backend'),
+        "count": result.get('count', 0),
+        "pages_crawled": result.get('pages_crawled', 0),
+        "elapsed": round(time.time() - started, 2),
+    }
+    summary.update(saved)
+    if result.get('error'):
+        summary["error"] = result['error']
+    return summary
+
+
+def read_url_file(path):
+    """파일(또는 -: stdin)에서 URL 목록 읽기"""
+    stream = sys.stdin if path == '-' else open(path, encoding='utf-8')
+    try:
+        return [line.strip() for line in stream if line.strip() and not line.strip().startswith('#')]
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def crawl_batch(urls, workers=DEFAULT_WORKERS, backend='api', max_pages=3, incremental=False,
+                save_mode='bulk', debug=False):
+    """상품 목록을 워커 프로세스 풀로 크롤링. 끝나는 순서대로 진행 상황을 stderr에 출력"""
+    # 같은 상품이 여러 번 들어와도 한 번만 크롤링 (순서 유지)
+    urls = list(dict.fromkeys(urls))
+    summaries = {}
+    started = time.time()
+
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(urls))), initializer=init_worker) as executor:
+        futures = {
+            executor.submit(crawl_product, url, backend, max_pages, incremental, save_mode, debug): url
+            for url in urls
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            url = futures[future]
+            try:
+                summary = future.result()
+            except Exception as e:
+                # 워커 프로세스가 비정상 종료된 경우
+                summary = {"url": url, "success": False, "error": str(e)}
+            summaries[url] = summary
+            status = "ok  " if summary['success'] else "FAIL"
+            print(f"[BATCH] {done}/{len(urls)} {status} {summary.get('count', 0):>5} reviews "
+                  f"(new {summary.get('inserted', 0)}) {summary.get('elapsed', 0):>7.1f}s  {url}"
+                  + (f"  - {summary['error']}" if summary.get('error') else ""),
+                  file=sys.stderr, flush=True)
+
+    products = [summaries[url] for url in urls]
+    totals = {
+        key: sum(p.get(key, 0) for p in products)
+        for key in ('count', 'inserted', 'updated', 'skipped')
+    }
+    return {
+        "success": all(p['success'] for p in products),
+        "products": products,
+        "failed": sum(1 for p in products if not p['success']),
+        "totals": totals,
+        "elapsed": round(time.time() - started, 2),
+    }
+
+
+def main():
+    # UTF-8 출력 설정
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+    urls = []
+    workers = DEFAULT_WORKERS
+    backend = 'api'
+    max_pages = 3
+    save_mode = 'bulk'
+    incremental = False
+    debug = False
+
+    # 인자 파싱
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] == '--file' and i + 1 < len(sys.argv):
+            urls.extend(read_url_file(sys.argv[i + 1]))
+            i += 2
+        elif sys.argv[i] == '--store' and i + 1 < len(sys.argv):
+            from save_reviews_to_db import get_store_product_urls
+            urls.extend(get_store_product_urls(sys.argv[i + 1]))
+            i += 2
+        elif sys.argv[i] == '--workers' and i + 1 < len(sys.argv):
+            workers = int(sys.argv[i + 1])
+            i += 2
+        elif sys.argv[i] == '--backend' and i + 1 < len(sys.argv):
+            backend = sys.argv[i + 1]
+            i += 2
+        elif sys.argv[i] == '--pages' and i + 1 < len(sys.argv):
+            max_pages = int(sys.argv[i + 1])
+            i += 2
+        elif sys.argv[i] == '--mode' and i + 1 < len(sys.argv):
+            save_mode = sys.argv[i + 1]
+            i += 2
+        elif sys.argv[i] == '--incremental':
+            incremental = True
+            i += 1
+        elif sys.argv[i] == '--debug':
+            debug = True
+            i += 1
+        elif sys.argv[i] in ('-h', '--help'):
+            print(__doc__)
+            return
+        elif not sys.argv[i].startswith('-'):
+            urls.append(sys.argv[i])
+            i += 1
+        else:
+            i += 1
+
+    from naver_crawl import resolve_chain
+    try:
+        resolve_chain(backend)
+    except ValueError as e:
+        print(json.dumps({"success": False, "error": str(e)}, ensure_ascii=False))
+        sys.exit(1)
+    from save_reviews_to_db import SAVE_MODES
+    if save_mode not in SAVE_MODES:
+        print(json.dumps({"success": False, "error": f"알 수 없는 저장 모드: {save_mode} (지원: {', '.join(SAVE_MODES)})"},
+                         ensure_ascii=False))
+        sys.exit(1)
+    if not urls:
+        print(json.dumps({"success": False, "error": "크롤링할 상품 URL이 없습니다."}, ensure_ascii=False))
+        sys.exit(1)
+
+    result = crawl_batch(urls, workers, backend, max_pages, incremental, save_mode, debug)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if not result['success']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
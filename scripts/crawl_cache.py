@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+크롤러 영구 캐시 (SQLite)
+한 번 알아낸 값은 다음 실행에서도 재사용합니다.
+
+- 스토어 이름 → merchantNo (스토어 HTML 전체 다운로드 생략)
+- 상품 ID → 동작하는 리뷰 API 엔드포인트 (실패하는 URL 재시도 생략)
+
+모든 항목은 TTL이 지나면 만료되고, 캐시된 값으로 요청이 실패하면 즉시 무효화됩니다.
+CRAWLER_CACHE_DISABLED=1 이면 캐시를 사용하지 않습니다.
+"""
+
+import os
+import sys
+import time
+import sqlite3
+
+
+# dev.db와 같은 폴더에 별도 파일로 저장 (Prisma 스키마와 분리)
+CACHE_DB_PATH = os.environ.get(
+    'CRAWLER_CACHE_DB',
+    os.path.join(os.path.dirname(__file__), '..', 'prisma', 'prisma', 'crawl_cache.db')
+)
+
+MERCHANT_TTL = 30 * 24 * 3600  # merchantNo는 사실상 바뀌지 않음
+ENDPOINT_TTL = 7 * 24 * 3600   # API 경로는 네이버 배포에 따라 바뀔 수 있음
+
+ENABLED = os.environ.get('CRAWLER_CACHE_DISABLED') != '1'
+
+
+def connect():
+    """캐시 DB 연결 (테이블이 없으면 생성)"""
+    conn = sqlite3.connect(CACHE_DB_PATH, timeout=10)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS merchant_cache (
+            store_name TEXT PRIMARY KEY,
+            merchant_no TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS endpoint_cache (
+            product_id TEXT PRIMARY KEY,
+            endpoint TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        )
+    """)
+    return conn
+
+
+def _get(table, key_column, value_column, key, ttl):
+    if not ENABLED:
+        return None
+    try:
+        conn = connect()
+        try:
+            row = conn.execute(
+                f"SELECT {value_column}, updated_at FROM {table} WHERE {key_column} = ?", (key,)
+            ).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"[CACHE] Read error: {e}", file=sys.stderr)
+        return None
+    if not row or time.time() - row[1] > ttl:
+        return None
+    return row[0]
+
+
+def _set(table, key_column, value_column, key, value):
+    if not ENABLED:
+        return
+    try:
+        conn = connect()
+        try:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {table} ({key_column}, {value_column}, updated_at) VALUES (?, ?, ?)",
+                (key, value, time.time())
+            )
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"[CACHE] Write error: {e}", file=sys.stderr)
+
+
+def _delete(table, key_column, key):
+    if not ENABLED:
+        return
+    try:
+        conn = connect()
+        try:
+            conn.execute(f"DELETE FROM {table} WHERE {key_column} = ?", (key,))
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"[CACHE] Delete error: {e}", file=sys.stderr)
+
+
+def get_merchant_no(store_name):
+    """캐시된 merchantNo (없거나 만료되면 None)"""
+    return _get('merchant_cache', 'store_name', 'merchant_no', store_name, MERCHANT_TTL)
+
+
+def set_merchant_no(store_name, merchant_no):
+    _set('merchant_cache', 'store_name', 'merchant_no', store_name, str(merchant_no))
+
+
+def invalidate_merchant_no(store_name):
+    _delete('merchant_cache', 'store_name', store_name)
+
+
+def get_endpoint(product_id):
+    """상품별로 마지막에 성공한 리뷰 API 엔드포인트 키 (없거나 만료되면 None)"""
+    return _get('endpoint_cache', 'product_id', 'endpoint', str(product_id), ENDPOINT_TTL)
+
+
+def set_endpoint(product_id, endpoint):
+    _set('endpoint_cache', 'product_id', 'endpoint', str(product_id), endpoint)
+
+
+def invalidate_endpoint(product_id):
+    _delete('endpoint_cache', 'product_id', str(product_id))
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+크롤러 NDJSON 스트리밍 출력
+--ndjson 옵션을 주면 결과를 마지막에 한 번에 출력하지 않고, 페이지가 끝날 때마다
+한 줄에 레코드 하나씩 바로 stdout으로 내보냅니다. 로그는 항상 stderr로만 출력합니다.
+
+레코드 형식 (한 줄에 JSON 하나):
+    {"type": "review", "page": 1, "review": {...}}
+    {"type": "page", "page": 1, "new": 20, "total": 20}
+    {"type": "summary", "success": true, "count": 60, "pages_crawled": 3}
+
+summary는 항상 마지막 한 줄이며, 실패 시 {"type": "summary", "success": false, "error": "..."} 입니다.
+"""
+
+import sys
+import json
+
+
+class NdjsonWriter:
+    """페이지 단위 결과를 NDJSON으로 출력 (크롤러의 on_page 콜백으로 사용)"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.total = 0
+
+    def emit(self, record):
+        self.stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.stream.flush()
+
+    def page(self, reviews, page_number):
+        for review in reviews:
+            self.emit({"type": "review", "page": page_number, "review": review})
+        self.total += len(reviews)
+        self.emit({"type": "page", "page": page_number, "new": len(reviews), "total": self.total})
+
+    def summary(self, result):
+        """크롤러 반환값에서 리뷰 목록을 뺀 나머지를 요약으로 출력"""
+        record = {"type": "summary"}
+        record.update((k, v) for k, v in result.items() if k not in ('reviews', 'data'))
+        self.emit(record)
+
+    def error(self, message):
+        self.emit({"type": "summary", "success": False, "error": message})
+
+
+def iter_ndjson_reviews(lines):
+    """NDJSON 줄에서 리뷰 dict만 꺼냄 (type이 없는 줄은 리뷰 자체로 간주)"""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        record_type = record.get('type')
+        if record_type == 'review':
+            yield record['review']
+        elif record_type is None:
+            yield record
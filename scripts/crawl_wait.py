@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+크롤러 공용 대기 유틸리티
+고정 sleep 대신 조건이 충족되는 즉시 반환하는 대기를 제공합니다.
+DrissionPage, Selenium, Playwright 객체를 모두 지원합니다.
+
+- wait_until: 조건이 참이 될 때까지 짧은 간격으로 확인 (최대 timeout초)
+- politeness_delay: 서버 부하/봇 탐지 방지용 의도적 지연 (CRAWLER_POLITENESS="최소,최대")
+"""
+
+import os
+import time
+import random
+
+
+# 페이지 이동 사이의 의도적 지연 (초). 로딩 대기와는 별개로 조절
+POLITENESS_DELAY = tuple(
+    float(x) for x in os.environ.get('CRAWLER_POLITENESS', '0.5,1.0').split(',')
+)
+
+REVIEW_ITEM_SELECTOR = 'ul.RR2FSL9wTc > li.PxsZltB5tV'
+
+# Q&A 목록: 아이템 클래스(naver_qna_remote.QNA_ITEM_SELECTOR) 또는 "답변상태" 헤더 다음 ul의 li
+QNA_LIST_PRESENT_JS = '''(function() {
+    if (document.querySelector("ul[class*='UJbMFPn3Rt'] > li, ul > li[class*='KR8UaQ9_Vn']")) return true;
+    var ul = document.evaluate("//div[contains(., '답변상태')]/following-sibling::ul", document, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return !!(ul && ul.querySelector('li'));
+})()'''
+
+
+def wait_until(condition, timeout=10, interval=0.1, max_interval=0.5):
+    """condition()이 참 값을 반환하면 그 값을 반환, 시간 초과 시 None
+
+    조건 확인 중 발생한 예외는 '아직 아님'으로 처리합니다.
+    확인 간격은 interval부터 max_interval까지 점점 늘어납니다.
+    """
+    deadline = time.time() + timeout
+    while True:
+        try:
+            result = condition()
+            if result:
+                return result
+        except Exception:
+            pass
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return None
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 1.5, max_interval)
+
+
+def politeness_delay(delay=None):
+    """의도적 지연 (0,0이면 지연 없음)"""
+    min_sec, max_sec = delay or POLITENESS_DELAY
+    if max_sec > 0:
+        time.sleep(random.uniform(min_sec, max_sec))
+
+
+def evaluate(target, expression):
+    """브라우저 종류에 관계없이 JS 식을 평가하여 결과 반환"""
+    # Playwright (page.evaluate는 식을 그대로 평가)
+    if hasattr(target, 'evaluate') and hasattr(target, 'query_selector'):
+        return target.evaluate(expression)
+    # Selenium
+    if hasattr(target, 'execute_script'):
+        return target.execute_script(f'return {expression};')
+    # DrissionPage
+    return target.run_js(f'return {expression};')
+
+
+def document_ready(target):
+    """문서 로딩 완료 여부"""
+    return evaluate(target, 'document.readyState') == 'complete'
+
+
+def element_count(target, selector):
+    """셀렉터에 해당하는 요소 수"""
+    return evaluate(target, f'document.querySelectorAll({selector!r}).length')
+
+
+def review_list_present(target):
+    """리뷰 목록이 렌더링되었는지 여부"""
+    return element_count(target, REVIEW_ITEM_SELECTOR) > 0
+
+
+def qna_list_present(target):
+    """Q&A 목록이 렌더링되었는지 여부"""
+    return bool(evaluate(target, QNA_LIST_PRESENT_JS))
+
+
+# 첫 리뷰의 ID (없으면 텍스트 앞부분) - 페이지가 바뀌었는지 판별하는 서명
+FIRST_REVIEW_SIGNATURE_JS = '''(function() {
+    var item = document.querySelector('ul.RR2FSL9wTc > li.PxsZltB5tV')
+        || document.querySelector('li[data-shp-contents-type="review"]')
+        || document.querySelector('li[class*="reviewItems_review"]');
+    if (!item) return null;
+    return item.getAttribute('data-shp-contents-id') || (item.textContent || '').trim().substring(0, 80);
+})()'''
+
+
+def first_review_signature(target):
+    """현재 첫 번째 리뷰의 ID (페이지 전환 확인용)"""
+    return evaluate(target, FIRST_REVIEW_SIGNATURE_JS)
+
+
+def wait_for_review_list(target, timeout=10):
+    """리뷰 목록이 나타날 때까지 대기"""
+    return wait_until(lambda: review_list_present(target), timeout)
+
+
+def wait_for_qna_list(target, timeout=10):
+    """Q&A 탭을 연 뒤 목록이 나타날 때까지 대기"""
+    return wait_until(lambda: qna_list_present(target), timeout)
+
+
+def wait_for_page_change(target, previous_signature, timeout=10):
+    """첫 리뷰가 이전 페이지와 달라질 때까지 대기. 새 서명 반환 (시간 초과 시 None)"""
+    def changed():
+        signature = first_review_signature(target)
+        return signature if signature and signature != previous_signature else None
+    return wait_until(changed, timeout)
@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+네이버 크롤러 상주 워커
+한 번 실행해 두고 JSON-RPC 요청을 연속으로 처리합니다.
+파이썬 import와 브라우저 풀을 계속 살려 두어 요청마다 드는 기동 비용을 없앱니다.
+리뷰는 DrissionPage 풀, Q&A는 Selenium Q&A 풀(naver_crawl의 headless -> selenium 폴백)을 씁니다.
+
+사용법:
+    python crawl_worker.py                 # stdin/stdout (한 줄에 요청 하나)
+    python crawl_worker.py --port 8765     # 127.0.0.1 TCP 소켓
+
+요청 예시 (한 줄 JSON):
+    {"jsonrpc": "2.0", "id": 1, "method": "crawl_reviews",
+     "params": {"url": "https://smartstore.naver.com/...", "max_pages": 3}}
+    {"jsonrpc": "2.0", "id": 2, "method": "crawl_qna",
+     "params": {"url": "https://smartstore.naver.com/..."}}       # backend: auto|headless|selenium|remote
+
+지원 메서드:
+    ping, crawl_reviews, crawl_qna, shutdown
+"""
+
+import io
+import json
+import inspect
+import sys
+import threading
+import contextlib
+import socketserver
+
+import browser_pool
+
+
+# JSON-RPC 2.0 오류 코드
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class CrawlWorker:
+    """브라우저 풀을 유지하면서 크롤링 요청을 처리"""
+
+    def __init__(self, debug=False, redirect_output=True):
+        self.debug = debug
+        self.running = True
+        # stdio 모드에서는 요청마다 크롤러의 print를 stderr로 돌려 응답 채널을 보호
+        # (소켓 모드는 main에서 stdout 자체를 stderr로 바꿔 둠)
+        self.redirect_output = redirect_output
+
+    def ping(self):
+        import naver_review_drission
+        pool = naver_review_drission.get_page_pool()
+        return {"ok": True, "idle_browsers": len(pool.idle), "busy_browsers": pool.in_use}
+
+    def crawl_reviews(self, url, max_pages=3, debug=None, network=False, incremental=False, tabs=1):
+        # 브라우저는 풀에서 빌려 쓰고 반납되므로 다음 요청에서도 그대로 재사용됨
+        # 백엔드 모듈(DrissionPage/Selenium)은 처음 요청이 올 때 불러옴 (워커 기동 시간 단축)
+        import naver_review_drission
+        return naver_review_drission.crawl_reviews(
+            url, int(max_pages), self.debug if debug is None else debug,
+            network=network, incremental=incremental, tabs=int(tabs)
+        )
+
+    def crawl_qna(self, url, backend='auto', debugger=None, debug=None):
+        # Q&A도 풀의 브라우저를 빌려 쓰고 반납하므로 연속 요청에서 크롬을 다시 띄우지 않음
+        # 사용자가 직접 띄운 크롬(remote debugging)은 backend='remote' 또는 debugger를 줄 때만 사용
+        from naver_crawl import crawl_qna
+        if debugger and backend == 'auto':
+            backend = 'remote'
+        result = crawl_qna(url, backend, self.debug if debug is None else debug, debugger=debugger)
+        result["qna"] = [item.to_dict() for item in result["qna"]]
+        return result
+
+    def shutdown(self):
+        self.running = False
+        browser_pool.close_all_pools()
+        return {"ok": True}
+
+    METHODS = ('ping', 'crawl_reviews', 'crawl_qna', 'shutdown')
+
+    def handle_line(self, line):
+        """요청 한 줄을 처리하여 응답 dict 반환 (알림이면 None)"""
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return error_response(None, PARSE_ERROR, f"JSON 파싱 오류: {e}")
+
+        if not isinstance(request, dict) or 'method' not in request:
+            return error_response(None, INVALID_REQUEST, "유효하지 않은 요청")
+
+        request_id = request.get('id')
+        method = request['method']
+        params = request.get('params') or {}
+
+        if method not in self.METHODS:
+            return error_response(request_id, METHOD_NOT_FOUND, f"알 수 없는 메서드: {method}")
+
+        # 파라미터는 실행 전에 메서드 시그니처로만 검사 (크롤러 내부의 TypeError는 INTERNAL_ERROR)
+        handler = getattr(self, method)
+        try:
+            if isinstance(params, list):
+                bound = inspect.signature(handler).bind(*params)
+            elif isinstance(params, dict):
+                bound = inspect.signature(handler).bind(**params)
+            else:
+                raise TypeError("params는 배열 또는 객체여야 합니다.")
+        except TypeError as e:
+            return error_response(request_id, INVALID_PARAMS, str(e))
+
+        try:
+            # 크롤러의 디버그 print가 응답 채널(stdout)을 오염시키지 않도록 stderr로 돌림
+            redirect = contextlib.redirect_stdout(sys.stderr) if self.redirect_output else contextlib.nullcontext()
+            with redirect:
+                result = handler(*bound.args, **bound.kwargs)
+        except Exception as e:
+            return error_response(request_id, INTERNAL_ERROR, str(e))
+
+        if request_id is None:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+
+def error_response(request_id, code, message):
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+def serve_stdio(worker):
+    """stdin에서 요청을 읽고 stdout으로 응답"""
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        response = worker.handle_line(line)
+        if response is not None:
+            sys.stdout.write(json.dumps(response, ensure_ascii=False) + '\n')
+            sys.stdout.flush()
+        if not worker.running:
+            break
+
+
+def serve_socket(worker, port, host='127.0.0.1'):
+    """TCP 소켓으로 요청 수신 (연결당 여러 요청 가능)"""
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for raw in self.rfile:
+                line = raw.decode('utf-8').strip()
+                if not line:
+                    continue
+                response = worker.handle_line(line)
+                if response is not None:
+                    self.wfile.write((json.dumps(response, ensure_ascii=False) + '\n').encode('utf-8'))
+                    self.wfile.flush()
+                if not worker.running:
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                    break
+
+    socketserver.ThreadingTCPServer.allow_reuse_address = True
+    with socketserver.ThreadingTCPServer((host, port), Handler) as server:
+        print(f"[WORKER] Listening on {host}:{port}", file=sys.stderr, flush=True)
+        server.serve_forever()
+
+
+def main():
+    port = None
+    debug = False
+
+    # 인자 파싱
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] == '--port' and i + 1 < len(sys.argv):
+            port = int(sys.argv[i + 1])
+            i += 2
+        elif sys.argv[i] == '--debug':
+            debug = True
+            i += 1
+        elif sys.argv[i] in ('-h', '--help'):
+            print(__doc__)
+            return
+        else:
+            i += 1
+
+    # UTF-8 입출력 설정
+    sys.stdin = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+    if port:
+        # 소켓 모드는 응답을 소켓으로 보내므로 크롤러의 print는 전부 stderr로 보냄
+        # (redirect_stdout은 스레드마다 따로 걸 수 없어 프로세스 전체에 한 번만 적용)
+        sys.stdout = sys.stderr
+
+    # 소켓 모드는 여러 연결을 동시에 처리하므로 풀 크기만큼 병렬 크롤링
+    worker = CrawlWorker(debug, redirect_output=not port)
+    try:
+        if port:
+            serve_socket(worker, port)
+        else:
+            serve_stdio(worker)
+    finally:
+        browser_pool.close_all_pools()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+"""
+네이버 스마트스토어 크롤러 통합 패키지
+리뷰/Q&A 크롤러를 하나의 인터페이스로 묶습니다. 결과는 공통 레코드(Review, QnA)로 돌려주고,
+백엔드는 이름으로 고르거나 auto 체인(API -> 네트워크 감청 -> DOM)에 맡깁니다.
+
+    from naver_crawl import crawl_reviews, crawl_qna
+    result = crawl_reviews(url, backend='auto', max_pages=3)
+    for review in result['reviews']:
+        print(review.id, review.rating, review.content)
+
+명령줄: python -m naver_crawl --help (scripts 폴더에서 실행)
+"""
+
+from .records import Review, QnA
+from .backends import (
+    Backend, REVIEW_BACKENDS, QNA_BACKENDS, AUTO_REVIEW_CHAIN, AUTO_QNA_CHAIN, get_backend, resolve_chain,
+)
+from .runner import crawl_reviews, crawl_qna
@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+"""python -m naver_crawl (scripts 폴더) 또는 python scripts/naver_crawl 로 실행"""
+
+import os
+import sys
+
+if not __package__:
+    # 폴더 경로로 실행한 경우: scripts 폴더의 크롤러 모듈과 이 패키지를 import할 수 있도록
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from naver_crawl.cli import main
+
+main()
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+크롤러 백엔드 인터페이스와 등록된 백엔드
+각 백엔드는 기존 크롤러 모듈을 감싸기만 하고, 해당 모듈(Selenium, DrissionPage, Playwright 등)은
+crawl()이 호출될 때 불러옵니다. 패키지를 import하거나 다른 백엔드를 쓸 때는 비용이 들지 않습니다.
+
+리뷰 백엔드 crawl()은 기존 크롤러의 반환 dict를 그대로 돌려주고 (리뷰는 on_page로 전달),
+Q&A 백엔드 crawl()은 Q&A dict 목록을 돌려줍니다. 레코드 변환과 중복 제거는 runner.py에서 합니다.
+"""
+
+import importlib.util
+
+
+class Backend:
+    """크롤러 백엔드 인터페이스"""
+
+    name = None
+    kind = 'reviews'    # 'reviews' | 'qna'
+    requires = ()       # 필요한 최상위 패키지 (설치되어 있지 않으면 자동 체인에서 건너뜀)
+    description = ''
+
+    def available(self):
+        """필요한 패키지가 모두 설치되어 있는지 (import하지 않고 확인)"""
+        return all(importlib.util.find_spec(package) is not None for package in self.requires)
+
+    def crawl(self, url, max_pages=3, debug=False, incremental=False, on_page=None, **options):
+        raise NotImplementedError
+
+
+class ApiBackend(Backend):
+    name = 'api'
+    requires = ('requests',)
+    description = '리뷰 API 직접 호출 (브라우저 없음)'
+
+    def crawl(self, url, max_pages=3, debug=False, incremental=False, on_page=None, **options):
+        from naver_review_api_crawler import crawl_reviews_api, crawl_reviews_api_async
+
+        concurrency = int(options.get('concurrency') or 1)
+        if concurrency > 1:
+            import asyncio
+            return asyncio.run(crawl_reviews_api_async(
+                url, max_pages, debug, concurrency, incremental, on_page=on_page, keep_reviews=False
+            ))
+        return crawl_reviews_api(url, max_pages, debug, incremental, on_page=on_page, keep_reviews=False)
+
+
+class NetworkBackend(Backend):
+    name = 'network'
+    requires = ('DrissionPage',)
+    description = 'DrissionPage 브라우저에서 리뷰 API 응답 감청'
+
+    def crawl(self, url, max_pages=3, debug=False, incremental=False, on_page=None, **options):
+        from naver_review_drission import crawl_reviews
+
+        return crawl_reviews(url, max_pages, debug, network=True, incremental=incremental,
+                             on_page=on_page, keep_reviews=False)
+
+
+class DrissionBackend(Backend):
+    name = 'drission'
+    requires = ('DrissionPage',)
+    description = 'DrissionPage 브라우저 DOM 추출 (--tabs로 멀티 탭)'
+
+    def crawl(self, url, max_pages=3, debug=False, incremental=False, on_page=None, **options):
+        from naver_review_drission import crawl_reviews
+
+        return crawl_reviews(url, max_pages, debug, incremental=incremental, on_page=on_page,
+                             keep_reviews=False, tabs=int(options.get('tabs') or 1))
+
+
+class SeleniumBackend(Backend):
+    name = 'selenium'
+    requires = ('selenium',)
+    description = 'Selenium 브라우저 DOM 추출 (--pipeline으로 파싱/로딩 병행)'
+
+    def crawl(self, url, max_pages=3, debug=False, incremental=False, on_page=None, **options):
+        from naver_review_crawler import crawl_reviews
+
+        return crawl_reviews(url, max_pages, debug, incremental=incremental, on_page=on_page,
+                             keep_reviews=False, pipeline=bool(options.get('pipeline')))
+
+
+class PlaywrightBackend(Backend):
+    name = 'playwright'
+    requires = ('playwright',)
+    description = 'Playwright 브라우저 DOM 추출 (증분 모드 미지원)'
+
+    def crawl(self, url, max_pages=3, debug=False, incremental=False, on_page=None, **options):
+        if incremental:
+            raise ValueError("playwright 백엔드는 증분 모드를 지원하지 않습니다.")
+        from naver_review_crawler_playwright import crawl_reviews
+
+        return crawl_reviews(url, max_pages, debug, on_page=on_page, keep_reviews=False)
+
+
+class HeadlessQnaBackend(Backend):
+    name = 'headless'
+    kind = 'qna'
+    requires = ('selenium', 'bs4')
+    description = '헤드리스 크롬 Q&A (naver_crawler_simple.py)'
+
+    def crawl(self, url, max_pages=3, debug=False, incremental=False, on_page=None, **options):
+        from naver_crawler_simple import crawl_qna
+
+        return crawl_qna(url)
+
+
+class SeleniumQnaBackend(Backend):
+    name = 'selenium'
+    kind = 'qna'
+    requires = ('selenium', 'bs4')
+    description = '봇 탐지 우회 설정의 일반 크롬 Q&A (naver_qna_crawler.py)'
+
+    def crawl(self, url, max_pages=3, debug=False, incremental=False, on_page=None, **options):
+        from naver_qna_crawler import crawl_qna
+
+        return crawl_qna(url)
+
+
+class RemoteQnaBackend(Backend):
+    name = 'remote'
+    kind = 'qna'
+    requires = ('selenium', 'bs4')
+    description = '이미 실행 중인 크롬(remote debugging)에 연결하여 Q&A (--debugger host:port)'
+
+    def crawl(self, url, max_pages=3, debug=False, incremental=False, on_page=None, **options):
+        from naver_qna_remote import crawl_with_existing_browser
+
+        result = crawl_with_existing_browser(url, options.get('debugger'))
+        if not result.get('success'):
+            raise RuntimeError(result.get('error') or 'Q&A 크롤링 실패')
+        return result.get('data', [])
+
+
+REVIEW_BACKENDS = {
+    backend.name: backend
+    for backend in (ApiBackend(), NetworkBackend(), DrissionBackend(), SeleniumBackend(), PlaywrightBackend())
+}
+QNA_BACKENDS = {
+    backend.name: backend
+    for backend in (HeadlessQnaBackend(), SeleniumQnaBackend(), RemoteQnaBackend())
+}
+
+# --backend auto 순서 (빠른 것부터): API -> 네트워크 감청 -> DOM
+AUTO_REVIEW_CHAIN = ('api', 'network', 'drission')
+# remote는 사용자가 띄운 크롬이 있어야 하므로 직접 지정할 때만 사용
+AUTO_QNA_CHAIN = ('headless', 'selenium')
+
+
+def get_backend(name, kind='reviews'):
+    registry = REVIEW_BACKENDS if kind == 'reviews' else QNA_BACKENDS
+    if name not in registry:
+        raise ValueError(f"알 수 없는 백엔드: {name} (지원: {', '.join(registry)})")
+    return registry[name]
+
+
+def resolve_chain(backend='auto', kind='reviews'):
+    """--backend 값(auto, 이름, 쉼표로 구분한 순서)을 시도할 백엔드 목록으로 변환
+
+    auto면 설치되지 않은 백엔드는 건너뛰고, 직접 지정한 백엔드는 그대로 시도합니다.
+    """
+    if backend == 'auto':
+        chain = AUTO_REVIEW_CHAIN if kind == 'reviews' else AUTO_QNA_CHAIN
+        return [get_backend(name, kind) for name in chain if get_backend(name, kind).available()]
+    return [get_backend(name.strip(), kind) for name in backend.split(',') if name.strip()]
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+통합 크롤러 명령줄
+
+사용법 (scripts 폴더에서):
+    python -m naver_crawl <상품URL> [옵션]              # 리뷰
+    python -m naver_crawl <상품URL> --qna [옵션]        # Q&A
+    python -m naver_crawl --list                        # 백엔드 목록과 설치 여부
+
+옵션:
+    --backend NAME    auto(기본) 또는 백엔드 이름, 쉼표로 순서 지정 (예: api,drission)
+                      리뷰: api | network | drission | selenium | playwright
+                      Q&A:  headless | selenium | remote
+    --pages N         최대 페이지 수 (기본 3)
+    --incremental     최신순으로 읽고 이미 저장된 리뷰만 남은 페이지에서 중단
+    --concurrency N   api: N개 페이지 동시 요청
+    --tabs N          drission: N개 탭으로 페이지 구간 병렬 크롤링
+    --pipeline        selenium: 다음 페이지를 불러오는 동안 이전 페이지 파싱
+    --debugger ADDR   remote: 접속할 크롬 host:port
+    --ndjson          페이지마다 리뷰를 한 줄에 하나씩 바로 출력 (crawl_output.py)
+    --save            페이지마다 DB에 저장 (--mode bulk(기본) | upsert | insert)
+    --debug
+
+결과는 stdout JSON ("reviews" 또는 "qna", 사용한 "backend", 시도 내역 "attempts"),
+크롤러 로그는 stderr로 출력합니다. 실패하면 종료 코드 1.
+"""
+
+import io
+import sys
+import json
+import contextlib
+
+from .backends import REVIEW_BACKENDS, QNA_BACKENDS, AUTO_REVIEW_CHAIN, AUTO_QNA_CHAIN, resolve_chain
+from .runner import crawl_reviews, crawl_qna
+
+
+def list_backends():
+    """백엔드 목록과 설치 여부"""
+    def describe(registry, chain):
+        return [
+            {"name": name, "available": backend.available(), "auto": name in chain,
+             "description": backend.description}
+            for name, backend in registry.items()
+        ]
+    return {
+        "reviews": describe(REVIEW_BACKENDS, AUTO_REVIEW_CHAIN),
+        "qna": describe(QNA_BACKENDS, AUTO_QNA_CHAIN),
+    }
+
+
+def fail(message):
+    print(json.dumps({"success": False, "error": message}, ensure_ascii=False))
+    sys.exit(1)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    # UTF-8 출력 설정
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+    url = None
+    qna = False
+    backend = 'auto'
+    max_pages = 3
+    incremental = False
+    ndjson = False
+    save = False
+    save_mode = 'bulk'
+    debug = False
+    options = {}
+
+    # 인자 파싱
+    i = 0
+    while i < len(argv):
+        if argv[i] == '--backend' and i + 1 < len(argv):
+            backend = argv[i + 1]
+            i += 2
+        elif argv[i] == '--pages' and i + 1 < len(argv):
+            max_pages = int(argv[i + 1])
+            i += 2
+        elif argv[i] == '--concurrency' and i + 1 < len(argv):
+            options['concurrency'] = int(argv[i + 1])
+            i += 2
+        elif argv[i] == '--tabs' and i + 1 < len(argv):
+            options['tabs'] = int(argv[i + 1])
+            i += 2
+        elif argv[i] == '--debugger' and i + 1 < len(argv):
+            options['debugger'] = argv[i + 1]
+            i += 2
+        elif argv[i] == '--mode' and i + 1 < len(argv):
+            save_mode = argv[i + 1]
+            i += 2
+        elif argv[i] == '--pipeline':
+            options['pipeline'] = True
+            i += 1
+        elif argv[i] == '--qna':
+            qna = True
+            i += 1
+        elif argv[i] == '--incremental':
+            incremental = True
+            i += 1
+        elif argv[i] == '--ndjson':
+            ndjson = True
+            i += 1
+        elif argv[i] == '--save':
+            save = True
+            i += 1
+        elif argv[i] == '--debug':
+            debug = True
+            i += 1
+        elif argv[i] == '--list':
+            print(json.dumps(list_backends(), ensure_ascii=False, indent=2))
+            return
+        elif argv[i] in ('-h', '--help'):
+            print(__doc__)
+            return
+        elif not argv[i].startswith('-') and url is None:
+            url = argv[i]
+            i += 1
+        else:
+            i += 1
+
+    if not url:
+        fail("상품 URL이 필요합니다.")
+    try:
+        resolve_chain(backend, 'qna' if qna else 'reviews')
+    except ValueError as e:
+        fail(str(e))
+
+    if qna:
+        # 크롤러의 print가 결과 채널(stdout)을 오염시키지 않도록 stderr로 돌림
+        with contextlib.redirect_stdout(sys.stderr):
+            result = crawl_qna(url, backend, debug, **options)
+        result["qna"] = [item.to_dict() for item in result["qna"]]
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        if not result["success"]:
+            sys.exit(1)
+        return
+
+    saved = {"inserted": 0, "updated": 0, "skipped": 0}
+    stream = None
+    if save:
+        from save_reviews_to_db import save_reviews_to_db, SAVE_MODES
+        if save_mode not in SAVE_MODES:
+            fail(f"알 수 없는 저장 모드: {save_mode} (지원: {', '.join(SAVE_MODES)})")
+    if ndjson:
+        from crawl_output import NdjsonWriter
+        stream = NdjsonWriter(sys.stdout)
+
+    def on_page(reviews, page_number):
+        rows = [review.to_dict() for review in reviews]
+        if save:
+            result = save_reviews_to_db(rows, url, mode=save_mode)
+            for key in saved:
+                saved[key] += result.get(key, 0)
+        if stream:
+            stream.page(rows, page_number)
+
+    with contextlib.redirect_stdout(sys.stderr):
+        result = crawl_reviews(url, backend, max_pages, debug, incremental,
+                               on_page=on_page if (save or stream) else None,
+                               keep_reviews=not stream, **options)
+    if save:
+        result["saved"] = saved
+
+    if stream:
+        stream.summary(result)
+    else:
+        result["reviews"] = [review.to_dict() for review in result["reviews"]]
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    if not result["success"]:
+        sys.exit(1)
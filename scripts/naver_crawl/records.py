@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+크롤러 공통 레코드 (리뷰, Q&A)
+백엔드마다 조금씩 다른 dict(평점 문자열, title/question, '답변 대기 중' 등)를 하나의 형태로 맞춥니다.
+to_dict()는 기존 스크립트와 같은 키를 쓰므로 save_reviews_to_db와 프론트엔드에 그대로 넘길 수 있습니다.
+"""
+
+from dataclasses import dataclass, field, asdict
+
+
+# 답변이 없을 때 크롤러가 넣는 자리표시 문구
+NO_ANSWER_TEXTS = ('답변 대기 중', '답변대기')
+
+
+@dataclass
+class Review:
+    id: str
+    rating: int = 5
+    author: str = '익명'
+    date: str = ''
+    content: str = ''
+    option: str = ''
+    images: list = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data):
+        """크롤러 리뷰 dict를 레코드로 변환 (평점은 정수, 빈 값은 기본값)"""
+        try:
+            rating = int(data.get('rating', 5))
+        except (TypeError, ValueError):
+            rating = 5
+        return cls(
+            id=str(data.get('id') or ''),
+            rating=rating,
+            author=data.get('author') or '익명',
+            date=data.get('date') or '',
+            content=data.get('content') or '',
+            option=data.get('option') or '',
+            images=list(data.get('images') or []),
+        )
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass
+class QnA:
+    title: str
+    answer: str = ''
+    status: str = ''
+    author: str = ''
+    date: str = ''
+    is_secret: bool = False
+
+    @classmethod
+    def from_dict(cls, data):
+        """크롤러 Q&A dict를 레코드로 변환 (답변이 없으면 answer는 빈 문자열)"""
+        answer = (data.get('answer') or '').strip()
+        if answer in NO_ANSWER_TEXTS:
+            answer = ''
+        return cls(
+            title=data.get('title') or data.get('question') or '',
+            answer=answer,
+            status=data.get('status') or '',
+            author=data.get('author') or '',
+            date=data.get('date') or '',
+            is_secret=bool(data.get('isSecret', data.get('is_secret', False))),
+        )
+
+    def to_dict(self):
+        """기존 Q&A 크롤러 출력과 같은 키 (isSecret)"""
+        return {
+            "status": self.status,
+            "title": self.title,
+            "author": self.author,
+            "date": self.date,
+            "answer": self.answer,
+            "isSecret": self.is_secret,
+        }
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+백엔드 체인 실행 (자동 폴백)
+백엔드를 순서대로 시도하고, 실패하거나 리뷰를 하나도 얻지 못하면 다음 백엔드로 넘어갑니다.
+앞 백엔드가 일부 페이지를 전달한 뒤 실패했더라도 이미 받은 리뷰는 ID로 걸러
+on_page에 다시 전달되지 않습니다.
+
+증분 모드(incremental=True)에서는 새 리뷰가 없는 것이 정상이므로, 성공한 백엔드에서 멈춥니다.
+리뷰가 없는 상품은 auto 체인의 모든 백엔드를 거치므로, 그런 상품이 많으면 --backend api로 고정하세요.
+"""
+
+import sys
+import time
+
+from .backends import resolve_chain
+from .records import Review, QnA
+
+
+def _attempt(backend, started, error=None, count=0):
+    attempt = {"backend": backend.name, "elapsed": round(time.time() - started, 2), "count": count}
+    if error:
+        attempt["error"] = error
+    return attempt
+
+
+def crawl_reviews(url, backend='auto', max_pages=3, debug=False, incremental=False, on_page=None,
+                  keep_reviews=True, **options):
+    """리뷰 크롤링 (백엔드 체인 자동 폴백)
+
+    on_page(reviews, page_number)는 페이지마다 새 Review 목록으로 호출되며,
+    keep_reviews=False면 결과에 리뷰 목록을 모으지 않습니다.
+    options는 백엔드별 설정 (concurrency, tabs, pipeline)입니다.
+    """
+    chain = resolve_chain(backend, 'reviews')
+    if not chain:
+        return {"success": False, "error": "사용할 수 있는 리뷰 백엔드가 없습니다.", "attempts": []}
+
+    seen_ids = set()
+    reviews = []
+    attempts = []
+    total = [0]
+
+    def accept_page(page_reviews, page_number):
+        records = []
+        for data in page_reviews:
+            review = Review.from_dict(data)
+            if review.id in seen_ids:
+                continue
+            if review.id:
+                seen_ids.add(review.id)
+            records.append(review)
+        total[0] += len(records)
+        if keep_reviews:
+            reviews.extend(records)
+        if on_page and records:
+            on_page(records, page_number)
+
+    result = {"success": False}
+    for candidate in chain:
+        started = time.time()
+        before = total[0]
+        try:
+            raw = candidate.crawl(url, max_pages, debug, incremental, on_page=accept_page, **options)
+        except Exception as e:
+            attempts.append(_attempt(candidate, started, str(e), total[0] - before))
+            print(f"[CRAWL] {candidate.name} failed: {e}", file=sys.stderr)
+            continue
+
+        new_count = total[0] - before
+        if not raw.get('success'):
+            attempts.append(_attempt(candidate, started, raw.get('error') or '크롤링 실패', new_count))
+            print(f"[CRAWL] {candidate.name} failed: {raw.get('error')}", file=sys.stderr)
+            continue
+        attempts.append(_attempt(candidate, started, count=new_count))
+
+        result = {
+            "success": True,
+            "backend": candidate.name,
+            "pages_crawled": raw.get('pages_crawled', 0),
+        }
+        # 백엔드별 측정값 (리소스 차단, 드라이버 준비 시간, 탭 병렬 크롤링에서 빠진 구간 등)
+        for key in ('resources', 'driver', 'partial', 'failed_ranges'):
+            if raw.get(key) is not None:
+                result[key] = raw[key]
+        if new_count or incremental:
+            break
+        if candidate is not chain[-1]:
+            print(f"[CRAWL] {candidate.name} returned no reviews, trying next backend", file=sys.stderr)
+
+    if not result["success"]:
+        result["error"] = attempts[-1].get("error") if attempts else "크롤링 실패"
+    result.update({"count": total[0], "reviews": reviews, "attempts": attempts})
+    return result
+
+
+def crawl_qna(url, backend='auto', debug=False, **options):
+    """Q&A 크롤링 (백엔드 체인 자동 폴백, 빈 결과도 다음 백엔드로)"""
+    chain = resolve_chain(backend, 'qna')
+    if not chain:
+        return {"success": False, "error": "사용할 수 있는 Q&A 백엔드가 없습니다.", "attempts": []}
+
+    attempts = []
+    result = {"success": False}
+    for candidate in chain:
+        started = time.time()
+        try:
+            items = [QnA.from_dict(item) for item in candidate.crawl(url, debug=debug, **options)]
+        except Exception as e:
+            attempts.append(_attempt(candidate, started, str(e)))
+            print(f"[CRAWL] {candidate.name} failed: {e}", file=sys.stderr)
+            continue
+        attempts.append(_attempt(candidate, started, count=len(items)))
+        result = {"success": True, "backend": candidate.name, "count": len(items), "qna": items}
+        if items:
+            break
+
+    if not result["success"]:
+        result.update({"error": attempts[-1].get("error") if attempts else "크롤링 실패", "count": 0, "qna": []})
+    result["attempts"] = attempts
+    return result
@@ -1,13 +1,5 @@
 import sys
 import json
-import time
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
 
 def crawl_naver_qna(product_url):
     """
@@ -19,6 +11,16 @@ def crawl_naver_qna(product_url):
     Returns:
         JSON 형태의 Q&A 리스트
     """
+    # Selenium/BeautifulSoup은 무거우므로 실제로 크롤링할 때만 불러옴 (test_crawler.py 등의 import 비용 절감)
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from bs4 import BeautifulSoup
+    
+    import chromedriver_resolver
+    from crawl_wait import wait_until, document_ready, wait_for_qna_list
+    
     # 브라우저 설정
     options = webdriver.ChromeOptions()
     # options.add_argument('--headless')  # ChromeDriver 안정성을 위해 headless 비활성화
@@ -29,19 +31,19 @@ def crawl_naver_qna(product_url):
     driver = None
     
     try:
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+        driver = chromedriver_resolver.start_chrome(options)
         
         # 페이지 접속
         driver.get(product_url)
-        time.sleep(2)
+        wait_until(lambda: document_ready(driver), timeout=10)
 
         # Q&A 탭 클릭
         wait = WebDriverWait(driver, 15)
         qa_tab = wait.until(EC.element_to_be_clickable((By.XPATH, "//a[contains(., 'Q&A')] | //span[contains(., 'Q&A')]")))
         qa_tab.click()
         
-        # 데이터 로딩 대기
-        time.sleep(3)
+        # 데이터 로딩 대기 (Q&A 목록이 나타나는 즉시 진행)
+        wait_for_qna_list(driver, timeout=10)
 
         # [확실한 방법] XPATH로 Q&A 리스트 컨테이너(ul) 찾기
         # "답변상태" 텍스트가 있는 헤더 영역 다음에 나오는 ul 태그
@@ -113,10 +115,12 @@ if __name__ == "__main__":
     
     product_url = sys.argv[1]
     
+    import chromedriver_resolver
     try:
         results = crawl_naver_qna(product_url)
         # JSON 형태로 출력 (stdout)
-        print(json.dumps({"success": True, "data": results}, ensure_ascii=False))
+        print(json.dumps({"success": True, "data": results, "driver": chromedriver_resolver.last_resolution()},
+                         ensure_ascii=False))
     except Exception as e:
         print(json.dumps({"success": False, "error": str(e)}, ensure_ascii=False))
         sys.exit(1)
@@ -1,6 +1,5 @@
 import sys
 import json
-import time
 import io
 import re
 from selenium import webdriver
@@ -10,18 +9,115 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 
-# UTF-8 출력 설정
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+import browser_profile
+from crawl_wait import wait_until, document_ready, wait_for_qna_list
 
-def crawl_with_existing_browser(product_url):
+# 네이버 스마트스토어 Q&A 아이템: ul.UJbMFPn3Rt > li 또는 li[class*='KR8UaQ9_Vn']
+QNA_ITEM_SELECTOR = "ul[class*='UJbMFPn3Rt'] > li, ul > li[class*='KR8UaQ9_Vn']"
+# 대체: 제목 span(u5LpLpO6OE)을 포함한 li (XPath는 브라우저용, CSS는 저장된 HTML용)
+QNA_ITEM_FALLBACK_XPATH = ".//ul//li[.//span[contains(@class, 'u5LpLpO6OE')]]"
+QNA_ITEM_FALLBACK_SELECTOR = "ul li:has(span[class*='u5LpLpO6OE'])"
+MAX_QNA_ITEMS = 50
+
+# 비디오 플레이어 설정 항목 (Q&A 제목으로 잘못 잡히는 텍스트)
+PLAYER_SETTING_TEXTS = ['480p', '720p', '1080p', '144p', '240p', '360p',
+                        '배경색', '글자 크기', '자막', '화질',
+                        '0.5x', '1.0x', '1.5x', '2.0x', '기본']
+
+
+def parse_qna_item(item_html):
+    """Q&A 아이템 HTML 하나를 파싱 (Q&A가 아니면 None)"""
+    soup = BeautifulSoup(item_html, 'html.parser')
+    
+    # 제목 추출 (span.u5LpLpO6OE)
+    title_elem = soup.find('span', class_=lambda x: x and 'u5LpLpO6OE' in str(x))
+    
+    if not title_elem:
+        # 대체: strong 또는 title 클래스
+        title_elem = soup.find('strong') or \
+                    soup.find('a', class_=lambda x: x and 'title' in str(x).lower())
+    
+    if not title_elem:
+        return None
+    
+    title = title_elem.get_text(strip=True)
+    
+    # 유효성 검사
+    if not title or len(title) < 3:
+        return None
+    
+    # 비디오 플레이어 설정 제외
+    if any(skip in title for skip in PLAYER_SETTING_TEXTS):
+        return None
+    
+    # 비밀글 체크
+    is_secret = '비밀' in title or 'secret' in item_html.lower()
+    if is_secret:
+        title = "비밀글입니다"
+    
+    # 상태 추출
+    status_elem = soup.find('span', class_=lambda x: x and ('status' in str(x).lower() or 'state' in str(x).lower()))
+    if not status_elem:
+        # 답변이 있으면 답변완료, 없으면 답변대기
+        has_answer = soup.find('div', class_=lambda x: x and 'answer' in str(x).lower())
+        status = "답변완료" if has_answer else "답변대기"
+    else:
+        status = status_elem.get_text(strip=True)
+    
+    # 작성자 추출 (div.mOPZSaJl4b)
+    author_elem = soup.find('div', class_=lambda x: x and 'mOPZSaJl4b' in str(x))
+    if not author_elem:
+        author_elem = soup.find('span', class_=lambda x: x and 'writer' in str(x).lower())
+    author = author_elem.get_text(strip=True) if author_elem else "익명"
+    
+    # 날짜 추출 (div.ysDyZDZUJu)
+    date_elem = soup.find('div', class_=lambda x: x and 'ysDyZDZUJu' in str(x))
+    if not date_elem:
+        date_elem = soup.find('span', class_=lambda x: x and 'date' in str(x).lower())
+    date_text = date_elem.get_text(strip=True) if date_elem else ""
+    
+    # 날짜 형식 정리 (YYYY.MM.DD 형식 추출)
+    date_match = re.search(r'\d{4}[.-]\d{1,2}[.-]\d{1,2}', date_text)
+    date = date_match.group(0) if date_match else date_text
+    
+    # 답변 추출
+    answer_elem = soup.find('div', class_=lambda x: x and 'answer' in str(x).lower())
+    answer = answer_elem.get_text(strip=True) if answer_elem else ""
+    
+    return {
+        "status": status,
+        "title": title,
+        "author": author,
+        "date": date,
+        "answer": answer if answer else "답변 대기 중",
+        "isSecret": is_secret
+    }
+
+
+def parse_qna_html(html):
+    """저장된 페이지 HTML 전체에서 Q&A 목록 추출 (브라우저 없이 동일한 규칙 적용)"""
+    soup = BeautifulSoup(html, 'html.parser')
+    qna_section = soup.select_one('#QNA') or soup
+    items = qna_section.select(QNA_ITEM_SELECTOR) or qna_section.select(QNA_ITEM_FALLBACK_SELECTOR)
+    
+    qna_data = []
+    for item in items[:MAX_QNA_ITEMS]:
+        qna = parse_qna_item(str(item))
+        if qna:
+            qna_data.append(qna)
+    return qna_data
+
+def crawl_with_existing_browser(product_url, debugger=None):
     """
     기존에 실행 중인 Chrome 브라우저에 연결하여 크롤링
+    debugger는 접속할 host:port (없으면 --debugger 인자, CRAWLER_DEBUGGER_ADDRESS, 127.0.0.1:9222 순)
+    연결한 chromedriver 세션은 성공/실패와 관계없이 끝날 때 종료합니다.
     """
+    driver = None
     try:
         # Remote debugging 포트에 연결
         options = Options()
-        options.add_experimental_option("debuggerAddress", "127.0.0.1:9222")
+        options.add_experimental_option("debuggerAddress", debugger or browser_profile.debugger_address())
         
         driver = webdriver.Chrome(options=options)
         
@@ -34,7 +130,7 @@ def crawl_with_existing_browser(product_url):
         
         # 상품 페이지 접속
         driver.get(product_url)
-        time.sleep(4)
+        wait_until(lambda: document_ready(driver), timeout=10)
         
         # Q&A 탭 클릭 (data-name="QNA" 사용)
         wait = WebDriverWait(driver, 20)
@@ -49,9 +145,8 @@ def crawl_with_existing_browser(product_url):
         for selector in qa_selectors:
             try:
                 qa_tab = wait.until(EC.element_to_be_clickable((By.XPATH, selector)))
-                # 탭을 화면에 보이도록 스크롤
+                # 탭을 화면에 보이도록 스크롤 (JavaScript 클릭은 스크롤이 끝나기를 기다릴 필요 없음)
                 driver.execute_script("arguments[0].scrollIntoView(true);", qa_tab)
-                time.sleep(1)
                 # JavaScript로 클릭 (더 안정적)
                 driver.execute_script("arguments[0].click();", qa_tab)
                 qa_clicked = True
@@ -64,12 +159,12 @@ def crawl_with_existing_browser(product_url):
         if not qa_clicked:
             raise Exception("Q&A 탭을 찾을 수 없습니다.")
         
-        # Q&A 데이터 로딩 대기 (충분히 기다리기)
-        time.sleep(6)
+        # Q&A 데이터 로딩 대기 (목록이 나타나는 즉시 진행)
+        wait_for_qna_list(driver, timeout=10)
         
         # 페이지 스크롤하여 Q&A 리스트 로드
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight - 1000);")
-        time.sleep(2)
+        wait_for_qna_list(driver, timeout=5)
         
         # Q&A 리스트 찾기
         qna_data = []
@@ -85,89 +180,21 @@ def crawl_with_existing_browser(product_url):
             
             # Q&A 아이템 리스트 찾기
             # 네이버 스마트스토어: ul.UJbMFPn3Rt > li 또는 li[class*='KR8UaQ9_Vn']
-            qna_list = qna_section.find_elements(By.CSS_SELECTOR, 
-                "ul[class*='UJbMFPn3Rt'] > li, ul > li[class*='KR8UaQ9_Vn']")
+            qna_list = qna_section.find_elements(By.CSS_SELECTOR, QNA_ITEM_SELECTOR)
             
             if not qna_list:
                 # 대체 선택자
-                qna_list = qna_section.find_elements(By.XPATH, 
-                    ".//ul//li[.//span[contains(@class, 'u5LpLpO6OE')]]")
+                qna_list = qna_section.find_elements(By.XPATH, QNA_ITEM_FALLBACK_XPATH)
             
             print(f"DEBUG: 찾은 Q&A 아이템 수: {len(qna_list)}", file=sys.stderr)
             
-            for idx, item in enumerate(qna_list[:50]):  # 최대 50개
+            for idx, item in enumerate(qna_list[:MAX_QNA_ITEMS]):
                 try:
-                    # HTML 파싱
-                    item_html = item.get_attribute('outerHTML')
-                    soup = BeautifulSoup(item_html, 'html.parser')
-                    
-                    # 제목 추출 (span.u5LpLpO6OE)
-                    title_elem = soup.find('span', class_=lambda x: x and 'u5LpLpO6OE' in str(x))
-                    
-                    if not title_elem:
-                        # 대체: strong 또는 title 클래스
-                        title_elem = soup.find('strong') or \
-                                    soup.find('a', class_=lambda x: x and 'title' in str(x).lower())
-                    
-                    if not title_elem:
-                        continue
-                    
-                    title = title_elem.get_text(strip=True)
-                    
-                    # 유효성 검사
-                    if not title or len(title) < 3:
+                    qna = parse_qna_item(item.get_attribute('outerHTML'))
+                    if not qna:
                         continue
-                    
-                    # 비디오 플레이어 설정 제외
-                    if any(skip in title for skip in ['480p', '720p', '1080p', '144p', '240p', '360p',
-                                                       '배경색', '글자 크기', '자막', '화질', 
-                                                       '0.5x', '1.0x', '1.5x', '2.0x', '기본']):
-                        continue
-                    
-                    # 비밀글 체크
-                    is_secret = '비밀' in title or 'secret' in item_html.lower()
-                    if is_secret:
-                        title = "비밀글입니다"
-                    
-                    # 상태 추출
-                    status_elem = soup.find('span', class_=lambda x: x and ('status' in str(x).lower() or 'state' in str(x).lower()))
-                    if not status_elem:
-                        # 답변이 있으면 답변완료, 없으면 답변대기
-                        has_answer = soup.find('div', class_=lambda x: x and 'answer' in str(x).lower())
-                        status = "답변완료" if has_answer else "답변대기"
-                    else:
-                        status = status_elem.get_text(strip=True)
-                    
-                    # 작성자 추출 (div.mOPZSaJl4b)
-                    author_elem = soup.find('div', class_=lambda x: x and 'mOPZSaJl4b' in str(x))
-                    if not author_elem:
-                        author_elem = soup.find('span', class_=lambda x: x and 'writer' in str(x).lower())
-                    author = author_elem.get_text(strip=True) if author_elem else "익명"
-                    
-                    # 날짜 추출 (div.ysDyZDZUJu)
-                    date_elem = soup.find('div', class_=lambda x: x and 'ysDyZDZUJu' in str(x))
-                    if not date_elem:
-                        date_elem = soup.find('span', class_=lambda x: x and 'date' in str(x).lower())
-                    date_text = date_elem.get_text(strip=True) if date_elem else ""
-                    
-                    # 날짜 형식 정리 (YYYY.MM.DD 형식 추출)
-                    date_match = re.search(r'\d{4}[.-]\d{1,2}[.-]\d{1,2}', date_text)
-                    date = date_match.group(0) if date_match else date_text
-                    
-                    # 답변 추출
-                    answer_elem = soup.find('div', class_=lambda x: x and 'answer' in str(x).lower())
-                    answer = answer_elem.get_text(strip=True) if answer_elem else ""
-                    
-                    qna_data.append({
-                        "status": status,
-                        "title": title,
-                        "author": author,
-                        "date": date,
-                        "answer": answer if answer else "답변 대기 중",
-                        "isSecret": is_secret
-                    })
-                    
-                    print(f"DEBUG: [{idx+1}] {status} - {title[:40]}...", file=sys.stderr)
+                    qna_data.append(qna)
+                    print(f"DEBUG: [{idx+1}] {qna['status']} - {qna['title'][:40]}...", file=sys.stderr)
                 
                 except Exception as e:
                     print(f"DEBUG: 아이템 {idx} 파싱 오류: {e}", file=sys.stderr)
@@ -193,8 +220,18 @@ def crawl_with_existing_browser(product_url):
             "success": False,
             "error": str(e)
         }
+    finally:
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
 
 if __name__ == "__main__":
+    # UTF-8 출력 설정 (모듈로 import될 때는 호출자의 스트림을 건드리지 않음)
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+    
     if len(sys.argv) < 2:
         print(json.dumps({"success": False, "error": "상품 URL이 필요합니다."}, ensure_ascii=False))
         sys.exit(1)
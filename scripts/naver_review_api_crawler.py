@@ -5,7 +5,11 @@
 브라우저 없이 API를 직접 호출하여 리뷰를 수집합니다.
 
 사용법:
-    python naver_review_api_crawler.py <상품URL 또는 상품ID> [--pages N] [--debug]
+    python naver_review_api_crawler.py <상품URL 또는 상품ID> [--pages N] [--concurrency N] [--incremental] [--ndjson] [--debug]
+
+    --concurrency N: N개 페이지를 동시에 요청하는 비동기 엔진 사용 (기본 1 = 순차)
+    --incremental: 최신순으로 읽고 DB에 이미 저장된 리뷰만 남은 페이지에서 중단
+    --ndjson: 페이지마다 리뷰를 한 줄에 하나씩 바로 출력 (crawl_output.py 참고)
 """
 
 import json
@@ -13,8 +17,53 @@ import sys
 import time
 import re
 import random
-import requests
-from urllib.parse import urlparse, parse_qs
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import browser_profile
+import crawl_cache
+from crawl_output import NdjsonWriter
+from save_reviews_to_db import get_known_review_ids
+
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+API_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+    'Referer': f'https://smartstore.naver.com/',
+    'Origin': 'https://smartstore.naver.com',
+}
+
+# 비동기 엔진 기본값: 동시에 가져올 페이지 수와 호스트별 동시 요청 상한
+DEFAULT_CONCURRENCY = 4
+PER_HOST_LIMIT = 4
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """keep-alive 커넥션 풀을 공유하는 requests 세션 (스레드 간 공유)
+
+    영구 프로필 모드(CRAWLER_PERSISTENT_PROFILE=1)면 브라우저 크롤러가 저장한 쿠키를 함께 사용합니다.
+    """
+    # requests는 첫 요청 때 불러옴 (DrissionPage 크롤러가 파서 함수만 import할 때 비용 절감)
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=PER_HOST_LIMIT * 2)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            browser_profile.apply_cookie_jar(session)
+            _session = session
+        return _session
 
 
 def extract_product_info(url_or_id):
@@ -45,11 +94,11 @@ def get_merchant_no(store_name):
         # 스토어 정보 API
         url = f"https://smartstore.naver.com/{store_name}"
         headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'User-Agent': USER_AGENT,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
         }
-        response = requests.get(url, headers=headers, timeout=10)
+        response = get_session().get(url, headers=headers, timeout=10)
         
         # HTML에서 merchant_no 추출
         match = re.search(r'"merchantNo"\s*:\s*"?(\d+)"?', response.text)
@@ -71,38 +120,129 @@ def get_merchant_no(store_name):
     return None
 
 
+# 리뷰 API 엔드포인트 (키, URL 템플릿) - 상품별로 동작한 키를 캐시에 저장
+API_ENDPOINTS = [
+    ('paged-reviews', "https://smartstore.naver.com/i/v1/reviews/paged-reviews?page={page}&pageSize={page_size}&merchantNo={merchant_no}&originProductNo={product_id}&sortType=REVIEW_RANKING"),
+    ('product-reviews', "https://smartstore.naver.com/i/v1/contents/reviews/product-reviews?page={page}&pageSize={page_size}&merchantNo={merchant_no}&originProductNo={product_id}"),
+    ('shopping', "https://shopping.naver.com/v1/reviews/{product_id}?page={page}&pageSize={page_size}"),
+]
+
+
+# 정렬 기준 (증분 크롤링은 최신순으로 읽어야 기준점에서 멈출 수 있음)
+SORT_RANKING = 'REVIEW_RANKING'
+SORT_RECENT = 'REVIEW_CREATE_DATE_DESC'
+
+
+def build_api_urls(product_id, merchant_no=None, page=1, page_size=20, preferred=None, sort_type=None):
+    """시도할 (엔드포인트 키, URL) 목록. preferred 엔드포인트를 맨 앞에 둠"""
+    urls = []
+    for key, template in API_ENDPOINTS:
+        api_url = template.format(page=page, page_size=page_size, merchant_no=merchant_no, product_id=product_id)
+        if sort_type:
+            if 'sortType=' in api_url:
+                api_url = re.sub(r'sortType=[A-Z_]+', f'sortType={sort_type}', api_url)
+            else:
+                api_url += f'&sortType={sort_type}'
+        urls.append((key, api_url))
+    if preferred:
+        urls.sort(key=lambda item: item[0] != preferred)
+    return urls
+
+
+def fetch_json(api_url, session=None):
+    """API URL 호출 후 JSON 반환 (실패 시 None)"""
+    try:
+        response = (session or get_session()).get(api_url, headers=API_HEADERS, timeout=10)
+        if response.status_code == 200:
+            return response.json()
+    except Exception as e:
+        pass
+    return None
+
+
+def remember_endpoint(product_id, preferred, used, page=1):
+    """성공한 엔드포인트를 캐시에 기록하고 실패한 캐시 항목은 무효화
+
+    마지막 페이지 다음 페이지는 원래 빈 응답/에러가 나므로 캐시 무효화는 첫 페이지 실패일 때만 합니다.
+    """
+    if used == preferred:
+        return
+    if used:
+        crawl_cache.set_endpoint(product_id, used)
+    elif preferred and page == 1:
+        crawl_cache.invalidate_endpoint(product_id)
+
+
+def fetch_reviews_with_endpoint(product_id, merchant_no=None, page=1, page_size=20, preferred=None, sort_type=None):
+    """리뷰 API 호출. (응답 JSON, 성공한 엔드포인트 키) 반환"""
+    for key, api_url in build_api_urls(product_id, merchant_no, page, page_size, preferred, sort_type):
+        data = fetch_json(api_url)
+        if data is not None:
+            return data, key
+    return None, None
+
+
 def fetch_reviews_from_api(product_id, merchant_no=None, page=1, page_size=20):
     """네이버 리뷰 API 호출"""
+    preferred = crawl_cache.get_endpoint(product_id)
+    data, used = fetch_reviews_with_endpoint(product_id, merchant_no, page, page_size, preferred)
+    remember_endpoint(product_id, preferred, used, page)
+    return data
+
+
+def resolve_merchant_no(store_name, refresh=False):
+    """캐시 우선으로 merchant_no 조회. (merchant_no, 캐시에서 왔는지) 반환"""
+    if not refresh:
+        cached = crawl_cache.get_merchant_no(store_name)
+        if cached:
+            return cached, True
+    merchant_no = get_merchant_no(store_name)
+    if merchant_no:
+        crawl_cache.set_merchant_no(store_name, merchant_no)
+    return merchant_no, False
+
+
+def extract_review_list(data):
+    """API 응답(JSON)에서 리뷰 목록 추출 (응답 구조별로 키가 다름)"""
+    if isinstance(data, list):
+        return data
+    if not isinstance(data, dict):
+        return []
+    reviews = data.get('reviews', data.get('contents', data.get('data', [])))
+    return reviews if isinstance(reviews, list) else []
+
+
+def parse_review(review):
+    """API 리뷰 객체를 크롤러 공통 리뷰 dict로 변환"""
+    review_id = str(review.get('id', review.get('reviewId', review.get('reviewNo', ''))))
     
-    # API URL (여러 가지 시도)
-    api_urls = [
-        f"https://smartstore.naver.com/i/v1/reviews/paged-reviews?page={page}&pageSize={page_size}&merchantNo={merchant_no}&originProductNo={product_id}&sortType=REVIEW_RANKING",
-        f"https://smartstore.naver.com/i/v1/contents/reviews/product-reviews?page={page}&pageSize={page_size}&merchantNo={merchant_no}&originProductNo={product_id}",
-        f"https://shopping.naver.com/v1/reviews/{product_id}?page={page}&pageSize={page_size}",
-    ]
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'application/json, text/plain, */*',
-        'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-        'Referer': f'https://smartstore.naver.com/',
-        'Origin': 'https://smartstore.naver.com',
-    }
-    
-    for api_url in api_urls:
-        try:
-            response = requests.get(api_url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                return data
-        except Exception as e:
-            continue
+    # 이미지는 URL 문자열 또는 {attachUrl/imageUrl} 객체 목록으로 내려옴
+    images = []
+    for image in review.get('reviewImages', review.get('reviewAttaches', review.get('images', []))) or []:
+        if isinstance(image, dict):
+            image = image.get('attachUrl') or image.get('imageUrl') or image.get('url')
+        if image and image not in images:
+            images.append(image)
     
-    return None
+    return {
+        'id': review_id,
+        'rating': review.get('score', review.get('rating', review.get('starScore', review.get('reviewScore', 5)))),
+        'author': review.get('writerNickname', review.get('buyerNickname', review.get('writer', review.get('writerMemberMaskedId', '익명')))),
+        'date': review.get('createDate', review.get('writtenDate', review.get('registerDate', ''))),
+        'content': review.get('reviewContent', review.get('content', review.get('body', ''))),
+        'option': review.get('productOptionContent', review.get('optionValue', '')),
+        'images': images,
+    }
 
 
-def crawl_reviews_api(url, max_pages=3, debug=False):
-    """API를 통한 리뷰 크롤링"""
+def crawl_reviews_api(url, max_pages=3, debug=False, incremental=False, on_page=None, keep_reviews=True):
+    """API를 통한 리뷰 크롤링
+    
+    incremental=True면 최신순으로 읽으면서 DB에 이미 있는 리뷰는 건너뛰고,
+    모든 리뷰가 이미 저장된 페이지를 만나면 중단합니다.
+    on_page(reviews, page_number)는 페이지마다 새 리뷰로 호출되며,
+    keep_reviews=False면 결과에 리뷰 목록을 모으지 않습니다 (스트리밍 출력용).
+    """
     
     store_name, product_id = extract_product_info(url)
     
@@ -110,61 +250,76 @@ def crawl_reviews_api(url, max_pages=3, debug=False):
         return {"success": False, "error": "상품 ID를 추출할 수 없습니다."}
     
     if debug:
-        print(f"[DEBUG] Store: {store_name}, Product ID: {product_id}")
+        print(f"[DEBUG] Store: {store_name}, Product ID: {product_id}", file=sys.stderr)
     
-    # merchant_no 조회
+    # merchant_no 조회 (캐시 우선)
     merchant_no = None
+    merchant_cached = False
     if store_name:
-        merchant_no = get_merchant_no(store_name)
+        merchant_no, merchant_cached = resolve_merchant_no(store_name)
         if debug:
-            print(f"[DEBUG] Merchant No: {merchant_no}")
+            print(f"[DEBUG] Merchant No: {merchant_no} (cached: {merchant_cached})", file=sys.stderr)
     
     all_reviews = []
     collected_ids = set()
+    endpoint = crawl_cache.get_endpoint(product_id)
     
+    # 증분 모드: 이미 저장된 리뷰 ID를 기준점으로 사용
+    known_ids = get_known_review_ids(url) if incremental else set()
+    sort_type = SORT_RECENT if incremental else None
+    if debug and incremental:
+        print(f"[DEBUG] Incremental mode: {len(known_ids)} known reviews", file=sys.stderr)
+    
+    # 리뷰 목록을 실제로 받아온 페이지 수 (비동기 엔진과 같은 기준)
+    pages_crawled = 0
     for page in range(1, max_pages + 1):
         if debug:
-            print(f"[DEBUG] Fetching page {page}...")
+            print(f"[DEBUG] Fetching page {page}...", file=sys.stderr)
+        
+        data, used = fetch_reviews_with_endpoint(product_id, merchant_no, page, preferred=endpoint, sort_type=sort_type)
+        
+        # 캐시된 merchant_no로 첫 페이지부터 실패하면 캐시를 버리고 다시 조회
+        if not data and page == 1 and merchant_cached:
+            crawl_cache.invalidate_merchant_no(store_name)
+            merchant_no, merchant_cached = resolve_merchant_no(store_name, refresh=True)
+            data, used = fetch_reviews_with_endpoint(product_id, merchant_no, page, preferred=endpoint, sort_type=sort_type)
         
-        data = fetch_reviews_from_api(product_id, merchant_no, page)
+        remember_endpoint(product_id, endpoint, used, page)
+        endpoint = used or None
         
         if not data:
             if debug:
-                print(f"[DEBUG] No data from API for page {page}")
+                print(f"[DEBUG] No data from API for page {page}", file=sys.stderr)
             break
         
         # 리뷰 데이터 추출 (API 응답 구조에 따라 조정)
-        reviews = data.get('reviews', data.get('contents', data.get('data', [])))
+        reviews = extract_review_list(data)
         
         if not reviews:
             if debug:
-                print(f"[DEBUG] No reviews in response")
+                print(f"[DEBUG] No reviews in response", file=sys.stderr)
             break
+        pages_crawled += 1
         
-        new_count = 0
+        new_reviews = []
         for review in reviews:
-            review_id = str(review.get('id', review.get('reviewId', review.get('reviewNo', ''))))
+            parsed_review = parse_review(review)
+            review_id = parsed_review['id']
             
-            if review_id and review_id not in collected_ids:
+            if review_id and review_id not in collected_ids and review_id not in known_ids:
                 collected_ids.add(review_id)
-                
-                parsed_review = {
-                    'id': review_id,
-                    'rating': review.get('score', review.get('rating', review.get('starScore', 5))),
-                    'author': review.get('writerNickname', review.get('buyerNickname', review.get('writer', '익명'))),
-                    'date': review.get('createDate', review.get('writtenDate', review.get('registerDate', ''))),
-                    'content': review.get('reviewContent', review.get('content', review.get('body', ''))),
-                    'option': review.get('productOptionContent', review.get('optionValue', '')),
-                    'images': review.get('reviewImages', review.get('images', [])),
-                }
-                
-                all_reviews.append(parsed_review)
-                new_count += 1
+                new_reviews.append(parsed_review)
+        
+        new_count = len(new_reviews)
+        if keep_reviews:
+            all_reviews.extend(new_reviews)
+        if on_page and new_reviews:
+            on_page(new_reviews, page)
         
         if debug:
-            print(f"[DEBUG] Page {page}: {new_count} new reviews (Total: {len(all_reviews)})")
+            print(f"[DEBUG] Page {page}: {new_count} new reviews (Total: {len(collected_ids)})", file=sys.stderr)
         
-        # 새 리뷰가 없으면 종료
+        # 새 리뷰가 없으면 종료 (증분 모드에서는 전부 이미 저장된 페이지)
         if new_count == 0:
             break
         
@@ -174,12 +329,144 @@ def crawl_reviews_api(url, max_pages=3, debug=False):
     return {
         'success': True,
         'reviews': all_reviews,
-        'count': len(all_reviews),
-        'pages_crawled': min(page, max_pages)
+        'count': len(collected_ids),
+        'pages_crawled': pages_crawled
+    }
+
+
+async def crawl_reviews_api_async(url, max_pages=3, debug=False, concurrency=DEFAULT_CONCURRENCY, incremental=False,
+                                  on_page=None, keep_reviews=True):
+    """비동기 엔진: 여러 페이지를 동시에 요청하고 빈 페이지를 만나면 즉시 중단
+    
+    최대 concurrency개 페이지를 앞서 요청하되, 호스트별 동시 요청은 PER_HOST_LIMIT로 제한합니다.
+    결과는 페이지 순서대로 합치며, 빈 페이지 이후로 예약된 요청은 취소합니다.
+    incremental=True면 최신순으로 읽고 모든 리뷰가 이미 저장된 페이지에서 중단합니다.
+    """
+    
+    import asyncio
+    
+    store_name, product_id = extract_product_info(url)
+    
+    if not product_id:
+        return {"success": False, "error": "상품 ID를 추출할 수 없습니다."}
+    
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=max(concurrency, 1))
+    session = get_session()
+    host_limits = {}
+    
+    async def fetch_url(api_url):
+        host = urlparse(api_url).netloc
+        if host not in host_limits:
+            host_limits[host] = asyncio.Semaphore(PER_HOST_LIMIT)
+        async with host_limits[host]:
+            return await loop.run_in_executor(executor, fetch_json, api_url, session)
+    
+    # 캐시된 엔드포인트를 먼저 시도하고, 성공한 엔드포인트를 이후 페이지에 재사용
+    state = {'endpoint': crawl_cache.get_endpoint(product_id)}
+    sort_type = SORT_RECENT if incremental else None
+    
+    async def fetch_page(page):
+        preferred = state['endpoint']
+        for key, api_url in build_api_urls(product_id, merchant_no, page, preferred=preferred, sort_type=sort_type):
+            data = await fetch_url(api_url)
+            if data is not None:
+                if key != state['endpoint']:
+                    state['endpoint'] = key
+                    crawl_cache.set_endpoint(product_id, key)
+                return data
+            # 마지막 페이지 이후나 미리 보낸 요청의 실패는 정상이므로 첫 페이지 실패만 무효화
+            if key == state['endpoint'] and page == 1:
+                state['endpoint'] = None
+                crawl_cache.invalidate_endpoint(product_id)
+        return None
+    
+    try:
+        # merchant_no 조회 (캐시 우선)
+        merchant_no = None
+        merchant_cached = False
+        if store_name:
+            merchant_no, merchant_cached = await loop.run_in_executor(executor, resolve_merchant_no, store_name)
+
+        
+        if debug:
+            print(f"[DEBUG] Store: {store_name}, Product ID: {product_id}, Merchant No: {merchant_no}", file=sys.stderr)
+        
+        all_reviews = []
+        collected_ids = set()
+        known_ids = await loop.run_in_executor(executor, get_known_review_ids, url) if incremental else set()
+        pages_crawled = 0
+        tasks = {}
+        next_to_schedule = 1
+        
+        for page in range(1, max_pages + 1):
+            # 현재 페이지부터 concurrency개 페이지까지 미리 요청
+            while next_to_schedule <= max_pages and next_to_schedule < page + concurrency:
+                tasks[next_to_schedule] = asyncio.ensure_future(fetch_page(next_to_schedule))
+                next_to_schedule += 1
+            
+            data = await tasks.pop(page)
+            
+            # 캐시된 merchant_no로 첫 페이지부터 실패하면 캐시를 버리고 다시 조회
+            if data is None and page == 1 and merchant_cached:
+                for task in tasks.values():
+                    task.cancel()
+                tasks.clear()
+                next_to_schedule = 2
+                crawl_cache.invalidate_merchant_no(store_name)
+                merchant_no, merchant_cached = await loop.run_in_executor(
+                    executor, lambda: resolve_merchant_no(store_name, refresh=True)
+                )
+                data = await fetch_page(1)
+            
+            reviews = extract_review_list(data) if data else []
+            if not reviews:
+                if debug:
+                    print(f"[DEBUG] No reviews for page {page}", file=sys.stderr)
+                break
+            pages_crawled += 1
+            
+            new_reviews = []
+            for review in reviews:
+                parsed_review = parse_review(review)
+                review_id = parsed_review['id']
+                
+                if review_id and review_id not in collected_ids and review_id not in known_ids:
+                    collected_ids.add(review_id)
+                    new_reviews.append(parsed_review)
+            
+            new_count = len(new_reviews)
+            if keep_reviews:
+                all_reviews.extend(new_reviews)
+            if on_page and new_reviews:
+                on_page(new_reviews, page)
+            
+            if debug:
+                print(f"[DEBUG] Page {page}: {new_count} new reviews (Total: {len(collected_ids)})", file=sys.stderr)
+            
+            # 빈 페이지 = 마지막 페이지 이후 (증분 모드에서는 전부 이미 저장된 페이지)
+            if new_count == 0:
+                break
+        
+        # 빈 페이지 이후로 미리 요청한 페이지는 취소
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    return {
+        'success': True,
+        'reviews': all_reviews,
+        'count': len(collected_ids),
+        'pages_crawled': pages_crawled
     }
 
 
 def main():
+    if len(sys.argv) >= 2 and sys.argv[1] in ('-h', '--help'):
+        print(__doc__)
+        return
     if len(sys.argv) < 2:
         print(json.dumps({"success": False, "error": "상품 URL이 필요합니다."}))
         sys.exit(1)
@@ -187,6 +474,9 @@ def main():
     url = sys.argv[1]
     max_pages = 3
     debug = False
+    concurrency = 1
+    incremental = False
+    ndjson = False
     
     # 인자 파싱
     i = 2
@@ -194,17 +484,43 @@ def main():
         if sys.argv[i] == '--pages' and i + 1 < len(sys.argv):
             max_pages = int(sys.argv[i + 1])
             i += 2
+        elif sys.argv[i] == '--concurrency' and i + 1 < len(sys.argv):
+            concurrency = int(sys.argv[i + 1])
+            i += 2
+        elif sys.argv[i] == '--incremental':
+            incremental = True
+            i += 1
+        elif sys.argv[i] == '--ndjson':
+            ndjson = True
+            i += 1
         elif sys.argv[i] == '--debug':
             debug = True
             i += 1
         else:
             i += 1
     
-    # 크롤링 실행
-    result = crawl_reviews_api(url, max_pages, debug)
+    # NDJSON 모드: 페이지마다 바로 출력하고 리뷰 목록은 메모리에 모으지 않음
+    stream = NdjsonWriter() if ndjson else None
+    options = {'on_page': stream.page, 'keep_reviews': False} if stream else {}
+    
+    # 크롤링 실행 (동시성 2 이상이면 비동기 엔진)
+    try:
+        if concurrency > 1:
+            import asyncio
+            result = asyncio.run(crawl_reviews_api_async(url, max_pages, debug, concurrency, incremental, **options))
+        else:
+            result = crawl_reviews_api(url, max_pages, debug, incremental, **options)
+    except Exception as e:
+        if not stream:
+            raise
+        stream.error(str(e))
+        sys.exit(1)
     
     # 결과 출력
-    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if stream:
+        stream.summary(result)
+    else:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
 
 
 if __name__ == "__main__":
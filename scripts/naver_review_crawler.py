@@ -3,160 +3,60 @@ import json
 import time
 import io
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
-import re
+from concurrent.futures import ThreadPoolExecutor
 
-# UTF-8 출력 설정
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+import browser_pool
+import browser_profile
+import chromedriver_resolver
+import resource_blocking
+import selector_stats
+from crawl_wait import (wait_until, politeness_delay, document_ready, element_count,
+                        first_review_signature, wait_for_page_change, wait_for_review_list)
+from crawl_output import NdjsonWriter
+from save_reviews_to_db import get_known_review_ids
+from review_html_parser import parse_reviews, REVIEW_LIST_HTML_JS
 
-def extract_review_from_item(item):
-    """개별 리뷰 아이템에서 데이터 추출 (제공된 HTML 구조 기반)"""
-    try:
-        # 판매자 답변만 있는 아이템 건너뛰기
-        if not item.select_one('div.AlfkEF45qI'):
-            return None
-        
-        # === 평점 추출 === (em.n6zq2yy0KA)
-        rating = 5
-        rating_elem = item.select_one('em.n6zq2yy0KA')
-        if rating_elem:
-            try:
-                rating = int(rating_elem.get_text(strip=True))
-            except:
-                pass
-        
-        # === 작성자 추출 === (div.Db9Dtnf7gY > strong.MX91DFZo2F)
-        author = "익명"
-        author_container = item.select_one('div.Db9Dtnf7gY')
-        if author_container:
-            author_elem = author_container.select_one('strong.MX91DFZo2F')
-            if author_elem:
-                author = author_elem.get_text(strip=True)
-        
-        # === 날짜 추출 === (div.Db9Dtnf7gY 내 두 번째 span.MX91DFZo2F)
-        date = ""
-        if author_container:
-            # 작성자명과 날짜가 모두 span.MX91DFZo2F지만 날짜는 패턴으로 구분
-            spans = author_container.select('span.MX91DFZo2F')
-            for span in spans:
-                text = span.get_text(strip=True)
-                # 날짜 패턴: YY.MM.DD. 또는 YYYY.MM.DD
-                if re.match(r'\d{2,4}\.\d{1,2}\.\d{1,2}\.?$', text):
-                    date = text.rstrip('.')
-                    break
-        
-        # === 옵션 추출 === (div.b_caIle8kC)
-        option = ""
-        option_elem = item.select_one('div.b_caIle8kC')
-        if option_elem:
-            # 복제본 만들어서 하위 요소 제거 (원본 수정 방지)
-            option_clone = BeautifulSoup(str(option_elem), 'html.parser')
-            # 주거형태 등 하위 요소 제거
-            for sub in option_clone.select('div.eWRrdDdSzW, div.RVbIFwX5dY'):
-                sub.decompose()
-            option = option_clone.get_text(" ", strip=True)
-        
-        # === 리뷰 내용 추출 === (div.AlfkEF45qI > div.HakaEZ240l > div.KqJ8Qqw082 > span.MX91DFZo2F)
-        content = ""
-        # 사용자 리뷰 컨테이너 (판매자 답변 영역 제외)
-        review_container = item.select_one('div.AlfkEF45qI div.HakaEZ240l')
-        if review_container:
-            content_div = review_container.select_one('div.KqJ8Qqw082')
-            if content_div:
-                # 내용 span 찾기 (스토어PICK, 한달사용 뱃지 제외)
-                content_spans = content_div.select('span.MX91DFZo2F')
-                for span in content_spans:
-                    # rnrf6Xo7x2는 스토어PICK, W1IZsaUmnu는 한달사용 뱃지
-                    span_classes = span.get('class', [])
-                    if 'rnrf6Xo7x2' not in span_classes and 'W1IZsaUmnu' not in span_classes:
-                        text = span.get_text(strip=True)
-                        if len(text) > len(content):
-                            content = text
-        
-        # 내용이 없으면 건너뛰기
-        if not content or len(content) < 5:
-            return None
-        
-        # === 이미지 추출 === (div.s30AvhHfb0 img.UpImHAUeYJ)
-        images = []
-        img_container = item.select_one('div.s30AvhHfb0')
-        if img_container:
-            for img in img_container.select('img.UpImHAUeYJ'):
-                # data-src 속성을 우선 사용 (lazy loading)
-                src = img.get('data-src') or img.get('src')
-                if src and 'pstatic.net' in src:
-                    # 타입 파라미터 제거하여 원본 이미지 URL 사용
-                    clean_src = re.sub(r'\?type=.*$', '', src)
-                    if clean_src not in images:
-                        images.append(clean_src)
-        
-        # ID 생성 (data-shp-contents-id 사용)
-        review_id = item.get('data-shp-contents-id', f"{author}-{date}-{len(content)}")
-        
-        return {
-            "id": str(review_id),
-            "content": content,
-            "author": author,
-            "date": date,
-            "rating": rating,
-            "option": option,
-            "images": images
-        }
-    except Exception as e:
-        return None
-
-def extract_reviews_from_html(soup):
-    """HTML에서 모든 리뷰 데이터 추출"""
-    results = []
-    
-    # 리뷰 아이템 찾기 (여러 선택자 시도)
-    # 1. data-shp-contents-type="review" 속성 (가장 정확)
-    items = soup.select('li[data-shp-contents-type="review"]')
-    
-    # 2. 클래스 기반 선택자
-    if not items:
-        items = soup.select('ul.RR2FSL9wTc > li.PxsZltB5tV')
-    
-    # 3. HTT4L8U0CU 내부의 리스트
-    if not items:
-        container = soup.select_one('div.HTT4L8U0CU ul.RR2FSL9wTc')
-        if container:
-            items = container.select('li')
-    
-    for item in items:
-        review = extract_review_from_item(item)
-        if review:
-            results.append(review)
-    
-    return results
+def snapshot_review_html(driver):
+    """파싱할 HTML 스냅샷 (페이지 전체 대신 리뷰 목록 ul만, 없으면 전체 페이지)"""
+    # 스크롤하여 lazy loading 컨텐츠 로드 (리뷰 목록이 보이면 바로 진행)
+    driver.execute_script("window.scrollBy(0, 600);")
+    wait_for_review_list(driver, timeout=2)
+    
+    return driver.execute_script(REVIEW_LIST_HTML_JS) or driver.page_source
 
 def extract_reviews_from_page(driver):
     """현재 페이지에서 리뷰 추출"""
-    # 스크롤하여 lazy loading 컨텐츠 로드
-    for _ in range(2):
-        driver.execute_script("window.scrollBy(0, 300);")
-        time.sleep(0.3)
-    
-    page_source = driver.page_source
-    soup = BeautifulSoup(page_source, 'html.parser')
-    return extract_reviews_from_html(soup)
+    return parse_reviews(snapshot_review_html(driver))
+
+# 현재 페이지 첫 리뷰의 ID만 반환하는 가벼운 확인용 스크립트 (page_source/파싱 없음)
+FIRST_REVIEW_ID_JS = """
+var item = document.querySelector('li[data-shp-contents-type="review"][data-shp-contents-id]')
+    || document.querySelector('ul.RR2FSL9wTc > li.PxsZltB5tV[data-shp-contents-id]');
+return item ? item.getAttribute('data-shp-contents-id') : null;
+"""
+
+def probe_first_review_id(driver):
+    """첫 리뷰 ID 확인 (페이지 전환 여부 판단용, 실패 시 None)"""
+    try:
+        return driver.execute_script(FIRST_REVIEW_ID_JS)
+    except Exception:
+        return None
 
 def click_next_page(driver, save_debug=False):
-    """다음 페이지 버튼 클릭. 성공하면 True, 마지막 페이지면 False 반환"""
+    """다음 페이지 버튼 클릭. 성공하면 True, 마지막 페이지면 False 반환
+    
+    클릭 후 로딩 대기는 하지 않습니다 (호출 측에서 페이지 전환을 확인).
+    """
     
     def try_click(btn, method_name):
         """여러 클릭 방법 시도"""
         try:
             # 1. JavaScript 클릭
             driver.execute_script("arguments[0].click();", btn)
-            time.sleep(0.5)
             return True
         except:
             pass
@@ -164,7 +64,6 @@ def click_next_page(driver, save_debug=False):
         try:
             # 2. ActionChains 클릭
             ActionChains(driver).move_to_element(btn).click().perform()
-            time.sleep(0.5)
             return True
         except:
             pass
@@ -172,7 +71,6 @@ def click_next_page(driver, save_debug=False):
         try:
             # 3. 일반 클릭
             btn.click()
-            time.sleep(0.5)
             return True
         except:
             pass
@@ -183,12 +81,11 @@ def click_next_page(driver, save_debug=False):
         # 페이지네이션 영역으로 스크롤
         try:
             pagination = driver.find_element(By.CSS_SELECTOR, "div.LiT9lKOVbw, div.L2CTE05CX2, nav[aria-label*='페이지']")
-            driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", pagination)
-            time.sleep(1)
+            # 즉시 스크롤 (smooth 스크롤은 애니메이션이 끝날 때까지 기다려야 함)
+            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", pagination)
         except:
             # 페이지 하단으로 스크롤
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight * 0.7);")
-            time.sleep(1)
         
         # 현재 페이지 번호 확인 (여러 방법 시도)
         current_page_num = 1
@@ -215,62 +112,51 @@ def click_next_page(driver, save_debug=False):
         if save_debug:
             print(f"[DEBUG] Current page number: {current_page_num}", file=sys.stderr, flush=True)
         
+        next_page_num = current_page_num + 1
+        
         # 방법 1: 다음 페이지 번호 버튼 직접 클릭 (가장 확실)
-        try:
-            next_page_num = current_page_num + 1
+        def click_page_number():
             # 정확한 페이지 번호 찾기
             page_btn = driver.find_element(By.XPATH, f"//div[contains(@class, 'LiT9lKOVbw') or contains(@class, 'L2CTE05CX2')]//a[text()='{next_page_num}']")
-            if page_btn.is_displayed():
-                if save_debug:
-                    print(f"[DEBUG] Found page {next_page_num} button directly, clicking...", file=sys.stderr, flush=True)
-                if try_click(page_btn, "page_num"):
-                    return True
-        except Exception as e:
-            if save_debug:
-                print(f"[DEBUG] Direct page number failed: {e}", file=sys.stderr, flush=True)
+            return page_btn.is_displayed() and try_click(page_btn, "page_num")
         
         # 방법 2: "다음" 텍스트를 포함한 a 태그
-        try:
+        def click_next_span():
             next_btn = driver.find_element(By.XPATH, "//a[.//span[text()='다음']]")
             # 비활성화 클래스 확인
             btn_class = next_btn.get_attribute('class') or ''
-            if 'jKodyicQKc' not in btn_class and next_btn.is_displayed():
-                if save_debug:
-                    print(f"[DEBUG] Found 다음 button with span, clicking...", file=sys.stderr, flush=True)
-                if try_click(next_btn, "next_span"):
-                    return True
-        except Exception as e:
-            if save_debug:
-                print(f"[DEBUG] 다음 span method failed: {e}", file=sys.stderr, flush=True)
+            return 'jKodyicQKc' not in btn_class and next_btn.is_displayed() and try_click(next_btn, "next_span")
         
         # 방법 3: 페이지 번호 버튼들 중 현재+1 찾기
-        try:
-            all_page_links = driver.find_elements(By.CSS_SELECTOR, "div.LiT9lKOVbw a, div.L2CTE05CX2 a")
-            for link in all_page_links:
+        def click_page_list():
+            for link in driver.find_elements(By.CSS_SELECTOR, "div.LiT9lKOVbw a, div.L2CTE05CX2 a"):
                 link_text = link.text.strip()
-                if link_text.isdigit():
-                    page_num = int(link_text)
-                    if page_num == current_page_num + 1:
-                        if save_debug:
-                            print(f"[DEBUG] Found next page {page_num} in list, clicking...", file=sys.stderr, flush=True)
-                        if try_click(link, "page_list"):
-                            return True
-        except Exception as e:
-            if save_debug:
-                print(f"[DEBUG] Page list method failed: {e}", file=sys.stderr, flush=True)
+                if link_text.isdigit() and int(link_text) == next_page_num:
+                    return try_click(link, "page_list")
+            return False
         
         # 방법 4: I3i1NSoFdB 클래스 버튼 중 "다음"
-        try:
-            buttons = driver.find_elements(By.CSS_SELECTOR, "a.I3i1NSoFdB")
-            for btn in buttons:
+        def click_next_class():
+            for btn in driver.find_elements(By.CSS_SELECTOR, "a.I3i1NSoFdB"):
                 if '다음' in btn.text:
-                    if save_debug:
-                        print(f"[DEBUG] Found 다음 via class I3i1NSoFdB, clicking...", file=sys.stderr, flush=True)
-                    if try_click(btn, "class"):
-                        return True
-        except Exception as e:
-            if save_debug:
-                print(f"[DEBUG] Class method failed: {e}", file=sys.stderr, flush=True)
+                    return try_click(btn, "class")
+            return False
+        
+        # 정확한 페이지 번호 클릭을 항상 먼저 시도하고, 번호가 안 보일 때(페이지 그룹 끝)만 "다음" 버튼 사용
+        # "다음"은 다음 페이지 그룹으로 넘어가므로 번호 클릭과 섞어서 순위를 매기면 페이지를 건너뛸 수 있음
+        # 같은 동작을 하는 방법끼리만 최근 성공 순으로 정렬 (selector_stats)
+        strategy_groups = (
+            ("selenium.page_number", {"page_number": click_page_number, "page_list": click_page_list}),
+            ("selenium.next_button", {"next_span": click_next_span, "next_class": click_next_class}),
+        )
+        for group, strategies in strategy_groups:
+            # 마지막 페이지에서는 모든 방법이 실패하는 게 정상이므로 실패를 기록하지 않음
+            strategy, _ = selector_stats.first(group, list(strategies), lambda name: strategies[name](),
+                                               record_exhausted=False)
+            if strategy:
+                if save_debug:
+                    print(f"[DEBUG] Clicked next page via {strategy}", file=sys.stderr, flush=True)
+                return True
         
         if save_debug:
             print(f"[DEBUG] All click methods failed, no more pages", file=sys.stderr, flush=True)
@@ -281,204 +167,339 @@ def click_next_page(driver, save_debug=False):
         return False
 
 
-def get_current_page_number(driver):
-    """현재 페이지 번호 반환"""
-    try:
-        # aria-current="true"인 페이지 번호 찾기
-        current = driver.find_element(By.CSS_SELECTOR, "a[aria-current='true']")
-        return int(current.text)
-    except:
-        return 1
+def turn_to_next_page(driver, is_new_first_id, save_debug=False):
+    """다음 페이지를 클릭하고 첫 리뷰가 바뀔 때까지 대기. 전환되었으면 True
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print(json.dumps({"success": False, "error": "상품 URL이 필요합니다."}))
-        sys.exit(1)
+    is_new_first_id(first_id)는 새 페이지의 첫 리뷰인지 판단합니다.
+    클릭할 버튼이 없으면 None (마지막 페이지), 클릭했지만 전환되지 않았으면 False.
+    """
+    # 다음 페이지로 이동 시도 (의도적 지연)
+    politeness_delay()
     
-    url = sys.argv[1]
-    save_debug = len(sys.argv) > 2 and sys.argv[2] == '--debug'
-    max_pages = 3  # 최대 페이지 수 제한 (3페이지로 제한)
+    previous_first_id = probe_first_review_id(driver)
+    clicked = click_next_page(driver, save_debug)
+    if save_debug:
+        print(f"[DEBUG] Click next page result: {clicked}", file=sys.stderr, flush=True)
     
-    try:
-        # 1. 브라우저 설정 (Q&A 크롤러와 동일)
-        options = webdriver.ChromeOptions()
-        options.add_experimental_option('excludeSwitches', ['enable-logging'])
-        # 봇 탐지 우회
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        
-        # User-Agent 설정
-        options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-        
-        # 안정성 향상 옵션
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--disable-extensions')
-        options.add_argument('--remote-debugging-port=9222')
-        options.add_argument('--window-size=1920,1080')
-        options.page_load_strategy = 'normal'
-        
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-            'source': 'Object.defineProperty(navigator, "webdriver", {get: () => undefined})'
-        })
+    if not clicked:
+        # 다음 버튼이 없거나 비활성화 = 마지막 페이지
+        if save_debug:
+            print(f"[DEBUG] No more pages available", file=sys.stderr, flush=True)
+        return None
+    
+    # 새 리뷰가 로드될 때까지 대기 (첫 번째 리뷰 ID만 가볍게 확인, 전체 파싱은 전환 후 1회)
+    max_wait = 10  # 최대 10초 대기
+    started = time.time()
+    
+    def page_turned():
+        first_id = probe_first_review_id(driver)
+        return first_id and first_id != previous_first_id and is_new_first_id(first_id)
+    
+    if wait_until(page_turned, timeout=max_wait, interval=0.2):
+        if save_debug:
+            print(f"[DEBUG] New reviews detected after {time.time() - started:.1f}s", file=sys.stderr, flush=True)
+        return True
+    if save_debug:
+        print(f"[DEBUG] No new reviews after {max_wait}s wait", file=sys.stderr, flush=True)
+    return False
 
-        # 2. 페이지 접속
-        driver.get(url)
-        time.sleep(5)  # 초기 로딩 대기 시간 증가
 
-        # 3. 리뷰 탭 클릭 시도
-        wait = WebDriverWait(driver, 15)  # 대기 시간 증가
-        tab_clicked = False
-        
-        # 방법 1: "리뷰" 텍스트가 포함된 탭/링크 클릭
-        try:
-            tabs = driver.find_elements(By.CSS_SELECTOR, "a[href*='REVIEW'], button[class*='tab'], a[role='tab']")
-            for tab in tabs:
-                if '리뷰' in tab.text:
-                    tab.click()
-                    tab_clicked = True
-                    break
-            
-            if not tab_clicked:
-                review_tab = driver.find_element(By.XPATH, "//*[contains(text(), '리뷰') and (self::a or self::button or self::span)]")
-                review_tab.click()
-                tab_clicked = True
-        except:
-            pass
-        
-        # 방법 2: URL 해시 변경
-        if not tab_clicked:
-            driver.execute_script("window.location.hash = 'REVIEW';")
-        
-        time.sleep(3)
-        
-        # 4. 리뷰 섹션으로 스크롤
-        try:
-            review_section = driver.find_element(By.CSS_SELECTOR, "div.HTT4L8U0CU, ul.RR2FSL9wTc, div[class*='review']")
-            driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", review_section)
-        except:
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight / 2);")
-        
-        time.sleep(2)
-        
-        # 리뷰 리스트가 로드될 때까지 대기 (최대 10초)
-        try:
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "ul.RR2FSL9wTc > li.PxsZltB5tV"))
-            )
-            if save_debug:
-                print("[DEBUG] Review list loaded successfully", file=sys.stderr, flush=True)
-        except Exception as e:
-            if save_debug:
-                print(f"[DEBUG] Warning: Could not find review list: {e}", file=sys.stderr, flush=True)
+def crawl_pages(driver, max_pages, accept_page, collected_ids, known_ids, incremental=False, save_debug=False):
+    """추출 → 다음 페이지 클릭 → 대기를 차례로 반복 (기본 모드). 마지막 페이지 번호 반환"""
+    current_page = 1
+    
+    while current_page <= max_pages:
+        # 현재 페이지에서 리뷰 추출
+        new_count = accept_page(extract_reviews_from_page(driver), current_page)
         
-        # 추가 스크롤로 lazy loading 컨텐츠 로드
-        for _ in range(3):
-            driver.execute_script("window.scrollBy(0, 500);")
-            time.sleep(0.5)
+        # 새로운 리뷰가 없으면 종료 (이미 수집한 페이지, 증분 모드에서는 이미 저장된 페이지)
+        if new_count == 0 and (current_page > 1 or incremental):
+            break
         
-        time.sleep(2)  # 추가 안정화 대기
+        turned = turn_to_next_page(driver, lambda first_id: first_id not in collected_ids, save_debug)
+        if turned is None:
+            break
         
-        # 5. 전체 리뷰 수집 (페이지네이션 포함)
-        all_results = []
-        collected_ids = set()  # 중복 방지용
-        current_page = 1
+        current_page += 1
         
-        while current_page <= max_pages:
-            # 현재 페이지에서 리뷰 추출
+        if not turned:
+            # 그래도 한번 더 시도해보고 종료
             page_reviews = extract_reviews_from_page(driver)
-            
-            # 중복 제거하며 추가
-            new_count = 0
-            for review in page_reviews:
-                if review['id'] not in collected_ids:
-                    collected_ids.add(review['id'])
-                    all_results.append(review)
-                    new_count += 1
-            
-            # 새로운 리뷰가 없으면 종료 (이미 수집한 페이지일 수 있음)
-            if new_count == 0 and current_page > 1:
+            new_count_check = sum(1 for r in page_reviews if r['id'] not in collected_ids and r['id'] not in known_ids)
+            if new_count_check == 0:
                 break
+    
+    return current_page
+
+
+def crawl_pages_pipelined(driver, max_pages, accept_page, incremental=False, save_debug=False):
+    """파이프라인 모드: 리뷰 목록 HTML만 떠 두고 바로 다음 페이지를 클릭한 뒤,
+    브라우저가 다음 페이지를 불러오는 동안 작업 스레드에서 스냅샷을 파싱합니다.
+
+    결과는 페이지 순서대로 accept_page에 전달됩니다. 종료 조건(새 리뷰 없음)은
+    파싱이 끝난 뒤에야 알 수 있으므로 마지막에 한 페이지를 더 넘길 수 있습니다.
+    크롤링한 페이지 수를 반환합니다.
+    """
+    seen_first_ids = set()
+    pages_parsed = 0
+    current_page = 1
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        while current_page <= max_pages:
+            seen_first_ids.add(probe_first_review_id(driver))
+            parsing = executor.submit(parse_reviews, snapshot_review_html(driver))
             
-            # 디버그 출력
-            if save_debug:
-                print(f"[DEBUG] Page {current_page}: {new_count} new reviews (Total: {len(all_results)})", file=sys.stderr, flush=True)
-            
-            # 다음 페이지로 이동 시도
-            time.sleep(1.5)  # 페이지 안정화 대기
+            # 파싱이 도는 동안 다음 페이지로 이동 시작 (마지막 페이지면 클릭하지 않음)
+            turned = None
+            if current_page < max_pages:
+                turned = turn_to_next_page(driver, lambda first_id: first_id not in seen_first_ids, save_debug)
             
-            clicked = click_next_page(driver, save_debug)
-            if save_debug:
-                print(f"[DEBUG] Click next page result: {clicked}", file=sys.stderr, flush=True)
+            new_count = accept_page(parsing.result(), current_page)
+            pages_parsed = current_page
             
-            if not clicked:
-                # 다음 버튼이 없거나 비활성화 = 마지막 페이지
-                if save_debug:
-                    print(f"[DEBUG] No more pages available", file=sys.stderr, flush=True)
+            # 새로운 리뷰가 없으면 종료 (이미 수집한 페이지, 증분 모드에서는 이미 저장된 페이지)
+            if new_count == 0 and (current_page > 1 or incremental):
+                break
+            if turned is None:
                 break
             
-            # 페이지 로딩 대기 (더 길게)
-            time.sleep(2)
+            # 전환 대기가 시간 초과여도 다음 스냅샷을 파싱해 보고, 새 리뷰가 없으면 위에서 종료
             current_page += 1
-            
-            # 새 리뷰가 로드될 때까지 대기 (첫 번째 리뷰 ID가 변경되는지 확인)
-            old_first_id = all_results[-1]['id'] if all_results else None  # 마지막으로 수집한 ID
-            
-            max_wait = 10  # 최대 10초 대기
-            waited = 0
-            new_reviews_loaded = False
-            
-            while waited < max_wait:
-                time.sleep(1)
-                waited += 1
-                
-                # 현재 페이지의 첫 리뷰 ID 확인
-                current_reviews = extract_reviews_from_page(driver)
-                if current_reviews:
-                    first_current_id = current_reviews[0]['id']
-                    # 새 리뷰가 있으면 (기존에 수집하지 않은 ID)
-                    if first_current_id not in collected_ids:
-                        new_reviews_loaded = True
-                        if save_debug:
-                            print(f"[DEBUG] New reviews detected on page {current_page} after {waited}s", file=sys.stderr, flush=True)
-                        break
-                
-                # 스크롤하여 컨텐츠 로딩 유도
-                driver.execute_script("window.scrollBy(0, 100);")
-            
-            if not new_reviews_loaded:
-                if save_debug:
-                    print(f"[DEBUG] No new reviews after {max_wait}s wait, stopping", file=sys.stderr, flush=True)
-                # 그래도 한번 더 시도해보고 종료
-                page_reviews = extract_reviews_from_page(driver)
-                new_count_check = sum(1 for r in page_reviews if r['id'] not in collected_ids)
-                if new_count_check == 0:
-                    break
+    
+    return pages_parsed
+
+
+def sort_by_recent(driver):
+    """리뷰 정렬을 최신순으로 변경 (증분 크롤링용)"""
+    try:
+        btn = driver.find_element(By.XPATH, "//a[normalize-space(text())='최신순'] | //button[normalize-space(text())='최신순']")
+        driver.execute_script("arguments[0].click();", btn)
+        return True
+    except:
+        return False
+
+
+def get_current_page_number(driver):
+    """현재 페이지 번호 반환"""
+    try:
+        # aria-current="true"인 페이지 번호 찾기
+        current = driver.find_element(By.CSS_SELECTOR, "a[aria-current='true']")
+        return int(current.text)
+    except:
+        return 1
+
+def create_driver():
+    """리뷰 크롤링용 Chrome 드라이버 생성 (Q&A 크롤러와 동일한 설정)"""
+    options = webdriver.ChromeOptions()
+    options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    # 봇 탐지 우회
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    
+    # User-Agent 설정
+    options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+    
+    # 안정성 향상 옵션
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--disable-extensions')
+    # 인스턴스마다 빈 포트와 프로필 (여러 크롤러를 동시에 실행해도 충돌하지 않음)
+    # CRAWLER_PERSISTENT_PROFILE=1이면 디스크 캐시가 남는 영구 프로필 슬롯 사용
+    profile_dir, persistent = browser_profile.acquire_profile_dir()
+    options.add_argument(f'--remote-debugging-port={browser_profile.free_port()}')
+    for arg in browser_profile.chrome_profile_args(profile_dir, persistent):
+        options.add_argument(arg)
+    options.add_argument('--window-size=1920,1080')
+    options.page_load_strategy = 'normal'
+    # 크롤링마다 전송량/차단 건수를 집계하기 위한 Network 이벤트 로그
+    resource_blocking.selenium_logging_options(options)
+    
+    try:
+        driver = chromedriver_resolver.start_chrome(options)
+    except Exception:
+        browser_profile.release_profile_dir(profile_dir, persistent)
+        raise
+    browser_profile.attach_profile(driver, profile_dir, persistent)
+    browser_profile.restore_cookies(driver)
+    # 이미지/폰트/동영상/추적 비콘 차단 (resource_blocking.py)
+    resource_blocking.apply_selenium(driver)
+    driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+        'source': 'Object.defineProperty(navigator, "webdriver", {get: () => undefined})'
+    })
+    return driver
+
+
+def get_driver_pool():
+    """Selenium 리뷰 크롤러 브라우저 풀"""
+    return browser_pool.get_pool('selenium-review', create_driver)
+
+
+def crawl_reviews(url, max_pages=3, save_debug=False, driver=None, incremental=False, on_page=None,
+                  keep_reviews=True, pipeline=False):
+    """리뷰 크롤링 메인 함수 (driver를 넘기지 않으면 브라우저 풀에서 대여)
+    
+    incremental=True면 최신순으로 읽고 DB에 이미 저장된 리뷰만 남은 페이지에서 멈춥니다.
+    on_page(reviews, page_number)를 넘기면 페이지마다 새로 수집한 리뷰로 즉시 호출합니다.
+    keep_reviews=False면 결과에 리뷰 목록을 모으지 않습니다 (스트리밍 출력용).
+    pipeline=True면 HTML 파싱을 다음 페이지 로딩과 겹쳐 실행합니다 (crawl_pages_pipelined 참고).
+    """
+    if driver is None:
+        with get_driver_pool().checkout() as lease:
+            result = crawl_reviews(url, max_pages, save_debug, driver=lease.browser,
+                                   incremental=incremental, on_page=on_page, keep_reviews=keep_reviews,
+                                   pipeline=pipeline)
+            lease.pages += result.get('pages_crawled', 0)
+            return result
+    
+    # 증분 모드: 이미 저장된 리뷰 ID를 기준점으로 사용
+    known_ids = get_known_review_ids(url) if incremental else set()
+    
+    # 이번 크롤링의 전송량/차단 건수 집계 시작 (collect_metrics에서 종료)
+    resource_blocking.start_metering(driver, 'selenium')
+    
+    # 1. 페이지 접속
+    driver.get(url)
+    wait_until(lambda: document_ready(driver), timeout=10)  # 문서 로딩 완료 즉시 진행
+
+    # 2. 리뷰 탭 클릭 시도
+    wait = WebDriverWait(driver, 15)  # 대기 시간 증가
+    tab_clicked = False
+    
+    # 방법 1: "리뷰" 텍스트가 포함된 탭/링크 클릭
+    try:
+        tabs = driver.find_elements(By.CSS_SELECTOR, "a[href*='REVIEW'], button[class*='tab'], a[role='tab']")
+        for tab in tabs:
+            if '리뷰' in tab.text:
+                tab.click()
+                tab_clicked = True
+                break
         
-        # 디버깅용 HTML 저장
+        if not tab_clicked:
+            review_tab = driver.find_element(By.XPATH, "//*[contains(text(), '리뷰') and (self::a or self::button or self::span)]")
+            review_tab.click()
+            tab_clicked = True
+    except:
+        pass
+    
+    # 방법 2: URL 해시 변경
+    if not tab_clicked:
+        driver.execute_script("window.location.hash = 'REVIEW';")
+    
+    # 리뷰 섹션이 DOM에 나타날 때까지 대기
+    wait_until(lambda: element_count(driver, "div.HTT4L8U0CU, ul.RR2FSL9wTc"), timeout=5)
+    
+    # 3. 리뷰 섹션으로 스크롤
+    try:
+        review_section = driver.find_element(By.CSS_SELECTOR, "div.HTT4L8U0CU, ul.RR2FSL9wTc, div[class*='review']")
+        driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", review_section)
+    except:
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight / 2);")
+    
+    # 리뷰 리스트가 로드될 때까지 대기 (최대 10초)
+    try:
+        WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "ul.RR2FSL9wTc > li.PxsZltB5tV"))
+        )
         if save_debug:
-            with open('debug_review_page.html', 'w', encoding='utf-8') as f:
-                f.write(driver.page_source)
-        
-        driver.quit()
-        
-        # JSON 출력
-        output = {
-            "success": True, 
-            "data": all_results, 
-            "count": len(all_results),
-            "pages_crawled": current_page
-        }
-        
-        print(json.dumps(output, ensure_ascii=False))
+            print("[DEBUG] Review list loaded successfully", file=sys.stderr, flush=True)
+    except Exception as e:
+        if save_debug:
+            print(f"[DEBUG] Warning: Could not find review list: {e}", file=sys.stderr, flush=True)
+    
+    # 추가 스크롤로 lazy loading 컨텐츠 로드
+    driver.execute_script("window.scrollBy(0, 1500);")
+    
+    # 증분 모드: 최신순 정렬 (첫 리뷰가 바뀔 때까지 대기)
+    if incremental:
+        signature = first_review_signature(driver)
+        if sort_by_recent(driver):
+            wait_for_page_change(driver, signature, timeout=5)
+    
+    # 4. 전체 리뷰 수집 (페이지네이션 포함)
+    all_results = []
+    collected_ids = set()  # 중복 방지용
+    
+    def accept_page(page_reviews, page_number):
+        """파싱한 페이지 결과를 중복 제거하며 반영하고 새 리뷰 수를 반환"""
+        new_reviews = []
+        for review in page_reviews:
+            if review['id'] not in collected_ids and review['id'] not in known_ids:
+                collected_ids.add(review['id'])
+                new_reviews.append(review)
+        if keep_reviews:
+            all_results.extend(new_reviews)
+        
+        # 페이지 단위 후처리 (예: 바로 DB 저장)
+        if on_page and new_reviews:
+            on_page(new_reviews, page_number)
+        
+        # 디버그 출력
+        if save_debug:
+            print(f"[DEBUG] Page {page_number}: {len(new_reviews)} new reviews (Total: {len(collected_ids)})", file=sys.stderr, flush=True)
+        return len(new_reviews)
+    
+    if pipeline:
+        current_page = crawl_pages_pipelined(driver, max_pages, accept_page, incremental, save_debug)
+    else:
+        current_page = crawl_pages(driver, max_pages, accept_page, collected_ids, known_ids, incremental, save_debug)
+    
+    # 디버깅용 HTML 저장
+    if save_debug:
+        with open('debug_review_page.html', 'w', encoding='utf-8') as f:
+            f.write(driver.page_source)
+    
+    # 이번 실행의 선택자 통계 저장, 영구 프로필 모드면 쿠키 저장
+    selector_stats.flush()
+    browser_profile.store_cookies(driver)
+    
+    return {
+        "success": True, 
+        "data": all_results, 
+        "count": len(collected_ids),
+        "pages_crawled": current_page,
+        "resources": resource_blocking.collect_metrics(driver, 'selenium'),
+        "driver": chromedriver_resolver.last_resolution()
+    }
+
+
+if __name__ == "__main__":
+    # UTF-8 출력 설정 (모듈로 import될 때는 호출자의 스트림을 건드리지 않음)
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+    
+    if len(sys.argv) < 2:
+        print(json.dumps({"success": False, "error": "상품 URL이 필요합니다."}))
+        sys.exit(1)
+    
+    url = sys.argv[1]
+    save_debug = '--debug' in sys.argv[2:]
+    incremental = '--incremental' in sys.argv[2:]
+    ndjson = '--ndjson' in sys.argv[2:]
+    pipeline = '--pipeline' in sys.argv[2:]
+    max_pages = 3  # 기본 최대 페이지 수 (--pages N으로 변경)
+    if '--pages' in sys.argv[2:]:
+        idx = sys.argv.index('--pages')
+        if idx + 1 < len(sys.argv):
+            max_pages = int(sys.argv[idx + 1])
+    
+    # NDJSON 모드: 페이지마다 바로 출력하고 리뷰 목록은 메모리에 모으지 않음
+    stream = NdjsonWriter() if ndjson else None
+    
+    try:
+        if stream:
+            output = crawl_reviews(url, max_pages, save_debug, incremental=incremental,
+                                   on_page=stream.page, keep_reviews=False, pipeline=pipeline)
+            stream.summary(output)
+        else:
+            output = crawl_reviews(url, max_pages, save_debug, incremental=incremental, pipeline=pipeline)
+            
+            # JSON 출력
+            print(json.dumps(output, ensure_ascii=False))
 
     except Exception as e:
-        if 'driver' in locals():
-            try:
-                driver.quit()
-            except:
-                pass
-        print(json.dumps({"success": False, "error": str(e)}))
+        if stream:
+            stream.error(str(e))
+        else:
+            print(json.dumps({"success": False, "error": str(e)}))
@@ -5,7 +5,9 @@
 봇 탐지 우회 기능 강화
 
 사용법:
-    python naver_review_crawler_playwright.py <상품URL> [--pages N] [--debug]
+    python naver_review_crawler_playwright.py <상품URL> [--pages N] [--ndjson] [--debug]
+
+    --ndjson: 페이지마다 리뷰를 한 줄에 하나씩 바로 출력 (crawl_output.py 참고)
 """
 
 import json
@@ -16,35 +18,85 @@ import random
 from datetime import datetime
 from playwright.sync_api import sync_playwright
 
+import browser_profile
+import resource_blocking
+import selector_stats
+from crawl_output import NdjsonWriter
+from crawl_wait import wait_until, politeness_delay, first_review_signature, wait_for_page_change
+
 
 def random_delay(min_sec=1, max_sec=3):
     """랜덤 딜레이 (봇 탐지 우회)"""
     time.sleep(random.uniform(min_sec, max_sec))
 
 
+# 선택자 후보 (selector_stats가 최근에 성공한 것부터 시도하도록 순서를 조정)
+REVIEW_SELECTORS = [
+    "li[class*='reviewItems_review']",
+    "li[class*='review_list_item']",
+    "div[class*='review_item']",
+    "li.review_list_v2_item",
+]
+RATING_SELECTORS = [
+    "span[class*='reviewItems_average']",
+    "em[class*='grade']",
+    "span[class*='star_score']",
+    "div[class*='rating'] span",
+]
+AUTHOR_SELECTORS = [
+    "span[class*='reviewItems_user_id']",
+    "span[class*='user_id']",
+    "em[class*='author']",
+    "span[class*='reviewer']",
+]
+DATE_SELECTORS = [
+    "span[class*='reviewItems_date']",
+    "span[class*='date']",
+    "em[class*='date']",
+]
+OPTION_SELECTORS = [
+    "span[class*='reviewItems_option']",
+    "div[class*='option']",
+    "span[class*='product_option']",
+]
+CONTENT_SELECTORS = [
+    "span[class*='reviewItems_review__text']",
+    "div[class*='review_content']",
+    "p[class*='content']",
+    "div[class*='text']",
+]
+NEXT_BUTTON_SELECTORS = [
+    "a:has-text('다음')",
+    "button:has-text('다음')",
+    "a[class*='next']",
+    "button[class*='next']",
+]
+
+
+def first_text(elem, group, selectors, pattern=None):
+    """선택자 후보 중 처음으로 텍스트가 나오는 것의 값 (pattern이 있으면 첫 그룹)"""
+    def attempt(selector):
+        found = elem.query_selector(selector)
+        if not found:
+            return None
+        text = found.inner_text().strip()
+        if pattern:
+            match = re.search(pattern, text)
+            return match.group(1) if match else None
+        return text
+    return selector_stats.first(f"playwright.{group}", selectors, attempt)[1]
+
+
 def extract_reviews_from_page(page):
     """현재 페이지에서 리뷰 추출"""
     reviews = []
     
     # 리뷰 컨테이너 선택자들
-    review_selectors = [
-        "li[class*='reviewItems_review']",
-        "li[class*='review_list_item']",
-        "div[class*='review_item']",
-        "li.review_list_v2_item",
-    ]
-    
-    review_elements = []
-    for selector in review_selectors:
-        try:
-            elements = page.query_selector_all(selector)
-            if elements:
-                review_elements = elements
-                break
-        except:
-            continue
+    _, review_elements = selector_stats.first(
+        "playwright.review_item", REVIEW_SELECTORS, page.query_selector_all
+    )
     
-    for elem in review_elements:
+    for elem in review_elements or []:
         try:
             review = {}
             
@@ -57,98 +109,20 @@ def extract_reviews_from_page(page):
             review['id'] = review_id
             
             # 평점 추출
-            rating = 5
-            rating_selectors = [
-                "span[class*='reviewItems_average']",
-                "em[class*='grade']",
-                "span[class*='star_score']",
-                "div[class*='rating'] span",
-            ]
-            for sel in rating_selectors:
-                try:
-                    rating_elem = elem.query_selector(sel)
-                    if rating_elem:
-                        rating_text = rating_elem.inner_text()
-                        match = re.search(r'(\d+)', rating_text)
-                        if match:
-                            rating = int(match.group(1))
-                            break
-                except:
-                    continue
-            review['rating'] = rating
+            rating = first_text(elem, "rating", RATING_SELECTORS, r'(\d+)')
+            review['rating'] = int(rating) if rating else 5
             
             # 작성자 추출
-            author = "익명"
-            author_selectors = [
-                "span[class*='reviewItems_user_id']",
-                "span[class*='user_id']",
-                "em[class*='author']",
-                "span[class*='reviewer']",
-            ]
-            for sel in author_selectors:
-                try:
-                    author_elem = elem.query_selector(sel)
-                    if author_elem:
-                        author = author_elem.inner_text().strip()
-                        if author:
-                            break
-                except:
-                    continue
-            review['author'] = author
+            review['author'] = first_text(elem, "author", AUTHOR_SELECTORS) or "익명"
             
             # 날짜 추출
-            date = ""
-            date_selectors = [
-                "span[class*='reviewItems_date']",
-                "span[class*='date']",
-                "em[class*='date']",
-            ]
-            for sel in date_selectors:
-                try:
-                    date_elem = elem.query_selector(sel)
-                    if date_elem:
-                        date = date_elem.inner_text().strip()
-                        if date:
-                            break
-                except:
-                    continue
-            review['date'] = date
+            review['date'] = first_text(elem, "date", DATE_SELECTORS) or ""
             
             # 옵션 추출
-            option = ""
-            option_selectors = [
-                "span[class*='reviewItems_option']",
-                "div[class*='option']",
-                "span[class*='product_option']",
-            ]
-            for sel in option_selectors:
-                try:
-                    option_elem = elem.query_selector(sel)
-                    if option_elem:
-                        option = option_elem.inner_text().strip()
-                        if option:
-                            break
-                except:
-                    continue
-            review['option'] = option
+            review['option'] = first_text(elem, "option", OPTION_SELECTORS) or ""
             
             # 내용 추출
-            content = ""
-            content_selectors = [
-                "span[class*='reviewItems_review__text']",
-                "div[class*='review_content']",
-                "p[class*='content']",
-                "div[class*='text']",
-            ]
-            for sel in content_selectors:
-                try:
-                    content_elem = elem.query_selector(sel)
-                    if content_elem:
-                        content = content_elem.inner_text().strip()
-                        if content:
-                            break
-                except:
-                    continue
+            content = first_text(elem, "content", CONTENT_SELECTORS) or ""
             
             # 내용이 없으면 전체 텍스트에서 추출 시도
             if not content:
@@ -181,41 +155,23 @@ def extract_reviews_from_page(page):
     return reviews
 
 
-def click_next_page(page, current_page):
-    """다음 페이지로 이동"""
+def click_next_page(page, current_page, delay=True):
+    """다음 페이지로 이동 (delay=False면 클릭 후 고정 대기 없음)
+
+    정확한 페이지 번호 클릭을 항상 먼저 시도하고, 번호가 안 보일 때(페이지 그룹 끝)만 다음 버튼을 씁니다.
+    같은 동작을 하는 방법끼리만 성공 통계(selector_stats)에 따라 최근에 성공한 방법부터 시도합니다.
+    """
     next_page = current_page + 1
     
-    # 방법 1: 페이지 번호 직접 클릭
-    try:
-        page_link = page.query_selector(f"a:has-text('{next_page}')")
-        if page_link and page_link.is_visible():
-            page_link.click()
-            random_delay(1, 2)
+    def click_visible(selector):
+        btn = page.query_selector(selector)
+        if btn and btn.is_visible():
+            btn.click()
             return True
-    except:
-        pass
-    
-    # 방법 2: 다음 버튼 클릭
-    next_selectors = [
-        "a:has-text('다음')",
-        "button:has-text('다음')",
-        "a[class*='next']",
-        "button[class*='next']",
-    ]
-    
-    for selector in next_selectors:
-        try:
-            next_btn = page.query_selector(selector)
-            if next_btn and next_btn.is_visible():
-                next_btn.click()
-                random_delay(1, 2)
-                return True
-        except:
-            continue
+        return False
     
-    # 방법 3: JavaScript로 클릭
-    try:
-        result = page.evaluate(f"""
+    def click_by_js(_):
+        return page.evaluate(f"""
             () => {{
                 const links = document.querySelectorAll('a');
                 for (const link of links) {{
@@ -227,17 +183,35 @@ def click_next_page(page, current_page):
                 return false;
             }}
         """)
-        if result:
-            random_delay(1, 2)
-            return True
-    except:
-        pass
     
-    return False
+    # 방법 1: 페이지 번호 직접 클릭 또는 JavaScript로 클릭 / 방법 2: 다음 버튼 클릭 (다음 페이지 그룹으로 이동)
+    page_number_strategies = {
+        "page_number": lambda _: click_visible(f"a:has-text('{next_page}')"),
+        "js_page_number": click_by_js,
+    }
+    next_button_strategies = {selector: click_visible for selector in NEXT_BUTTON_SELECTORS}
+    
+    # 마지막 페이지에서는 모든 방법이 실패하는 게 정상이므로 실패를 기록하지 않음
+    for group, strategies in (("playwright.page_number", page_number_strategies),
+                              ("playwright.next_button", next_button_strategies)):
+        strategy, _ = selector_stats.first(
+            group, list(strategies), lambda name: strategies[name](name), record_exhausted=False
+        )
+        if strategy:
+            break
+    else:
+        return False
+    if delay:
+        random_delay(1, 2)
+    return True
 
 
-def crawl_reviews(url, max_pages=3, debug=False):
-    """리뷰 크롤링 메인 함수"""
+def crawl_reviews(url, max_pages=3, debug=False, on_page=None, keep_reviews=True):
+    """리뷰 크롤링 메인 함수
+    
+    on_page(reviews, page_number)는 페이지마다 새 리뷰로 호출되며,
+    keep_reviews=False면 결과에 리뷰 목록을 모으지 않습니다 (스트리밍 출력용).
+    """
     
     all_reviews = []
     collected_ids = set()
@@ -245,25 +219,46 @@ def crawl_reviews(url, max_pages=3, debug=False):
     
     with sync_playwright() as p:
         # 브라우저 실행 (봇 탐지 우회 설정)
-        browser = p.chromium.launch(
-            headless=False,  # 디버깅을 위해 headless=False
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--no-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-web-security',
-                '--disable-features=IsolateOrigins,site-per-process',
-            ]
-        )
+        launch_args = [
+            '--disable-blink-features=AutomationControlled',
+            '--no-sandbox',
+            '--disable-dev-shm-usage',
+            '--disable-web-security',
+            '--disable-features=IsolateOrigins,site-per-process',
+        ]
+        context_options = {
+            'viewport': {'width': 1920, 'height': 1080},
+            'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'locale': 'ko-KR',
+            'timezone_id': 'Asia/Seoul',
+        }
         
-        context = browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            locale='ko-KR',
-            timezone_id='Asia/Seoul',
+        # CRAWLER_PERSISTENT_PROFILE=1이면 디스크 캐시가 남는 영구 프로필 슬롯 사용
+        profile_dir, persistent = (
+            browser_profile.acquire_profile_dir() if browser_profile.PERSISTENT else (None, False)
         )
+        if persistent:
+            browser = None
+            context = p.chromium.launch_persistent_context(
+                profile_dir,
+                headless=False,
+                args=launch_args + [f'--disk-cache-size={browser_profile.DISK_CACHE_MB * 1024 * 1024}'],
+                **context_options
+            )
+        else:
+            browser = p.chromium.launch(
+                headless=False,  # 디버깅을 위해 headless=False
+                args=launch_args
+            )
+            context = browser.new_context(**context_options)
+        browser_profile.restore_cookies(context)
+        
+        # 이미지/폰트/동영상/추적 비콘 차단 (resource_blocking.py)
+        blocker = resource_blocking.apply_playwright(context)
         
         page = context.new_page()
+        # 이번 크롤링의 전송량 집계 (차단 건수는 blocker가 집계)
+        resource_blocking.start_metering(page, 'playwright')
         
         # Stealth: 봇 탐지 우회 스크립트
         page.add_init_script("""
@@ -313,8 +308,8 @@ def crawl_reviews(url, max_pages=3, debug=False):
         
         try:
             # 페이지 접속
+            # networkidle까지 기다리므로 추가 고정 대기 불필요
             page.goto(url, wait_until='networkidle', timeout=30000)
-            random_delay(3, 5)
             
             # 리뷰 탭 클릭
             review_tab_clicked = False
@@ -324,31 +319,31 @@ def crawl_reviews(url, max_pages=3, debug=False):
                 "[role='tab']:has-text('리뷰')",
             ]
             
-            for selector in review_tab_selectors:
-                try:
-                    tab = page.query_selector(selector)
-                    if tab and tab.is_visible():
-                        tab.click()
-                        review_tab_clicked = True
-                        random_delay(2, 3)
-                        break
-                except:
-                    continue
+            def click_tab(selector):
+                tab = page.query_selector(selector)
+                if tab and tab.is_visible():
+                    tab.click()
+                    return True
+                return False
+            
+            if selector_stats.first("playwright.review_tab", review_tab_selectors, click_tab)[0]:
+                review_tab_clicked = True
+                wait_until(lambda: first_review_signature(page), timeout=5)
             
             # URL 해시로 리뷰 섹션 이동
             if not review_tab_clicked:
                 page.evaluate("window.location.hash = 'REVIEW'")
-                random_delay(2, 3)
+                wait_until(lambda: first_review_signature(page), timeout=5)
             
             # 리뷰 섹션으로 스크롤
             page.evaluate("window.scrollTo(0, document.body.scrollHeight / 2)")
-            random_delay(1, 2)
+            wait_until(lambda: first_review_signature(page), timeout=5)
             
             # 디버그: HTML 저장
             if debug:
                 with open('debug_playwright_page.html', 'w', encoding='utf-8') as f:
                     f.write(page.content())
-                print(f"[DEBUG] HTML saved to debug_playwright_page.html")
+                print(f"[DEBUG] HTML saved to debug_playwright_page.html", file=sys.stderr)
             
             # 페이지별 크롤링
             current_page = 1
@@ -358,27 +353,34 @@ def crawl_reviews(url, max_pages=3, debug=False):
                 page_reviews = extract_reviews_from_page(page)
                 
                 # 중복 제거하며 추가
-                new_count = 0
+                new_reviews = []
                 for review in page_reviews:
                     if review['id'] not in collected_ids:
                         collected_ids.add(review['id'])
-                        all_reviews.append(review)
-                        new_count += 1
+                        new_reviews.append(review)
+                
+                new_count = len(new_reviews)
+                if keep_reviews:
+                    all_reviews.extend(new_reviews)
+                if on_page and new_reviews:
+                    on_page(new_reviews, current_page)
                 
                 if debug:
-                    print(f"[DEBUG] Page {current_page}: {new_count} new reviews (Total: {len(all_reviews)})")
+                    print(f"[DEBUG] Page {current_page}: {new_count} new reviews (Total: {len(collected_ids)})", file=sys.stderr)
                 
                 # 새 리뷰가 없으면 종료
                 if new_count == 0 and current_page > 1:
                     break
                 
-                # 다음 페이지 이동
+                # 다음 페이지 이동 (첫 리뷰가 바뀌는 즉시 진행, 의도적 지연은 별도)
                 if current_page < max_pages:
-                    if not click_next_page(page, current_page):
+                    politeness_delay()
+                    signature = first_review_signature(page)
+                    if not click_next_page(page, current_page, delay=False):
                         if debug:
-                            print(f"[DEBUG] No more pages after page {current_page}")
+                            print(f"[DEBUG] No more pages after page {current_page}", file=sys.stderr)
                         break
-                    random_delay(1, 2)
+                    wait_for_page_change(page, signature, timeout=10)
                 
                 current_page += 1
             
@@ -386,16 +388,26 @@ def crawl_reviews(url, max_pages=3, debug=False):
             
         except Exception as e:
             if debug:
-                print(f"[DEBUG] Error: {e}")
+                print(f"[DEBUG] Error: {e}", file=sys.stderr)
             pages_crawled = 0
         
-        browser.close()
+        resources = resource_blocking.collect_metrics(page, 'playwright', blocker)
+        browser_profile.store_cookies(context)
+        context.close()
+        if browser:
+            browser.close()
+        if persistent:
+            browser_profile.release_profile_dir(profile_dir, persistent)
+    
+    # 이번 실행의 선택자 통계 저장
+    selector_stats.flush()
     
     return {
         'success': True,
         'reviews': all_reviews,
-        'count': len(all_reviews),
-        'pages_crawled': pages_crawled
+        'count': len(collected_ids),
+        'pages_crawled': pages_crawled,
+        'resources': resources
     }
 
 
@@ -407,6 +419,7 @@ def main():
     url = sys.argv[1]
     max_pages = 3
     debug = False
+    ndjson = False
     
     # 인자 파싱
     i = 2
@@ -414,12 +427,26 @@ def main():
         if sys.argv[i] == '--pages' and i + 1 < len(sys.argv):
             max_pages = int(sys.argv[i + 1])
             i += 2
+        elif sys.argv[i] == '--ndjson':
+            ndjson = True
+            i += 1
         elif sys.argv[i] == '--debug':
             debug = True
             i += 1
         else:
             i += 1
     
+    # NDJSON 모드: 페이지마다 바로 출력하고 리뷰 목록은 메모리에 모으지 않음
+    if ndjson:
+        stream = NdjsonWriter()
+        try:
+            result = crawl_reviews(url, max_pages, debug, on_page=stream.page, keep_reviews=False)
+        except Exception as e:
+            stream.error(str(e))
+            sys.exit(1)
+        stream.summary(result)
+        return
+    
     # 크롤링 실행
     result = crawl_reviews(url, max_pages, debug)
     
@@ -5,9 +5,16 @@
 CDP 프로토콜을 사용하여 봇 탐지를 우회합니다.
 
 사용법:
-    python naver_review_drission.py <상품URL> [--pages N] [--debug]
+    python naver_review_drission.py <상품URL> [--pages N] [--network] [--incremental] [--ndjson] [--tabs K] [--debug]
+
+    --network: 리뷰 API 응답(JSON)을 감청하여 추출 (DOM 탐색 생략)
+    --incremental: 최신순으로 읽고 DB에 이미 저장된 리뷰만 남은 페이지에서 중단
+    --ndjson: 페이지마다 리뷰를 한 줄에 하나씩 바로 출력 (crawl_output.py 참고)
+    --tabs K: 같은 브라우저에서 탭 K개로 페이지 구간을 나눠 동시에 크롤링
+    
+로그는 모두 stderr로 출력되므로 stdout에는 결과 JSON만 나옵니다.
     
-주의: 크롬 브라우저가 실행 중이면 종료 후 실행하세요.
+브라우저마다 빈 포트와 임시 프로필을 쓰므로 여러 개를 동시에 실행해도 됩니다 (browser_profile.py).
 """
 
 import json
@@ -15,431 +22,412 @@ import sys
 import time
 import re
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from DrissionPage import ChromiumPage, ChromiumOptions
 
+import browser_pool
+import browser_profile
+import resource_blocking
+import selector_stats
+from crawl_output import NdjsonWriter
+from crawl_wait import (wait_until, politeness_delay, document_ready, element_count,
+                        wait_for_review_list, first_review_signature, wait_for_page_change)
+from naver_review_api_crawler import extract_review_list, parse_review
+from save_reviews_to_db import get_known_review_ids
 
-def random_delay(min_sec=1, max_sec=3):
-    """랜덤 딜레이"""
-    time.sleep(random.uniform(min_sec, max_sec))
 
+# 상품 페이지가 리뷰 페이지마다 호출하는 리뷰 API (네트워크 캡처 모드에서 감청)
+REVIEW_API_TARGETS = [
+    'contents/reviews/query-pages',
+    'reviews/paged-reviews',
+    'contents/reviews/product-reviews',
+]
+NETWORK_WAIT_TIMEOUT = 15
 
-def extract_reviews_from_page(page, debug=False):
-    """현재 페이지에서 리뷰 추출 - JavaScript로 직접 추출 (판매자 답변 제외)"""
-    reviews = []
-    
-    if debug:
-        print("[DEBUG] Starting review extraction...")
-    
-    # JavaScript로 리뷰 데이터 추출 (DOM 직접 접근) - 유연한 셀렉터 사용
-    # 판매자 답변(Wsm9me_nCc 또는 gCwNtyh1ki 클래스)은 제외하고 사용자 리뷰만 추출
-    js_code = '''
-    (function() {
-        var reviews = [];
-        var items = document.querySelectorAll('ul.RR2FSL9wTc > li.PxsZltB5tV');
-        console.log('[JS] Found ' + items.length + ' review items');
-        
-        items.forEach(function(item, index) {
-            var review = {};
-            
-            // ID
-            review.id = item.getAttribute('data-shp-contents-id') || ('review_' + index);
-            
-            // 평점 - 여러 클래스 시도 (판매자 답변 영역 제외)
-            // 판매자 답변 영역(gCwNtyh1ki)이 아닌 곳에서만 평점 추출
-            var ratingElem = null;
-            var ratingCandidates = item.querySelectorAll('em.n6zq2yy0KA, em[class*="n6zq2yy0KA"]');
-            for (var i = 0; i < ratingCandidates.length; i++) {
-                var elem = ratingCandidates[i];
-                // 판매자 답변 영역의 자식이 아닌지 확인
-                if (!elem.closest('.gCwNtyh1ki, div[class*="gCwNtyh1ki"]')) {
-                    ratingElem = elem;
-                    break;
-                }
+
+# 리뷰 데이터 추출 스크립트 (DOM 직접 접근) - 유연한 셀렉터 사용
+# 판매자 답변(Wsm9me_nCc 또는 gCwNtyh1ki 클래스)은 제외하고 사용자 리뷰만 추출
+# (benchmark_parsers.py에서 저장된 페이지에 대해 그대로 실행)
+EXTRACT_REVIEWS_JS = '''
+(function() {
+    var reviews = [];
+    var items = document.querySelectorAll('ul.RR2FSL9wTc > li.PxsZltB5tV');
+    console.log('[JS] Found ' + items.length + ' review items');
+
+    items.forEach(function(item, index) {
+        var review = {};
+
+        // ID
+        review.id = item.getAttribute('data-shp-contents-id') || ('review_' + index);
+
+        // 평점 - 여러 클래스 시도 (판매자 답변 영역 제외)
+        // 판매자 답변 영역(gCwNtyh1ki)이 아닌 곳에서만 평점 추출
+        var ratingElem = null;
+        var ratingCandidates = item.querySelectorAll('em.n6zq2yy0KA, em[class*="n6zq2yy0KA"]');
+        for (var i = 0; i < ratingCandidates.length; i++) {
+            var elem = ratingCandidates[i];
+            // 판매자 답변 영역의 자식이 아닌지 확인
+            if (!elem.closest('.gCwNtyh1ki, div[class*="gCwNtyh1ki"]')) {
+                ratingElem = elem;
+                break;
             }
-            review.rating = ratingElem ? parseInt(ratingElem.textContent.trim()) : 5;
-            
-            // 작성자 - 판매자 답변 영역 제외하고 첫 번째 strong 요소
-            var authorElem = null;
-            var authorCandidates = item.querySelectorAll('strong.MX91DFZo2F, strong.K0kwJOXP06, strong[class*="MX91DFZo2F"], strong[class*="K0kwJOXP06"]');
-            for (var i = 0; i < authorCandidates.length; i++) {
-                var elem = authorCandidates[i];
-                // 판매자 답변 영역의 자식이 아닌지 확인
-                if (!elem.closest('.gCwNtyh1ki, div[class*="gCwNtyh1ki"]')) {
-                    authorElem = elem;
-                    break;
-                }
+        }
+        review.rating = ratingElem ? parseInt(ratingElem.textContent.trim()) : 5;
+
+        // 작성자 - 판매자 답변 영역 제외하고 첫 번째 strong 요소
+        var authorElem = null;
+        var authorCandidates = item.querySelectorAll('strong.MX91DFZo2F, strong.K0kwJOXP06, strong[class*="MX91DFZo2F"], strong[class*="K0kwJOXP06"]');
+        for (var i = 0; i < authorCandidates.length; i++) {
+            var elem = authorCandidates[i];
+            // 판매자 답변 영역의 자식이 아닌지 확인
+            if (!elem.closest('.gCwNtyh1ki, div[class*="gCwNtyh1ki"]')) {
+                authorElem = elem;
+                break;
             }
-            review.author = authorElem ? authorElem.textContent.trim() : '익명';
-            
-            // 날짜와 옵션 - YfYso7QHys 또는 Db9Dtnf7gY 컨테이너에서 (판매자 영역 제외)
-            var infoContainer = null;
-            var infoCandidates = item.querySelectorAll('div.YfYso7QHys, div.Db9Dtnf7gY');
-            for (var i = 0; i < infoCandidates.length; i++) {
-                var elem = infoCandidates[i];
-                if (!elem.closest('.gCwNtyh1ki, div[class*="gCwNtyh1ki"]')) {
-                    infoContainer = elem;
+        }
+        review.author = authorElem ? authorElem.textContent.trim() : '익명';
+
+        // 날짜와 옵션 - YfYso7QHys 또는 Db9Dtnf7gY 컨테이너에서 (판매자 영역 제외)
+        var infoContainer = null;
+        var infoCandidates = item.querySelectorAll('div.YfYso7QHys, div.Db9Dtnf7gY');
+        for (var i = 0; i < infoCandidates.length; i++) {
+            var elem = infoCandidates[i];
+            if (!elem.closest('.gCwNtyh1ki, div[class*="gCwNtyh1ki"]')) {
+                infoContainer = elem;
+                break;
+            }
+        }
+        if (infoContainer) {
+            // span 요소들에서 날짜 패턴 찾기
+            var spans = infoContainer.querySelectorAll('span');
+            for (var i = 0; i < spans.length; i++) {
+                var text = spans[i].textContent.trim();
+                // 날짜 패턴: YY.MM.DD. 또는 YYYY.MM.DD
+                if (/\\d{2,4}\\.\\d{1,2}\\.\\d{1,2}/.test(text)) {
+                    review.date = text;
                     break;
                 }
             }
-            if (infoContainer) {
-                // span 요소들에서 날짜 패턴 찾기
-                var spans = infoContainer.querySelectorAll('span');
-                for (var i = 0; i < spans.length; i++) {
-                    var text = spans[i].textContent.trim();
-                    // 날짜 패턴: YY.MM.DD. 또는 YYYY.MM.DD
-                    if (/\\d{2,4}\\.\\d{1,2}\\.\\d{1,2}/.test(text)) {
-                        review.date = text;
-                        break;
-                    }
-                }
+        }
+        review.date = review.date || '';
+
+        // 옵션 - 날짜 이후의 span 또는 특정 클래스 (판매자 영역 제외)
+        var optionSpan = null;
+        var optionCandidates = item.querySelectorAll('span.K0kwJOXP06:nth-child(3), div.b_caIle8kC');
+        for (var i = 0; i < optionCandidates.length; i++) {
+            var elem = optionCandidates[i];
+            if (!elem.closest('.gCwNtyh1ki, div[class*="gCwNtyh1ki"]')) {
+                optionSpan = elem;
+                break;
             }
-            review.date = review.date || '';
-            
-            // 옵션 - 날짜 이후의 span 또는 특정 클래스 (판매자 영역 제외)
-            var optionSpan = null;
-            var optionCandidates = item.querySelectorAll('span.K0kwJOXP06:nth-child(3), div.b_caIle8kC');
-            for (var i = 0; i < optionCandidates.length; i++) {
-                var elem = optionCandidates[i];
-                if (!elem.closest('.gCwNtyh1ki, div[class*="gCwNtyh1ki"]')) {
-                    optionSpan = elem;
-                    break;
-                }
+        }
+        if (optionSpan) {
+            var optionText = optionSpan.textContent.trim();
+            // 옵션 텍스트가 너무 길면 내용이므로 제외
+            if (optionText.length < 200) {
+                // 주거형태 이전까지만
+                var idx = optionText.indexOf('주거형태');
+                review.option = idx > 0 ? optionText.substring(0, idx).trim() : optionText;
             }
-            if (optionSpan) {
-                var optionText = optionSpan.textContent.trim();
-                // 옵션 텍스트가 너무 길면 내용이므로 제외
-                if (optionText.length < 200) {
-                    // 주거형태 이전까지만
-                    var idx = optionText.indexOf('주거형태');
-                    review.option = idx > 0 ? optionText.substring(0, idx).trim() : optionText;
-                }
+        }
+        review.option = review.option || '';
+
+        // 내용 - div.AlfkEF45qI > div.uyooaw19E8 > div.Tf5fecQ5mT 하위에서 추출
+        var contentContainer = null;
+        var contentCandidates = item.querySelectorAll('div.AlfkEF45qI div.HakaEZ240l div.KqJ8Qqw082');
+        for (var i = 0; i < contentCandidates.length; i++) {
+            var elem = contentCandidates[i];
+            // 판매자 답변 컨테이너(Wsm9me_nCc, gCwNtyh1ki)의 자식이 아닌 것만 선택
+            if (!elem.closest('.Wsm9me_nCc, .gCwNtyh1ki, div[class*="Wsm9me_nCc"], div[class*="gCwNtyh1ki"]')) {
+                contentContainer = elem;
+                break;
             }
-            review.option = review.option || '';
-            
-            // 내용 - div.AlfkEF45qI > div.uyooaw19E8 > div.Tf5fecQ5mT 하위에서 추출
-            var contentContainer = null;
-            var contentCandidates = item.querySelectorAll('div.AlfkEF45qI div.HakaEZ240l div.KqJ8Qqw082');
-            for (var i = 0; i < contentCandidates.length; i++) {
-                var elem = contentCandidates[i];
-                // 판매자 답변 컨테이너(Wsm9me_nCc, gCwNtyh1ki)의 자식이 아닌 것만 선택
-                if (!elem.closest('.Wsm9me_nCc, .gCwNtyh1ki, div[class*="Wsm9me_nCc"], div[class*="gCwNtyh1ki"]')) {
-                    contentContainer = elem;
-                    break;
+        }
+        if (contentContainer) {
+            // span.MX91DFZo2F에서 리뷰 내용 추출 (스토어PICK 뱃지 제외)
+            var spans = contentContainer.querySelectorAll('span.MX91DFZo2F, span[class*="MX91DFZo2F"]');
+            var longestText = '';
+            for (var i = 0; i < spans.length; i++) {
+                var span = spans[i];
+                var cls = span.className || '';
+                // rnrf6Xo7x2는 스토어PICK 뱃지, W1IZsaUmnu는 한달사용 뱃지
+                if (cls.indexOf('rnrf6Xo7x2') === -1 && cls.indexOf('W1IZsaUmnu') === -1) {
+                    var text = span.textContent.trim();
+                    if (text.length > longestText.length && text.length > 10) {
+                        longestText = text;
+                    }
                 }
             }
-            if (contentContainer) {
-                // span.MX91DFZo2F에서 리뷰 내용 추출 (스토어PICK 뱃지 제외)
-                var spans = contentContainer.querySelectorAll('span.MX91DFZo2F, span[class*="MX91DFZo2F"]');
-                var longestText = '';
-                for (var i = 0; i < spans.length; i++) {
-                    var span = spans[i];
-                    var cls = span.className || '';
-                    // rnrf6Xo7x2는 스토어PICK 뱃지, W1IZsaUmnu는 한달사용 뱃지
-                    if (cls.indexOf('rnrf6Xo7x2') === -1 && cls.indexOf('W1IZsaUmnu') === -1) {
-                        var text = span.textContent.trim();
-                        if (text.length > longestText.length && text.length > 10) {
-                            longestText = text;
-                        }
+            review.content = longestText;
+        }
+        review.content = review.content || '';
+
+        // 이미지 - div.s30AvhHfb0에서 추출 (판매자 영역 제외)
+        review.images = [];
+        var imgContainers = item.querySelectorAll('div.s30AvhHfb0');
+        imgContainers.forEach(function(container) {
+            // 판매자 답변 영역(Wsm9me_nCc, gCwNtyh1ki)이 아닌 경우에만
+            if (!container.closest('.Wsm9me_nCc, .gCwNtyh1ki, div[class*="Wsm9me_nCc"], div[class*="gCwNtyh1ki"]')) {
+                var imgs = container.querySelectorAll('img.UpImHAUeYJ');
+                imgs.forEach(function(img) {
+                    var src = img.getAttribute('data-src') || img.getAttribute('src');
+                    if (src && src.indexOf('pstatic.net') > -1 && review.images.indexOf(src) === -1) {
+                        // 타입 파라미터 제거하여 원본 이미지 URL 사용
+                        src = src.replace(/\\?type=.*$/, '');
+                        review.images.push(src);
                     }
-                }
-                review.content = longestText;
+                });
             }
-            review.content = review.content || '';
-            
-            // 이미지 - div.s30AvhHfb0에서 추출 (판매자 영역 제외)
-            review.images = [];
-            var imgContainers = item.querySelectorAll('div.s30AvhHfb0');
-            imgContainers.forEach(function(container) {
-                // 판매자 답변 영역(Wsm9me_nCc, gCwNtyh1ki)이 아닌 경우에만
-                if (!container.closest('.Wsm9me_nCc, .gCwNtyh1ki, div[class*="Wsm9me_nCc"], div[class*="gCwNtyh1ki"]')) {
-                    var imgs = container.querySelectorAll('img.UpImHAUeYJ');
-                    imgs.forEach(function(img) {
-                        var src = img.getAttribute('data-src') || img.getAttribute('src');
-                        if (src && src.indexOf('pstatic.net') > -1 && review.images.indexOf(src) === -1) {
-                            // 타입 파라미터 제거하여 원본 이미지 URL 사용
-                            src = src.replace(/\\?type=.*$/, '');
-                            review.images.push(src);
-                        }
-                    });
-                }
-            });
-            
-            reviews.push(review);
         });
-        
-        return reviews;
-    })();
-    '''
+
+        reviews.push(review);
+    });
+
+    return reviews;
+})();
+'''
+
+
+def random_delay(min_sec=1, max_sec=3):
+    """랜덤 딜레이"""
+    time.sleep(random.uniform(min_sec, max_sec))
+
+
+# 폴백 추출: 리뷰 아이템별 원시 필드를 한 번에 수집 (가공은 파이썬에서)
+# 판매자 답변(gCwNtyh1ki) 여부는 조상을 depth 단계까지 올라가며 확인
+FALLBACK_ITEM_SELECTOR = 'li[class*="PxsZltB5tV"]'
+FALLBACK_ITEMS_JS = '''
+function inSellerReply(el, depth) {
+    var node = el;
+    for (var i = 0; i < depth && node; i++) {
+        node = node.parentElement;
+        if (node && (node.getAttribute('class') || '').indexOf('gCwNtyh1ki') > -1) return true;
+    }
+    return false;
+}
+function collect(item, selector, depth, read) {
+    return Array.prototype.map.call(item.querySelectorAll(selector), function(el) {
+        return {value: read(el), seller: inSellerReply(el, depth)};
+    });
+}
+function text(el) { return el.innerText || ''; }
+return Array.prototype.map.call(document.querySelectorAll('li[class*="PxsZltB5tV"]'), function(item) {
+    return {
+        id: item.getAttribute('data-shp-contents-id'),
+        text: item.innerText || '',
+        sellerTexts: Array.prototype.map.call(item.querySelectorAll('div[class*="gCwNtyh1ki"]'), text),
+        ratings: collect(item, 'em.n6zq2yy0KA', 5, text),
+        authors: collect(item, 'strong[class*="MX91DFZo2F"], strong[class*="K0kwJOXP06"]', 5, text),
+        contents: collect(item, 'div[class*="vhlVUsCtw3"], div[class*="KqJ8Qqw082"]', 5, text),
+        images: collect(item, 'img', 8, function(img) {
+            return img.getAttribute('src') || img.getAttribute('data-src') || '';
+        })
+    };
+});
+'''
+
+
+def review_from_fallback_item(item):
+    """FALLBACK_ITEMS_JS가 수집한 아이템 하나를 리뷰 dict로 변환"""
+    review = {}
+    
+    full_text = item.get('text') or ""
+    review_id = item.get('id')
+    if not review_id:
+        review_id = f"review_{hash(full_text[:50]) % 100000}"
+    review['id'] = review_id
+    
+    # 전체 텍스트에서 판매자 답변 제거
+    seller_reply_text = "".join(t + "\n" for t in item.get('sellerTexts') or [] if t)
+    if seller_reply_text:
+        for seller_line in seller_reply_text.split('\n'):
+            seller_line = seller_line.strip()
+            if seller_line and len(seller_line) > 10:
+                full_text = full_text.replace(seller_line, '')
+    
+    user_fields = lambda key: [c['value'] for c in item.get(key) or [] if not c['seller'] and c['value']]
     
+    # 평점 - 숫자만 추출 (판매자 답변 영역 제외)
+    rating = 5
+    ratings = user_fields('ratings')
     try:
-        result = page.run_js(js_code)
+        if ratings:
+            rating = int(ratings[0].strip())
+    except ValueError:
+        # 텍스트에서 평점 패턴 찾기
+        rating_match = re.search(r'평점[^\d]*(\d)', full_text)
+        if rating_match:
+            rating = int(rating_match.group(1))
+    review['rating'] = rating
+    
+    # 작성자 - 판매자 답변 영역 제외
+    authors = user_fields('authors')
+    review['author'] = authors[0].strip() if authors else "익명"
+    
+    # 날짜 - 정규식으로 추출 (정제된 텍스트에서)
+    date_match = re.search(r'(\d{2,4}[./]\d{1,2}[./]\d{1,2}\.?)', full_text)
+    review['date'] = date_match.group(1) if date_match else ""
+    
+    # 옵션 - 상품 옵션 패턴 추출 (상품명: 옵션 / 색상: 색상)
+    option = ""
+    option_match = re.search(r'(쉴드[^:]*:\s*[^\n]+)', full_text)
+    if option_match:
+        opt_text = option_match.group(1).strip()
+        if len(opt_text) < 200:
+            option = opt_text
+    review['option'] = option
+    
+    # 내용 - 사용자 리뷰만 추출 (판매자 답변 제외)
+    content = ""
+    for text in user_fields('contents'):
+        text = text.strip()
+        # 판매자 답변 패턴 제외 (안녕하세요 고객님으로 시작하는 텍스트)
+        if not text.startswith('안녕하세요') and not '고객님!' in text[:30]:
+            if len(text) > len(content):
+                content = text
+    
+    # 폴백: 전체 텍스트에서 추출 (판매자 답변 제거된 버전)
+    if not content:
+        for line in full_text.split('\n'):
+            line = line.strip()
+            # 날짜, 신고, 스토어PICK, 판매자 답변 등 제외
+            if len(line) > 30:
+                if re.search(r'^\d{2}[./]\d{2}[./]|^신고$|^스토어PICK$|^평점$', line):
+                    continue
+                # 판매자 답변 패턴 제외
+                if '안녕하세요' in line and '고객님' in line:
+                    continue
+                if '쉴드 제품을 구매해 주셔서' in line:
+                    continue
+                if '구매후기 검색시 고객들의' in line:
+                    continue
+                if len(line) > len(content):
+                    content = line
+    review['content'] = content
+    
+    # 이미지 - 판매자 답변 영역 제외
+    review['images'] = [src for src in user_fields('images') if 'phinf.pstatic.net' in src]
+    
+    return review
+
+
+def extract_reviews_from_page(page, debug=False):
+    """현재 페이지에서 리뷰 추출 - JavaScript로 직접 추출 (판매자 답변 제외)"""
+    reviews = []
+    
+    if debug:
+        print("[DEBUG] Starting review extraction...", file=sys.stderr)
+    
+    try:
+        result = page.run_js(EXTRACT_REVIEWS_JS)
         if debug:
-            print(f"[DEBUG] JS result type: {type(result)}, length: {len(result) if isinstance(result, list) else 'N/A'}")
+            print(f"[DEBUG] JS result type: {type(result)}, length: {len(result) if isinstance(result, list) else 'N/A'}", file=sys.stderr)
         if result and isinstance(result, list) and len(result) > 0:
             reviews = result
             if debug:
-                print(f"[DEBUG] JS extraction found {len(reviews)} reviews")
+                print(f"[DEBUG] JS extraction found {len(reviews)} reviews", file=sys.stderr)
                 if reviews:
-                    print(f"[DEBUG] Sample review: {reviews[0]}")
+                    print(f"[DEBUG] Sample review: {reviews[0]}", file=sys.stderr)
     except Exception as e:
         if debug:
-            print(f"[DEBUG] JS extraction error: {e}")
+            print(f"[DEBUG] JS extraction error: {e}", file=sys.stderr)
     
     # 폴백: DrissionPage 선택자 사용
     if not reviews:
         if debug:
-            print("[DEBUG] Falling back to DrissionPage selectors")
-        
-        review_selectors = [
-            'li.PxsZltB5tV',
-            'li[class*="PxsZltB5tV"]',
-            'xpath://li[contains(@class, "PxsZltB5tV")]',
-        ]
+            print("[DEBUG] Falling back to DrissionPage selectors", file=sys.stderr)
         
-        review_elements = []
-        for selector in review_selectors:
+        # 한 번의 JS 실행으로 모든 아이템의 필드와 판매자 답변 여부를 함께 수집
+        # (요소마다 parent()/attr()를 호출하면 CDP 왕복이 수천 번 발생)
+        items = []
+        if wait_until(lambda: element_count(page, FALLBACK_ITEM_SELECTOR), timeout=5):
             try:
-                elements = page.eles(selector, timeout=5)
-                if elements:
-                    review_elements = elements
-                    if debug:
-                        print(f"[DEBUG] Found {len(elements)} elements with selector: {selector}")
-                    break
-            except:
-                continue
+                items = page.run_js(FALLBACK_ITEMS_JS) or []
+            except Exception as e:
+                if debug:
+                    print(f"[DEBUG] Fallback JS error: {e}", file=sys.stderr)
+        if debug:
+            print(f"[DEBUG] Found {len(items)} elements with selector: {FALLBACK_ITEM_SELECTOR}", file=sys.stderr)
         
-        for elem in review_elements:
+        for item in items:
             try:
-                review = {}
-                
-                review_id = elem.attr('data-shp-contents-id')
-                if not review_id:
-                    text_preview = elem.text[:50] if elem.text else ""
-                    review_id = f"review_{hash(text_preview) % 100000}"
-                review['id'] = review_id
-                
-                # 판매자 답변 영역 제외하고 사용자 리뷰만 추출
-                # 판매자 답변 영역(gCwNtyh1ki) 찾기
-                seller_reply_text = ""
-                try:
-                    seller_reply_elems = elem.eles('xpath:.//div[contains(@class, "gCwNtyh1ki")]')
-                    for seller_elem in seller_reply_elems:
-                        if seller_elem and seller_elem.text:
-                            seller_reply_text += seller_elem.text + "\n"
-                except:
-                    pass
-                
-                # 전체 텍스트에서 판매자 답변 제거
-                full_text = elem.text or ""
-                if seller_reply_text:
-                    # 판매자 답변 텍스트 제거
-                    for seller_line in seller_reply_text.split('\n'):
-                        seller_line = seller_line.strip()
-                        if seller_line and len(seller_line) > 10:
-                            full_text = full_text.replace(seller_line, '')
-                
-                # 평점 - 숫자만 추출 (판매자 답변 영역 제외)
-                rating = 5
-                try:
-                    # 판매자 답변 영역이 아닌 곳에서 평점 추출
-                    rating_elems = elem.eles('em.n6zq2yy0KA', timeout=0.5)
-                    for rating_elem in rating_elems:
-                        # 판매자 영역 확인 (parent chain에서 gCwNtyh1ki 클래스 찾기)
-                        parent = rating_elem
-                        is_seller_reply = False
-                        for _ in range(5):  # 5레벨까지 확인
-                            try:
-                                parent = parent.parent()
-                                if parent and 'gCwNtyh1ki' in (parent.attr('class') or ''):
-                                    is_seller_reply = True
-                                    break
-                            except:
-                                break
-                        if not is_seller_reply and rating_elem.text:
-                            rating = int(rating_elem.text.strip())
-                            break
-                except:
-                    # 텍스트에서 평점 패턴 찾기
-                    rating_match = re.search(r'평점[^\d]*(\d)', full_text)
-                    if rating_match:
-                        rating = int(rating_match.group(1))
-                review['rating'] = rating
-                
-                # 작성자 - 판매자 답변 영역 제외
-                author = "익명"
-                try:
-                    author_elems = elem.eles('xpath:.//strong[contains(@class, "MX91DFZo2F") or contains(@class, "K0kwJOXP06")]', timeout=0.3)
-                    for author_elem in author_elems:
-                        # 판매자 영역 확인
-                        parent = author_elem
-                        is_seller_reply = False
-                        for _ in range(5):
-                            try:
-                                parent = parent.parent()
-                                if parent and 'gCwNtyh1ki' in (parent.attr('class') or ''):
-                                    is_seller_reply = True
-                                    break
-                            except:
-                                break
-                        if not is_seller_reply and author_elem.text:
-                            author = author_elem.text.strip()
-                            break
-                except:
-                    pass
-                review['author'] = author
-                
-                # 날짜 - 정규식으로 추출 (정제된 텍스트에서)
-                date = ""
-                try:
-                    date_match = re.search(r'(\d{2,4}[./]\d{1,2}[./]\d{1,2}\.?)', full_text)
-                    if date_match:
-                        date = date_match.group(1)
-                except:
-                    pass
-                review['date'] = date
-                
-                # 옵션 - 상품 옵션 패턴 추출
-                option = ""
-                try:
-                    # 옵션 텍스트 패턴: 상품명: 옵션 / 색상: 색상
-                    option_match = re.search(r'(쉴드[^:]*:\s*[^\n]+)', full_text)
-                    if option_match:
-                        opt_text = option_match.group(1).strip()
-                        if len(opt_text) < 200:
-                            option = opt_text
-                except:
-                    pass
-                review['option'] = option
-                
-                # 내용 - 사용자 리뷰만 추출 (판매자 답변 제외)
-                content = ""
-                try:
-                    # 판매자 답변 영역이 아닌 리뷰 내용 영역 찾기
-                    content_elems = elem.eles('xpath:.//div[contains(@class, "vhlVUsCtw3") or contains(@class, "KqJ8Qqw082")]', timeout=0.3)
-                    for content_elem in content_elems:
-                        # 판매자 영역 확인
-                        parent = content_elem
-                        is_seller_reply = False
-                        for _ in range(5):
-                            try:
-                                parent = parent.parent()
-                                if parent and 'gCwNtyh1ki' in (parent.attr('class') or ''):
-                                    is_seller_reply = True
-                                    break
-                            except:
-                                break
-                        if not is_seller_reply and content_elem.text:
-                            # 스토어PICK 제외하고 실제 리뷰 내용만
-                            text = content_elem.text.strip()
-                            # 판매자 답변 패턴 제외 (안녕하세요 고객님으로 시작하는 텍스트)
-                            if not text.startswith('안녕하세요') and not '고객님!' in text[:30]:
-                                if len(text) > len(content):
-                                    content = text
-                except:
-                    pass
-                
-                # 폴백: 전체 텍스트에서 추출 (판매자 답변 제거된 버전)
-                if not content:
-                    try:
-                        lines = full_text.split('\n')
-                        for line in lines:
-                            line = line.strip()
-                            # 날짜, 신고, 스토어PICK, 판매자 답변 등 제외
-                            if len(line) > 30:
-                                if re.search(r'^\d{2}[./]\d{2}[./]|^신고$|^스토어PICK$|^평점$', line):
-                                    continue
-                                # 판매자 답변 패턴 제외
-                                if '안녕하세요' in line and '고객님' in line:
-                                    continue
-                                if '쉴드 제품을 구매해 주셔서' in line:
-                                    continue
-                                if '구매후기 검색시 고객들의' in line:
-                                    continue
-                                if len(line) > len(content):
-                                    content = line
-                    except:
-                        pass
-                review['content'] = content
-                
-                # 이미지 - 판매자 답변 영역 제외
-                images = []
-                try:
-                    img_elems = elem.eles('xpath:.//img')
-                    for img in img_elems:
-                        # 판매자 영역 확인
-                        parent = img
-                        is_seller_reply = False
-                        for _ in range(8):  # 이미지는 더 깊이 있을 수 있음
-                            try:
-                                parent = parent.parent()
-                                if parent and 'gCwNtyh1ki' in (parent.attr('class') or ''):
-                                    is_seller_reply = True
-                                    break
-                            except:
-                                break
-                        if not is_seller_reply:
-                            src = img.attr('src') or img.attr('data-src')
-                            if src and 'phinf.pstatic.net' in src:
-                                images.append(src)
-                except:
-                    pass
-                review['images'] = images
-                
+                review = review_from_fallback_item(item)
                 if review.get('content') or review.get('rating'):
                     reviews.append(review)
-                    
             except Exception as e:
                 continue
     
     return reviews
 
 
-def click_next_page(page, current_page):
-    """다음 페이지 클릭"""
+def click_next_page(page, current_page, delay=True):
+    """다음 페이지 클릭 (delay=False면 클릭 후 고정 대기 없음)
+
+    정확한 페이지 번호 클릭을 항상 먼저 시도하고, 번호가 안 보일 때(페이지 그룹 끝)만 "다음" 버튼을 씁니다.
+    "다음" 버튼 방법끼리는 성공 통계(selector_stats)에 따라 최근에 성공한 방법부터 시도하므로
+    네이버 구조가 바뀌어도 실패하는 방법의 타임아웃을 매번 기다리지 않습니다.
+    """
     next_page = current_page + 1
     
     # 방법 1: 페이지네이션에서 다음 페이지 번호 클릭 (실제 네이버 구조)
-    try:
+    def click_page_link():
         # div.LiT9lKOVbw 내의 a.hyY6CXtbcn 페이지 링크
-        page_links = page.eles('div.LiT9lKOVbw a.hyY6CXtbcn')
-        for link in page_links:
+        for link in page.eles('div.LiT9lKOVbw a.hyY6CXtbcn'):
             if link.text.strip() == str(next_page):
                 link.click()
-                random_delay(1, 2)
                 return True
-    except:
-        pass
+        return False
     
     # 방법 2: 다음 버튼 클릭 (I3i1NSoFdB 클래스)
-    try:
+    def click_next_class():
         next_btn = page.ele('a.I3i1NSoFdB', timeout=2)
         if next_btn and 'aria-hidden="false"' in next_btn.html:
             next_btn.click()
-            random_delay(1, 2)
             return True
-    except:
-        pass
+        return False
     
     # 방법 3: 텍스트로 찾기
-    try:
+    def click_next_text():
         next_btn = page.ele('xpath://a[text()="다음"]', timeout=2)
         if next_btn:
             next_btn.click()
-            random_delay(1, 2)
             return True
-    except:
-        pass
+        return False
     
+    # 마지막 페이지에서는 모든 방법이 실패하는 게 정상이므로 실패를 기록하지 않음
+    strategy_groups = (
+        ("drission.page_number", {"page_link": click_page_link}),
+        ("drission.next_button", {"next_class": click_next_class, "next_text": click_next_text}),
+    )
+    for group, strategies in strategy_groups:
+        strategy, _ = selector_stats.first(group, list(strategies), lambda name: strategies[name](),
+                                           record_exhausted=False)
+        if strategy:
+            break
+    else:
+        return False
+    if delay:
+        random_delay(1, 2)
+    return True
+
+
+def sort_by_recent(page):
+    """리뷰 정렬을 최신순으로 변경 (증분 크롤링용)"""
+    for selector in ('xpath://a[normalize-space(text())="최신순"]',
+                     'xpath://button[normalize-space(text())="최신순"]'):
+        try:
+            btn = page.ele(selector, timeout=2)
+            if btn:
+                btn.click()
+                return True
+        except:
+            continue
     return False
 
 
-def crawl_reviews(url, max_pages=3, debug=False):
-    """리뷰 크롤링 메인 함수"""
-    
-    all_reviews = []
-    collected_ids = set()
-    pages_crawled = 0
-    
+def create_page():
+    """자동화 탐지 우회 옵션을 적용한 ChromiumPage 생성"""
     # 브라우저 옵션 설정 - 자동화 탐지 우회 강화
     options = ChromiumOptions()
     
@@ -453,102 +441,470 @@ def crawl_reviews(url, max_pages=3, debug=False):
     options.set_argument('--disable-save-password-bubble')
     options.set_argument('--window-size=1920,1080')
     options.set_argument('--start-maximized')
+    # 뒤쪽 탭도 타이머/렌더링이 느려지지 않도록 (멀티 탭 크롤링)
+    options.set_argument('--disable-background-timer-throttling')
+    options.set_argument('--disable-renderer-backgrounding')
+    options.set_argument('--disable-backgrounding-occluded-windows')
     
     # 자동화 플래그 제거
     options.set_pref('credentials_enable_service', False)
     options.set_pref('profile.password_manager_enabled', False)
     
+    # 기본 포트(9222)/프로필을 쓰면 동시에 실행한 크롤러끼리 같은 브라우저에 붙으므로
+    # 인스턴스마다 빈 포트와 프로필을 할당 (CRAWLER_PERSISTENT_PROFILE=1이면 영구 프로필 슬롯)
+    profile_dir, persistent = browser_profile.acquire_profile_dir()
+    options.set_local_port(browser_profile.free_port())
+    options.set_user_data_path(profile_dir)
+    if persistent:
+        options.set_argument('--disk-cache-size', str(browser_profile.DISK_CACHE_MB * 1024 * 1024))
+    
     # 브라우저 실행
-    page = ChromiumPage(options)
+    try:
+        page = ChromiumPage(options)
+    except Exception:
+        browser_profile.release_profile_dir(profile_dir, persistent)
+        raise
+    # 이미지/폰트/동영상/추적 비콘 차단 (resource_blocking.py)
+    resource_blocking.apply_drission(page)
+    browser_profile.restore_cookies(page)
+    return browser_profile.attach_profile(page, profile_dir, persistent)
+
+
+def reviews_from_packet(packet):
+    """감청한 응답 패킷에서 리뷰 목록 추출 (리뷰 응답이 아니면 None)"""
+    try:
+        body = packet.response.body
+        if isinstance(body, (str, bytes)):
+            body = json.loads(body)
+    except Exception:
+        return None
+    items = extract_review_list(body)
+    if not items:
+        # 리뷰 목록이 비어 있는 정상 응답(마지막 페이지 이후)과 구분
+        if isinstance(body, dict) and any(k in body for k in ('reviews', 'contents')):
+            return []
+        return None
+    return [parse_review(item) for item in items]
+
+
+def wait_review_packet(page, timeout=NETWORK_WAIT_TIMEOUT):
+    """다음 리뷰 API 응답을 기다려 리뷰 목록 반환 (시간 초과 시 None)"""
+    deadline = time.time() + timeout
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return None
+        packet = page.listen.wait(timeout=remaining)
+        if not packet:
+            return None
+        reviews = reviews_from_packet(packet)
+        if reviews is not None:
+            return reviews
+
+
+def crawl_reviews_network(url, max_pages=3, debug=False, page=None, known_ids=None, on_page=None, keep_reviews=True):
+    """네트워크 캡처 모드: 상품 페이지가 받아오는 리뷰 JSON을 그대로 매핑
+    
+    DOM 탐색, 렌더링 대기용 스크롤, 페이지별 고정 딜레이가 필요 없습니다.
+    첫 페이지 응답을 잡지 못하면 None을 반환합니다 (DOM 모드로 폴백).
+    known_ids를 넘기면 증분 모드로 최신순 정렬 후 이미 저장된 리뷰에서 멈춥니다.
+    """
+    all_reviews = []
+    collected_ids = set()
+    pages_crawled = 0
+    incremental = known_ids is not None
+    known_ids = known_ids or set()
     
+    page.listen.start(REVIEW_API_TARGETS)
     try:
-        # 페이지 접속
-        print(f"[DEBUG] Navigating to {url}")
-        
+        if debug:
+            print(f"[DEBUG] Navigating to {url} (network capture)", file=sys.stderr)
         page.get(url)
-        print(f"[DEBUG] Page loaded, current URL: {page.url}")
-        random_delay(3, 5)
-        print(f"[DEBUG] Initial delay completed")
         
-        # 리뷰 탭 클릭 (상품 상세 탭에서)
-        clicked = False
+        # 리뷰 영역으로 이동하면 위젯이 첫 페이지 리뷰를 요청함
+        page.run_js("window.location.hash = 'REVIEW'")
+        page.run_js("document.querySelector('[data-shp-area-id=\"REVIEW\"]')?.scrollIntoView()")
         
-        # 방법 1: URL 해시로 직접 이동 (가장 안전)
-        try:
-            if '#REVIEW' not in page.url:
-                print("[DEBUG] Attempting to navigate to #REVIEW hash...")
-                page.run_js("window.location.hash = 'REVIEW'")
-                random_delay(2, 3)
-                clicked = True
-                print(f"[DEBUG] Navigated to #REVIEW hash, current URL: {page.url}")
-            else:
-                print(f"[DEBUG] Already on REVIEW section: {page.url}")
-        except Exception as e:
-            print(f"[DEBUG] Failed to navigate to #REVIEW: {e}")
+        page_reviews = wait_review_packet(page)
         
-        # 방법 2: 탭 메뉴에서 리뷰 탭 클릭 (aria-selected 속성으로 탭 구분)
-        if not clicked:
-            try:
-                # 상품 상세 탭 메뉴 (role="tablist"내의 요소)
-                tabs = page.eles('xpath://ul[@role="tablist"]//a[contains(text(), "리뷰")]')
-                for tab in tabs:
-                    href = tab.attr('href') or ''
-                    # 리뷰이벤트가 아닌 상품 리뷰 탭만 클릭
-                    if 'review-event' not in href.lower():
-                        tab.click()
-                        random_delay(2, 3)
-                        clicked = True
-                        if debug:
-                            print("[DEBUG] Review tab clicked via tablist")
-                        break
-            except:
-                pass
+        # 증분 모드: 최신순으로 바꾸면 위젯이 1페이지를 다시 요청함
+        if incremental and page_reviews is not None and sort_by_recent(page):
+            page_reviews = wait_review_packet(page)
         
-        # 방법 3: 리뷰 섹션으로 스크롤 (탭 클릭 실패 시)
-        if not clicked:
-            try:
-                page.run_js("document.querySelector('[data-shp-area-id=\"REVIEW\"]')?.scrollIntoView()")
-                random_delay(2, 3)
+        current_page = 1
+        while current_page <= max_pages:
+            if current_page > 1:
+                page_reviews = wait_review_packet(page)
+            if page_reviews is None:
                 if debug:
-                    print("[DEBUG] Scrolled to REVIEW section")
-            except:
-                pass
-        
-        # 리뷰 영역으로 스크롤하고 로딩 대기
-        page.scroll.to_half()
-        random_delay(1, 2)
-        
-        # 리뷰 리스트가 로드될 때까지 스크롤 및 대기
-        print("[DEBUG] Scrolling to load review list...")
-        for scroll_attempt in range(5):
-            page.scroll.down(500)
-            random_delay(1, 2)
+                    print(f"[DEBUG] No review response captured for page {current_page}", file=sys.stderr)
+                if current_page == 1:
+                    return None
+                break
             
-            # 리뷰 리스트가 로드되었는지 확인
-            try:
-                review_list = page.ele('ul.RR2FSL9wTc', timeout=1)
-                if review_list:
-                    print(f"[DEBUG] ✓ Review list found after {scroll_attempt + 1} scroll attempts")
+            pages_crawled = current_page
+            
+            # 중복 제거
+            new_reviews = []
+            for review in page_reviews:
+                if review['id'] and review['id'] not in collected_ids and review['id'] not in known_ids:
+                    collected_ids.add(review['id'])
+                    new_reviews.append(review)
+            
+            new_count = len(new_reviews)
+            if keep_reviews:
+                all_reviews.extend(new_reviews)
+            if on_page and new_reviews:
+                on_page(new_reviews, current_page)
+            
+            if debug:
+                print(f"[DEBUG] Page {current_page}: {new_count} new reviews (Total: {len(collected_ids)})", file=sys.stderr)
+            
+            if new_count == 0:
+                break
+            
+            # 다음 페이지 (응답 도착 자체가 로딩 완료 신호이므로 고정 대기 없음)
+            if current_page < max_pages:
+                politeness_delay()
+                if not click_next_page(page, current_page, delay=False):
+                    if debug:
+                        print(f"[DEBUG] No more pages after page {current_page}", file=sys.stderr)
                     break
-            except:
-                print(f"[DEBUG] ✗ Review list not found, continuing scroll (attempt {scroll_attempt + 1}/5)")
+            
+            current_page += 1
+    finally:
+        page.listen.stop()
+        # 이번 실행의 선택자 통계 저장, 영구 프로필 모드면 쿠키 저장
+        selector_stats.flush()
+        browser_profile.store_cookies(page)
+    
+    return {
+        'success': True,
+        'reviews': all_reviews,
+        'count': len(collected_ids),
+        'pages_crawled': pages_crawled,
+        'resources': resource_blocking.collect_metrics(page, 'drission')
+    }
+
+
+def open_review_section(page, url, debug=False, incremental=False):
+    """상품 페이지를 열고 리뷰 목록이 보일 때까지 이동 (incremental이면 최신순 정렬)"""
+    # 페이지 접속
+    print(f"[DEBUG] Navigating to {url}", file=sys.stderr)
+    
+    page.get(url)
+    print(f"[DEBUG] Page loaded, current URL: {page.url}", file=sys.stderr)
+    wait_until(lambda: document_ready(page), timeout=10)
+    print(f"[DEBUG] Document ready", file=sys.stderr)
+    
+    # 리뷰 탭 클릭 (상품 상세 탭에서)
+    clicked = False
+    
+    # 방법 1: URL 해시로 직접 이동 (가장 안전)
+    try:
+        if '#REVIEW' not in page.url:
+            print("[DEBUG] Attempting to navigate to #REVIEW hash...", file=sys.stderr)
+            page.run_js("window.location.hash = 'REVIEW'")
+            wait_until(lambda: element_count(page, '[data-shp-area-id="REVIEW"], ul.RR2FSL9wTc'), timeout=5)
+            clicked = True
+            print(f"[DEBUG] Navigated to #REVIEW hash, current URL: {page.url}", file=sys.stderr)
+        else:
+            print(f"[DEBUG] Already on REVIEW section: {page.url}", file=sys.stderr)
+    except Exception as e:
+        print(f"[DEBUG] Failed to navigate to #REVIEW: {e}", file=sys.stderr)
+    
+    # 방법 2: 탭 메뉴에서 리뷰 탭 클릭 (aria-selected 속성으로 탭 구분)
+    if not clicked:
+        try:
+            # 상품 상세 탭 메뉴 (role="tablist"내의 요소)
+            tabs = page.eles('xpath://ul[@role="tablist"]//a[contains(text(), "리뷰")]')
+            for tab in tabs:
+                href = tab.attr('href') or ''
+                # 리뷰이벤트가 아닌 상품 리뷰 탭만 클릭
+                if 'review-event' not in href.lower():
+                    tab.click()
+                    wait_until(lambda: element_count(page, 'ul.RR2FSL9wTc'), timeout=5)
+                    clicked = True
+                    if debug:
+                        print("[DEBUG] Review tab clicked via tablist", file=sys.stderr)
+                    break
+        except:
+            pass
+    
+    # 방법 3: 리뷰 섹션으로 스크롤 (탭 클릭 실패 시)
+    if not clicked:
+        try:
+            page.run_js("document.querySelector('[data-shp-area-id=\"REVIEW\"]')?.scrollIntoView()")
+            wait_until(lambda: element_count(page, 'ul.RR2FSL9wTc'), timeout=5)
+            if debug:
+                print("[DEBUG] Scrolled to REVIEW section", file=sys.stderr)
+        except:
+            pass
+    
+    # 리뷰 리스트가 나타날 때까지 스크롤하며 대기 (나타나는 즉시 진행)
+    page.scroll.to_half()
+    print("[DEBUG] Scrolling to load review list...", file=sys.stderr)
+    for scroll_attempt in range(5):
+        if wait_for_review_list(page, timeout=1.5):
+            print(f"[DEBUG] ✓ Review list found after {scroll_attempt} scroll attempts", file=sys.stderr)
+            break
+        page.scroll.down(500)
+    else:
+        if not wait_for_review_list(page, timeout=5):
+            print(f"[DEBUG] ✗ Could not find review items", file=sys.stderr)
+            print(f"[DEBUG] Current page title: {page.title}", file=sys.stderr)
+    
+    # 증분 모드: 최신순 정렬 (첫 리뷰가 바뀔 때까지 대기)
+    if incremental:
+        signature = first_review_signature(page)
+        if sort_by_recent(page):
+            wait_for_page_change(page, signature, timeout=5)
+    
+    # 디버그: HTML 저장
+    if debug:
+        with open('debug_drission_page.html', 'w', encoding='utf-8') as f:
+            f.write(page.html)
+        print("[DEBUG] HTML saved to debug_drission_page.html", file=sys.stderr)
+
+
+# 페이지네이션의 현재 번호와 보이는 페이지 번호들
+PAGINATION_STATE_JS = '''
+var links = document.querySelectorAll('div.LiT9lKOVbw a.hyY6CXtbcn');
+var current = document.querySelector('div.LiT9lKOVbw a[aria-current="true"], div.LiT9lKOVbw a[aria-current="page"]');
+return {
+    current: current ? parseInt(current.textContent.trim()) : null,
+    numbers: Array.prototype.map.call(links, function(a) { return parseInt(a.textContent.trim()); })
+        .filter(function(n) { return !isNaN(n); })
+};
+'''
+
+
+def goto_page_number(page, target, current=1, max_hops=30):
+    """target 페이지로 바로 이동하고 도착한 페이지 번호 반환
+
+    목표 번호가 보이면 바로 클릭하고, 보이지 않으면 보이는 번호 중 목표에 가장 가까운 것
+    (또는 다음 버튼)을 눌러 페이지 묶음 단위로 건너뜁니다. 리뷰는 추출하지 않습니다.
+    """
+    hops = 0
+    while current < target and hops < max_hops:
+        hops += 1
+        state = page.run_js(PAGINATION_STATE_JS) or {}
+        ahead = [n for n in state.get('numbers', []) if current < n <= target]
+        signature = first_review_signature(page)
+        
+        if ahead:
+            step = max(ahead)
+            links = [link for link in page.eles('div.LiT9lKOVbw a.hyY6CXtbcn') if link.text.strip() == str(step)]
+            if not links:
+                break
+            links[0].click()
+        elif click_next_page(page, current, delay=False):
+            step = current + 1
+        else:
+            break
+        
+        if not wait_for_page_change(page, signature, timeout=10):
+            break
+        state = page.run_js(PAGINATION_STATE_JS) or {}
+        current = state.get('current') or step
+    return current
+
+
+def split_page_ranges(max_pages, tabs):
+    """1..max_pages를 tabs개의 연속 구간으로 분할 [(시작, 끝), ...]"""
+    size = -(-max_pages // tabs)
+    return [(start, min(start + size - 1, max_pages)) for start in range(1, max_pages + 1, size)]
+
+
+def crawl_page_range(page, start, end, accept_page, debug=False):
+    """현재 리뷰 목록에서 start 페이지로 건너뛴 뒤 end 페이지까지 차례로 추출
+
+    (상태, 마지막으로 읽은 페이지) 반환. 상태는 'done'(end까지 읽음),
+    'exhausted'(end 전에 리뷰가 끝남), 'unreachable'(start 페이지로 가지 못함) 중 하나입니다.
+    """
+    current_page = goto_page_number(page, start) if start > 1 else 1
+    if current_page != start:
+        if debug:
+            print(f"[DEBUG] Could not reach page {start} (stopped at {current_page})", file=sys.stderr)
+        return 'unreachable', current_page
+    
+    seen_ids = set()
+    while current_page <= end:
+        page_reviews = extract_reviews_from_page(page, debug)
+        # 종료 판단은 이 탭에서 본 리뷰 기준 (다른 탭과 겹친 리뷰 때문에 멈추지 않도록)
+        fresh = [review for review in page_reviews if review['id'] not in seen_ids]
+        seen_ids.update(review['id'] for review in fresh)
+        accept_page(fresh, current_page)
+        
+        if not fresh:
+            return 'exhausted', current_page
+        
+        if current_page < end:
+            politeness_delay()
+            signature = first_review_signature(page)
+            if not click_next_page(page, current_page, delay=False):
+                return 'exhausted', current_page
+            wait_for_page_change(page, signature, timeout=10)
+        current_page += 1
+    return 'done', end
+
+
+def crawl_reviews_tabs(url, max_pages, debug=False, page=None, tabs=3, on_page=None, keep_reviews=True):
+    """같은 브라우저에서 탭 tabs개를 열어 페이지 구간을 나눠 병렬로 크롤링
+
+    각 탭은 자기 구간의 시작 페이지로 바로 건너뛴 뒤 구간 끝까지 진행합니다.
+    결과는 리뷰 ID로 중복 제거하고 페이지 순서대로 합칩니다.
+    on_page는 페이지가 끝나는 순서대로 호출되므로 페이지 번호가 섞일 수 있습니다.
+    시작 페이지로 가지 못했거나 오류가 난 구간은 병렬 단계가 끝난 뒤 첫 탭에서 차례로 다시 시도하고,
+    그래도 실패한 구간은 failed_ranges에 담아 partial=True로 반환합니다.
+    """
+    ranges = split_page_ranges(max_pages, max(1, tabs))
+    collected_ids = set()
+    crawled_pages = set()
+    pages = {}
+    lock = threading.Lock()
+    
+    def accept_page(page_reviews, page_number):
+        with lock:
+            new_reviews = [review for review in page_reviews if review['id'] not in collected_ids]
+            collected_ids.update(review['id'] for review in new_reviews)
+            if page_reviews:
+                crawled_pages.add(page_number)
+            if keep_reviews:
+                # 재시도한 구간은 이미 모은 리뷰가 빠진 채로 다시 들어오므로 덮어쓰지 않고 이어 붙임
+                pages.setdefault(page_number, []).extend(new_reviews)
+            if on_page and new_reviews:
+                on_page(new_reviews, page_number)
+            if debug:
+                print(f"[DEBUG] Page {page_number}: {len(new_reviews)} new reviews (Total: {len(collected_ids)})", file=sys.stderr)
+    
+    # 첫 구간은 기존 탭, 나머지는 새 탭 (같은 브라우저라 쿠키/캐시 공유)
+    opened = []
+    failed = []
+    # 리뷰가 끝난 페이지 (이보다 뒤에서 시작하는 구간은 실패가 아니라 원래 없는 페이지)
+    last_page = [max_pages]
+    
+    def settle(page_range, status, stopped_at):
+        """구간 결과 반영. 실패한 구간이면 True"""
+        # 시작 페이지 바로 앞에서 더 넘어가지 못했으면 그 페이지가 마지막 페이지
+        if status == 'exhausted' or (status == 'unreachable' and stopped_at == page_range[0] - 1):
+            last_page[0] = min(last_page[0], stopped_at)
+            return False
+        return status != 'done'
+    
+    try:
+        workers = [page] + [page.new_tab() for _ in ranges[1:]]
+        opened = workers[1:]
+        # CDP 차단 설정과 이벤트 구독은 탭마다 따로 (집계는 첫 탭의 측정기 하나로 모음)
+        meter = getattr(page, 'crawler_network_meter', None)
+        for tab in opened:
+            resource_blocking.apply_drission(tab)
+            if meter is not None:
+                resource_blocking.start_metering(tab, 'drission', meter)
         
-        # 리뷰가 로드될 때까지 추가 대기
-        random_delay(3, 5)
+        def run(tab, page_range):
+            open_review_section(tab, url, debug)
+            return crawl_page_range(tab, page_range[0], page_range[1], accept_page, debug)
         
-        # 리뷰 아이템이 실제로 렌더링되었는지 확인
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [executor.submit(run, tab, page_range) for tab, page_range in zip(workers, ranges)]
+            for page_range, future in zip(ranges, futures):
+                try:
+                    if settle(page_range, *future.result()):
+                        failed.append(page_range)
+                except Exception as e:
+                    failed.append(page_range)
+                    if debug:
+                        print(f"[DEBUG] Tab for pages {page_range[0]}-{page_range[1]} failed: {e}", file=sys.stderr)
+        
+        # 실패한 구간은 첫 탭에서 하나씩 다시 시도
+        retry, failed = failed, []
+        for page_range in retry:
+            if page_range[0] > last_page[0]:
+                continue
+            if debug:
+                print(f"[DEBUG] Retrying pages {page_range[0]}-{page_range[1]} in the first tab", file=sys.stderr)
+            try:
+                if settle(page_range, *run(page, page_range)):
+                    failed.append(page_range)
+            except Exception as e:
+                failed.append(page_range)
+                if debug:
+                    print(f"[DEBUG] Retry for pages {page_range[0]}-{page_range[1]} failed: {e}", file=sys.stderr)
+        failed = [page_range for page_range in failed if page_range[0] <= last_page[0]]
+    finally:
+        for tab in opened:
+            try:
+                tab.close()
+            except Exception:
+                pass
+        # 이번 실행의 선택자 통계 저장, 영구 프로필 모드면 쿠키 저장
+        selector_stats.flush()
+        browser_profile.store_cookies(page)
+    
+    return {
+        'success': True,
+        'reviews': [review for number in sorted(pages) for review in pages[number]],
+        'count': len(collected_ids),
+        'pages_crawled': len(crawled_pages),
+        'partial': bool(failed),
+        'failed_ranges': [list(page_range) for page_range in failed],
+        'resources': resource_blocking.collect_metrics(page, 'drission')
+    }
+
+
+def get_page_pool():
+    """DrissionPage 브라우저 풀"""
+    return browser_pool.get_pool('drission', create_page)
+
+
+def crawl_reviews(url, max_pages=3, debug=False, page=None, network=False, incremental=False,
+                  on_page=None, keep_reviews=True, tabs=1):
+    """리뷰 크롤링 메인 함수
+    
+    page를 넘기지 않으면 브라우저 풀에서 빌려 쓰고 반납합니다.
+    network=True면 리뷰 API 응답을 감청하여 추출하고, 실패 시 DOM 추출로 폴백합니다.
+    incremental=True면 최신순으로 읽고 DB에 이미 저장된 리뷰만 남은 페이지에서 멈춥니다.
+    on_page(reviews, page_number)는 페이지마다 새 리뷰로 호출되며,
+    keep_reviews=False면 결과에 리뷰 목록을 모으지 않습니다 (스트리밍 출력용).
+    tabs>1이면 같은 브라우저에서 탭 여러 개로 페이지 구간을 나눠 크롤링합니다 (crawl_reviews_tabs).
+    증분 모드와 network 모드는 앞 페이지부터 차례로 읽어야 하므로 탭 하나로 동작합니다.
+    """
+    
+    if page is None:
+        with get_page_pool().checkout() as lease:
+            result = crawl_reviews(url, max_pages, debug, page=lease.browser, network=network,
+                                   incremental=incremental, on_page=on_page, keep_reviews=keep_reviews,
+                                   tabs=tabs)
+            lease.pages += result['pages_crawled']
+            return result
+    
+    # 이번 크롤링의 전송량/차단 건수 집계 시작 (collect_metrics에서 종료)
+    resource_blocking.start_metering(page, 'drission')
+    
+    if tabs > 1 and max_pages > 1 and not incremental and not network:
+        return crawl_reviews_tabs(url, max_pages, debug, page, tabs, on_page, keep_reviews)
+    
+    # 증분 모드: 이미 저장된 리뷰 ID를 기준점으로 사용
+    known_ids = get_known_review_ids(url) if incremental else None
+    
+    if network:
         try:
-            review_items = page.eles('ul.RR2FSL9wTc > li.PxsZltB5tV', timeout=5)
-            print(f"[DEBUG] ✓ Found {len(review_items)} review items on page")
+            result = crawl_reviews_network(url, max_pages, debug, page, known_ids, on_page, keep_reviews)
+            if result is not None:
+                return result
         except Exception as e:
-            print(f"[DEBUG] ✗ Could not find review items: {e}")
-            print(f"[DEBUG] Current page title: {page.title}")
-        
-        # 디버그: HTML 저장
+            if debug:
+                print(f"[DEBUG] Network capture error: {e}", file=sys.stderr)
         if debug:
-            with open('debug_drission_page.html', 'w', encoding='utf-8') as f:
-                f.write(page.html)
-            print("[DEBUG] HTML saved to debug_drission_page.html")
+            print("[DEBUG] Falling back to DOM extraction", file=sys.stderr)
+    
+    all_reviews = []
+    collected_ids = set()
+    pages_crawled = 0
+    
+    try:
+        open_review_section(page, url, debug, incremental)
         
         # 페이지별 크롤링
         current_page = 1
@@ -558,27 +914,34 @@ def crawl_reviews(url, max_pages=3, debug=False):
             page_reviews = extract_reviews_from_page(page, debug)
             
             # 중복 제거
-            new_count = 0
+            new_reviews = []
             for review in page_reviews:
-                if review['id'] not in collected_ids:
+                if review['id'] not in collected_ids and not (incremental and review['id'] in known_ids):
                     collected_ids.add(review['id'])
-                    all_reviews.append(review)
-                    new_count += 1
+                    new_reviews.append(review)
+            
+            new_count = len(new_reviews)
+            if keep_reviews:
+                all_reviews.extend(new_reviews)
+            if on_page and new_reviews:
+                on_page(new_reviews, current_page)
             
             if debug:
-                print(f"[DEBUG] Page {current_page}: {new_count} new reviews (Total: {len(all_reviews)})")
+                print(f"[DEBUG] Page {current_page}: {new_count} new reviews (Total: {len(collected_ids)})", file=sys.stderr)
             
-            # 새 리뷰가 없으면 종료
-            if new_count == 0 and current_page > 1:
+            # 새 리뷰가 없으면 종료 (증분 모드에서는 첫 페이지라도 전부 저장된 리뷰면 종료)
+            if new_count == 0 and (current_page > 1 or incremental):
                 break
             
-            # 다음 페이지
+            # 다음 페이지 (첫 리뷰가 바뀌는 즉시 진행, 의도적 지연은 별도)
             if current_page < max_pages:
-                if not click_next_page(page, current_page):
+                politeness_delay()
+                signature = first_review_signature(page)
+                if not click_next_page(page, current_page, delay=False):
                     if debug:
-                        print(f"[DEBUG] No more pages after page {current_page}")
+                        print(f"[DEBUG] No more pages after page {current_page}", file=sys.stderr)
                     break
-                random_delay(1, 2)
+                wait_for_page_change(page, signature, timeout=10)
             
             current_page += 1
         
@@ -586,21 +949,28 @@ def crawl_reviews(url, max_pages=3, debug=False):
         
     except Exception as e:
         if debug:
-            print(f"[DEBUG] Error: {e}")
+            print(f"[DEBUG] Error: {e}", file=sys.stderr)
         pages_crawled = 0
     
-    finally:
-        page.quit()
+    # 이번 실행의 선택자 통계 저장, 영구 프로필 모드면 쿠키 저장
+    selector_stats.flush()
+    browser_profile.store_cookies(page)
     
     return {
         'success': True,
         'reviews': all_reviews,
-        'count': len(all_reviews),
-        'pages_crawled': pages_crawled
+        'count': len(collected_ids),
+        'pages_crawled': pages_crawled,
+        'resources': resource_blocking.collect_metrics(page, 'drission')
     }
 
 
 def main():
+    # UTF-8 출력 설정
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+    
     if len(sys.argv) < 2:
         print(json.dumps({"success": False, "error": "상품 URL이 필요합니다."}))
         sys.exit(1)
@@ -608,6 +978,10 @@ def main():
     url = sys.argv[1]
     max_pages = 3
     debug = False
+    network = False
+    incremental = False
+    ndjson = False
+    tabs = 1
     
     # 인자 파싱
     i = 2
@@ -615,18 +989,40 @@ def main():
         if sys.argv[i] == '--pages' and i + 1 < len(sys.argv):
             max_pages = int(sys.argv[i + 1])
             i += 2
+        elif sys.argv[i] == '--tabs' and i + 1 < len(sys.argv):
+            tabs = max(1, int(sys.argv[i + 1]))
+            i += 2
         elif sys.argv[i] == '--debug':
             debug = True
             i += 1
+        elif sys.argv[i] == '--network':
+            network = True
+            i += 1
+        elif sys.argv[i] == '--incremental':
+            incremental = True
+            i += 1
+        elif sys.argv[i] == '--ndjson':
+            ndjson = True
+            i += 1
         else:
             i += 1
     
+    # NDJSON 모드: 페이지마다 바로 출력하고 리뷰 목록은 메모리에 모으지 않음
+    if ndjson:
+        stream = NdjsonWriter()
+        try:
+            result = crawl_reviews(url, max_pages, debug, network=network, incremental=incremental,
+                                   on_page=stream.page, keep_reviews=False, tabs=tabs)
+        except Exception as e:
+            stream.error(str(e))
+            sys.exit(1)
+        stream.summary(result)
+        return
+    
     # 크롤링 실행
-    result = crawl_reviews(url, max_pages, debug)
+    result = crawl_reviews(url, max_pages, debug, network=network, incremental=incremental, tabs=tabs)
     
-    # 결과 출력 (UTF-8 인코딩)
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    # 결과 출력
     print(json.dumps(result, ensure_ascii=False, indent=2))
 
 
@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+크롤링용 리소스 차단 프로필 (Selenium / DrissionPage / Playwright 공용)
+상품 페이지의 대표/상세 이미지, 동영상, 폰트, 광고/분석 비콘은 리뷰·Q&A 추출에 필요 없으므로
+요청 단계에서 막습니다. 리뷰 위젯이 쓰는 스크립트와 API(XHR)는 그대로 둡니다.
+이미지 URL은 DOM 속성(src, data-src)에서 읽으므로 다운로드하지 않아도 결과는 같습니다.
+
+- Selenium, DrissionPage: CDP Network.setBlockedURLs (URL 패턴)
+- Playwright: context.route (리소스 종류 + URL 패턴, 차단 건수 집계)
+
+크롤링을 시작할 때 start_metering()을 호출하면 그 크롤링 동안의 CDP Network 이벤트를 집계하고,
+끝날 때 collect_metrics()로 이번 크롤링의 요청 수, 전송량(KB), 차단된 요청 수(종류별),
+첫 리뷰 표시 시간(ms)을 보고합니다.
+- 전송량: Network.loadingFinished의 encodedDataLength (교차 출처 리소스 포함)
+- 차단 건수: Network.loadingFailed 중 blockedReason이 있는 요청 (Playwright는 route 핸들러에서 집계)
+- Selenium은 CDP 이벤트를 performance 로그로 받으므로 selenium_logging_options()로 로그를 켜야 함
+"""
+
+import os
+import sys
+import json
+import threading
+from urllib.parse import urlparse
+
+
+ENABLED = os.environ.get('CRAWLER_BLOCK_RESOURCES', '1') != '0'
+
+# 경로가 이 확장자로 끝나는 요청을 차단
+BLOCKED_EXTENSIONS = (
+    # 이미지
+    'jpg', 'jpeg', 'png', 'gif', 'webp', 'svg', 'ico', 'bmp',
+    # 폰트
+    'woff', 'woff2', 'ttf', 'otf', 'eot',
+    # 동영상/음성 (상품 동영상 플레이어)
+    'mp4', 'webm', 'm3u8', 'mp3',
+)
+
+# 광고/분석 비콘 호스트 (하위 도메인 포함)
+BLOCKED_HOSTS = (
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net',
+    'facebook.net', 'connect.facebook.com', 'criteo.com', 'criteo.net',
+    'wcs.naver.net', 'lcs.naver.com', 'nlog.naver.com', 'nelo2-col.navercorp.com',
+    'veta.naver.com', 'adcr.naver.com', 'tivan.naver.com',
+)
+
+# CDP Network.setBlockedURLs 형식 ('*' 와일드카드, URL 전체와 비교)
+# 확장자는 URL 끝이나 쿼리 문자열 바로 앞에만, 호스트는 스킴 바로 뒤에만 맞도록 고정
+# (예전 '*.png*'는 쿼리 문자열에 ".png"가 들어간 API 요청까지 막았음)
+BLOCKED_URL_PATTERNS = (
+    [pattern for ext in BLOCKED_EXTENSIONS for pattern in (f'*.{ext}', f'*.{ext}?*')]
+    + [pattern for host in BLOCKED_HOSTS for pattern in (f'*://{host}/*', f'*://*.{host}/*')]
+)
+
+# CDP 리소스 종류 -> 차단 집계 키 (RouteBlocker와 같은 키, 나머지는 tracker)
+CDP_BLOCKED_TYPES = {'Image': 'image', 'Media': 'media', 'Font': 'font'}
+
+# Playwright request.resource_type 기준으로 막을 종류
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font'}
+
+# 새 문서마다 실행: Resource Timing 버퍼 확대 + 첫 리뷰가 나타난 시각 기록
+METRICS_INIT_JS = '''
+(function() {
+    try { performance.setResourceTimingBufferSize(10000); } catch (e) {}
+    var selector = 'ul.RR2FSL9wTc > li.PxsZltB5tV, li[data-shp-contents-type="review"]';
+    var observer = new MutationObserver(function() {
+        if (!window.__crawlerFirstReviewAt && document.querySelector(selector)) {
+            window.__crawlerFirstReviewAt = performance.now();
+            observer.disconnect();
+        }
+    });
+    observer.observe(document, {childList: true, subtree: true});
+})();
+'''
+
+METRICS_JS = '''(function() {
+    return {firstReviewAt: window.__crawlerFirstReviewAt || null};
+})()'''
+
+
+def is_blocked_url(url):
+    """URL이 차단 대상인지 (Playwright용, 경로 확장자와 호스트를 직접 비교)"""
+    parsed = urlparse(url)
+    host = (parsed.hostname or '').lower()
+    if any(host == blocked or host.endswith('.' + blocked) for blocked in BLOCKED_HOSTS):
+        return True
+    path = parsed.path.lower()
+    return any(path.endswith('.' + ext) for ext in BLOCKED_EXTENSIONS)
+
+
+def apply_cdp(send, enabled=None):
+    """CDP 명령 함수 send(method, params)로 차단 패턴과 측정 스크립트 설정"""
+    enabled = ENABLED if enabled is None else enabled
+    send('Page.addScriptToEvaluateOnNewDocument', {'source': METRICS_INIT_JS})
+    if enabled:
+        send('Network.enable', {})
+        send('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+
+
+def apply_selenium(driver, enabled=None):
+    apply_cdp(driver.execute_cdp_cmd, enabled)
+
+
+def apply_drission(page, enabled=None):
+    """ChromiumPage 또는 ChromiumTab에 적용 (CDP 설정은 탭마다 따로)"""
+    apply_cdp(lambda method, params: page.run_cdp(method, **params), enabled)
+
+
+def selenium_logging_options(options):
+    """ChromeOptions에 Network 이벤트 performance 로그 설정 (Selenium 측정용)"""
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+    return options
+
+
+class NetworkMeter:
+    """CDP Network 이벤트로 한 번의 크롤링 동안의 요청 수, 전송량, 차단 건수 집계"""
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+        self.blocked = {}
+        self.poll = None     # 쌓인 이벤트를 가져오는 함수 (Selenium performance 로그)
+        self.stop = None     # 이벤트 구독 해제 함수
+        self.lock = threading.Lock()
+
+    def on_event(self, method, params):
+        with self.lock:
+            if method == 'Network.loadingFinished':
+                self.requests += 1
+                self.bytes += params.get('encodedDataLength') or 0
+            elif method == 'Network.loadingFailed':
+                self.requests += 1
+                if params.get('blockedReason'):
+                    key = CDP_BLOCKED_TYPES.get(params.get('type'), 'tracker')
+                    self.blocked[key] = self.blocked.get(key, 0) + 1
+
+
+METER_EVENTS = ('Network.loadingFinished', 'Network.loadingFailed')
+
+
+def _read_selenium_log(driver, meter=None):
+    """performance 로그를 비우면서 Network 이벤트를 meter에 반영"""
+    for entry in driver.get_log('performance'):
+        if meter is None:
+            continue
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, ValueError):
+            continue
+        if message.get('method') in METER_EVENTS:
+            meter.on_event(message['method'], message.get('params', {}))
+
+
+def _drission_handler(meter, method):
+    """DrissionPage 이벤트 콜백 (파라미터가 키워드 인자로 들어옴)"""
+    return lambda **params: meter.on_event(method, params)
+
+
+def start_metering(target, backend, meter=None):
+    """이번 크롤링의 Network 이벤트 집계 시작. NetworkMeter 반환 (구독 실패 시 None)
+
+    Selenium 드라이버, DrissionPage 탭, Playwright 페이지에 쓸 수 있으며,
+    meter를 넘기면 여러 탭의 이벤트를 하나로 모읍니다. collect_metrics()에서 집계를 끝냅니다.
+    """
+    meter = meter or NetworkMeter()
+    try:
+        if backend == 'selenium':
+            # 풀에서 재사용한 드라이버면 이전 크롤링의 로그를 먼저 비움
+            _read_selenium_log(target)
+            meter.poll = lambda: _read_selenium_log(target, meter)
+        elif backend == 'drission':
+            target.run_cdp('Network.enable')
+            for method in METER_EVENTS:
+                target.driver.set_callback(method, _drission_handler(meter, method))
+            previous_stop = meter.stop
+
+            def stop():
+                # 이미 닫힌 탭이면 driver 접근이 실패하므로 무시하고 나머지 탭도 해제
+                try:
+                    for method in METER_EVENTS:
+                        target.driver.set_callback(method, None)
+                except Exception:
+                    pass
+                if previous_stop:
+                    previous_stop()
+            meter.stop = stop
+        elif backend == 'playwright':
+            session = target.context.new_cdp_session(target)
+            session.send('Network.enable')
+            for method in METER_EVENTS:
+                session.on(method, lambda params, method=method: meter.on_event(method, params))
+            meter.stop = session.detach
+        else:
+            return None
+    except Exception as e:
+        print(f"[RESOURCE] Network metering unavailable ({backend}): {e}", file=sys.stderr)
+        return None
+    try:
+        target.crawler_network_meter = meter
+    except AttributeError:
+        pass
+    return meter
+
+
+class RouteBlocker:
+    """Playwright route 핸들러 (차단 건수를 종류별로 집계)"""
+
+    def __init__(self):
+        self.blocked = {}
+
+    def __call__(self, route):
+        request = route.request
+        resource_type = request.resource_type
+        if resource_type in BLOCKED_RESOURCE_TYPES or is_blocked_url(request.url):
+            key = resource_type if resource_type in BLOCKED_RESOURCE_TYPES else 'tracker'
+            self.blocked[key] = self.blocked.get(key, 0) + 1
+            return route.abort()
+        return route.continue_()
+
+
+def apply_playwright(context, enabled=None):
+    """BrowserContext에 적용. 차단 건수를 담는 RouteBlocker 반환 (차단하지 않으면 None)"""
+    enabled = ENABLED if enabled is None else enabled
+    context.add_init_script(METRICS_INIT_JS)
+    if not enabled:
+        return None
+    blocker = RouteBlocker()
+    context.route('**/*', blocker)
+    return blocker
+
+
+def collect_metrics(target, backend, blocker=None, enabled=None):
+    """이번 크롤링의 요청 수, 전송량, 차단 건수, 첫 리뷰 표시 시간 (측정 실패 시 None)
+
+    start_metering()으로 집계를 시작한 경우에만 요청/전송량/차단 건수가 들어가며,
+    Playwright의 차단 건수는 route 핸들러(blocker) 집계를 사용합니다.
+    """
+    from crawl_wait import evaluate
+
+    enabled = ENABLED if enabled is None else enabled
+    meter = getattr(target, 'crawler_network_meter', None)
+    if meter is not None:
+        target.crawler_network_meter = None
+        try:
+            if meter.poll:
+                meter.poll()
+            if meter.stop:
+                meter.stop()
+        except Exception as e:
+            print(f"[RESOURCE] Network metering error: {e}", file=sys.stderr)
+
+    try:
+        raw = evaluate(target, METRICS_JS) or {}
+    except Exception:
+        raw = {}
+    if meter is None and not raw and blocker is None:
+        return None
+
+    metrics = {
+        "blocking": enabled,
+        "first_review_ms": round(raw['firstReviewAt']) if raw.get('firstReviewAt') else None,
+    }
+    if meter is not None:
+        metrics["requests"] = meter.requests
+        metrics["transferred_kb"] = round(meter.bytes / 1024, 1)
+    blocked = dict(blocker.blocked) if blocker is not None else (dict(meter.blocked) if meter is not None else None)
+    if blocked is not None:
+        metrics["blocked"] = blocked
+        metrics["blocked_requests"] = sum(blocked.values())
+    return metrics
@@ -0,0 +1,285 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+네이버 스마트스토어 리뷰 HTML 파서
+같은 CSS 선택자를 여러 파서 백엔드에서 실행할 수 있도록 분리했습니다.
+
+백엔드 (설치된 것 중 앞에서부터 자동 선택):
+    selectolax - 가장 빠름 (pip install selectolax)
+    lxml       - lxml + cssselect 필요
+    bs4        - 기존 BeautifulSoup(html.parser) 방식, 항상 사용 가능한 대체 수단
+
+CRAWLER_HTML_PARSER=selectolax|lxml|bs4 로 백엔드를 강제할 수 있습니다.
+파싱한 트리는 추출 전용이므로 옵션의 하위 요소는 복제 없이 제자리에서 제거합니다.
+"""
+
+import os
+import re
+
+
+# 페이지 전체 대신 리뷰 목록(ul)만 가져오는 스크립트 (없으면 null → page_source 사용)
+REVIEW_LIST_HTML_JS = """
+var list = document.querySelector('ul.RR2FSL9wTc')
+    || (document.querySelector('li[data-shp-contents-type="review"]') || {}).parentElement;
+return list ? list.outerHTML : null;
+"""
+
+# 옵션 영역에서 제외할 하위 요소 (주거형태 등)
+OPTION_EXCLUDE_SELECTOR = 'div.eWRrdDdSzW, div.RVbIFwX5dY'
+
+# 리뷰 내용이 아닌 뱃지 span (rnrf6Xo7x2는 스토어PICK, W1IZsaUmnu는 한달사용 뱃지)
+BADGE_CLASSES = ('rnrf6Xo7x2', 'W1IZsaUmnu')
+
+DATE_PATTERN = re.compile(r'\d{2,4}\.\d{1,2}\.\d{1,2}\.?$')
+
+
+def _join_text(parts, separator):
+    """get_text(separator, strip=True)와 같은 규칙으로 텍스트 조각을 합침"""
+    return separator.join(p.strip() for p in parts if p and p.strip())
+
+
+class SelectolaxBackend:
+    name = 'selectolax'
+
+    def __init__(self):
+        try:
+            from selectolax.lexbor import LexborHTMLParser as parser
+        except ImportError:
+            from selectolax.parser import HTMLParser as parser
+        self.parser = parser
+
+    def parse(self, html):
+        return self.parser(html)
+
+    def select(self, node, css):
+        return node.css(css)
+
+    def select_one(self, node, css):
+        return node.css_first(css)
+
+    def text(self, node, separator=''):
+        return _join_text(node.text(deep=True, separator='\x00').split('\x00'), separator)
+
+    def attr(self, node, name):
+        return node.attributes.get(name)
+
+    def classes(self, node):
+        return (node.attributes.get('class') or '').split()
+
+    def remove(self, node):
+        node.decompose()
+
+
+class LxmlBackend:
+    name = 'lxml'
+
+    def __init__(self):
+        import lxml.html
+        import cssselect  # noqa: F401 (lxml의 cssselect()에 필요)
+        self.html = lxml.html
+
+    def parse(self, html):
+        return self.html.document_fromstring(html)
+
+    def select(self, node, css):
+        return node.cssselect(css)
+
+    def select_one(self, node, css):
+        found = node.cssselect(css)
+        return found[0] if found else None
+
+    def text(self, node, separator=''):
+        return _join_text(node.itertext(), separator)
+
+    def attr(self, node, name):
+        return node.get(name)
+
+    def classes(self, node):
+        return (node.get('class') or '').split()
+
+    def remove(self, node):
+        node.drop_tree()
+
+
+class Bs4Backend:
+    name = 'bs4'
+
+    def __init__(self):
+        from bs4 import BeautifulSoup
+        self.soup = BeautifulSoup
+
+    def parse(self, html):
+        return self.soup(html, 'html.parser')
+
+    def select(self, node, css):
+        return node.select(css)
+
+    def select_one(self, node, css):
+        return node.select_one(css)
+
+    def text(self, node, separator=''):
+        return node.get_text(separator, strip=True)
+
+    def attr(self, node, name):
+        return node.get(name)
+
+    def classes(self, node):
+        return node.get('class', [])
+
+    def remove(self, node):
+        node.decompose()
+
+
+BACKENDS = {
+    'selectolax': SelectolaxBackend,
+    'lxml': LxmlBackend,
+    'bs4': Bs4Backend,
+}
+
+_backend_cache = {}
+
+
+def get_backend(name=None):
+    """파서 백엔드 반환. name이 없으면 환경변수 또는 설치된 가장 빠른 백엔드"""
+    name = name or os.environ.get('CRAWLER_HTML_PARSER') or None
+    candidates = [name] if name else list(BACKENDS)
+    for candidate in candidates:
+        if candidate in _backend_cache:
+            return _backend_cache[candidate]
+        if candidate not in BACKENDS:
+            raise ValueError(f"알 수 없는 HTML 파서: {candidate} (지원: {', '.join(BACKENDS)})")
+        try:
+            backend = BACKENDS[candidate]()
+        except ImportError:
+            if name:
+                raise
+            continue
+        _backend_cache[candidate] = backend
+        return backend
+    raise ImportError("사용 가능한 HTML 파서가 없습니다. (selectolax, lxml 또는 beautifulsoup4 설치 필요)")
+
+
+def extract_review_from_item(item, backend):
+    """개별 리뷰 아이템에서 데이터 추출 (제공된 HTML 구조 기반)
+
+    lxml 요소는 자식이 없으면 거짓으로 평가되므로 존재 여부는 항상 None과 비교합니다.
+    """
+    b = backend
+    try:
+        # 판매자 답변만 있는 아이템 건너뛰기
+        if b.select_one(item, 'div.AlfkEF45qI') is None:
+            return None
+
+        # === 평점 추출 === (em.n6zq2yy0KA)
+        rating = 5
+        rating_elem = b.select_one(item, 'em.n6zq2yy0KA')
+        if rating_elem is not None:
+            try:
+                rating = int(b.text(rating_elem))
+            except ValueError:
+                pass
+
+        # === 작성자 추출 === (div.Db9Dtnf7gY > strong.MX91DFZo2F)
+        author = "익명"
+        author_container = b.select_one(item, 'div.Db9Dtnf7gY')
+        if author_container is not None:
+            author_elem = b.select_one(author_container, 'strong.MX91DFZo2F')
+            if author_elem is not None:
+                author = b.text(author_elem)
+
+        # === 날짜 추출 === (div.Db9Dtnf7gY 내 두 번째 span.MX91DFZo2F)
+        date = ""
+        if author_container is not None:
+            # 작성자명과 날짜가 모두 span.MX91DFZo2F지만 날짜는 패턴으로 구분
+            for span in b.select(author_container, 'span.MX91DFZo2F'):
+                text = b.text(span)
+                # 날짜 패턴: YY.MM.DD. 또는 YYYY.MM.DD
+                if DATE_PATTERN.match(text):
+                    date = text.rstrip('.')
+                    break
+
+        # === 옵션 추출 === (div.b_caIle8kC)
+        option = ""
+        option_elem = b.select_one(item, 'div.b_caIle8kC')
+        if option_elem is not None:
+            # 주거형태 등 하위 요소 제거 (추출 전용 트리이므로 복제하지 않고 제자리에서 제거)
+            for sub in b.select(option_elem, OPTION_EXCLUDE_SELECTOR):
+                b.remove(sub)
+            option = b.text(option_elem, " ")
+
+        # === 리뷰 내용 추출 === (div.AlfkEF45qI > div.HakaEZ240l > div.KqJ8Qqw082 > span.MX91DFZo2F)
+        content = ""
+        # 사용자 리뷰 컨테이너 (판매자 답변 영역 제외)
+        review_container = b.select_one(item, 'div.AlfkEF45qI div.HakaEZ240l')
+        content_div = b.select_one(review_container, 'div.KqJ8Qqw082') if review_container is not None else None
+        if content_div is not None:
+            # 내용 span 찾기 (스토어PICK, 한달사용 뱃지 제외)
+            for span in b.select(content_div, 'span.MX91DFZo2F'):
+                span_classes = b.classes(span)
+                if not any(badge in span_classes for badge in BADGE_CLASSES):
+                    text = b.text(span)
+                    if len(text) > len(content):
+                        content = text
+
+        # 내용이 없으면 건너뛰기
+        if not content or len(content) < 5:
+            return None
+
+        # === 이미지 추출 === (div.s30AvhHfb0 img.UpImHAUeYJ)
+        images = []
+        img_container = b.select_one(item, 'div.s30AvhHfb0')
+        for img in (b.select(img_container, 'img.UpImHAUeYJ') if img_container is not None else []):
+            # data-src 속성을 우선 사용 (lazy loading)
+            src = b.attr(img, 'data-src') or b.attr(img, 'src')
+            if src and 'pstatic.net' in src:
+                # 타입 파라미터 제거하여 원본 이미지 URL 사용
+                clean_src = re.sub(r'\?type=.*$', '', src)
+                if clean_src not in images:
+                    images.append(clean_src)
+
+        # ID 생성 (data-shp-contents-id 사용)
+        review_id = b.attr(item, 'data-shp-contents-id') or f"{author}-{date}-{len(content)}"
+
+        return {
+            "id": str(review_id),
+            "content": content,
+            "author": author,
+            "date": date,
+            "rating": rating,
+            "option": option,
+            "images": images
+        }
+    except Exception:
+        return None
+
+
+def find_review_items(root, backend):
+    """리뷰 아이템 찾기 (여러 선택자 시도)"""
+    b = backend
+    # 1. data-shp-contents-type="review" 속성 (가장 정확)
+    items = b.select(root, 'li[data-shp-contents-type="review"]')
+
+    # 2. 클래스 기반 선택자
+    if not items:
+        items = b.select(root, 'ul.RR2FSL9wTc > li.PxsZltB5tV')
+
+    # 3. HTT4L8U0CU 내부의 리스트
+    if not items:
+        container = b.select_one(root, 'div.HTT4L8U0CU ul.RR2FSL9wTc')
+        if container is not None:
+            items = b.select(container, 'li')
+
+    return items
+
+
+def parse_reviews(html, backend=None):
+    """HTML(페이지 전체 또는 리뷰 ul 조각)에서 모든 리뷰 데이터 추출"""
+    if not isinstance(backend, (SelectolaxBackend, LxmlBackend, Bs4Backend)):
+        backend = get_backend(backend)
+    root = backend.parse(html)
+    results = []
+    for item in find_review_items(root, backend):
+        review = extract_review_from_item(item, backend)
+        if review:
+            results.append(review)
+    return results
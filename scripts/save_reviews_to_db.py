@@ -3,18 +3,46 @@
 """
 네이버 스마트스토어 리뷰를 SQLite 데이터베이스에 저장하는 스크립트
 중복 방지 기능 포함 (naverReviewId 기준)
+
+사용법:
+    python save_reviews_to_db.py [JSON파일] [상품URL] [--mode bulk|upsert|insert] [--batch-size N]
+    python naver_review_drission.py <상품URL> --ndjson | python save_reviews_to_db.py --ndjson --product-url <상품URL>
+
+    --mode bulk: (기본) 한 트랜잭션에서 executemany로 일괄 저장, 중복은 DB 유니크 인덱스가 처리
+    --mode upsert: 이미 저장된 리뷰도 내용/평점/옵션/이미지가 바뀌었으면 해당 행만 갱신
+    --mode insert: 기존 방식 (기존 ID 전체를 읽어 온 뒤 한 건씩 INSERT)
+    --ndjson: 크롤러의 NDJSON 출력을 읽으면서 batch-size개씩 바로 저장
 """
 
 import sqlite3
 import json
 import sys
 import os
+import io
+import re
+import hashlib
 from datetime import datetime
+from pathlib import Path
 import uuid
 
+from crawl_output import iter_ndjson_reviews
+
 # 데이터베이스 경로
 DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'prisma', 'prisma', 'dev.db')
 
+# 일괄 저장 시 executemany 한 번에 넘길 행 수
+BULK_BATCH_SIZE = 500
+
+SAVE_MODES = ('bulk', 'upsert', 'insert')
+
+INSERT_REVIEW_SQL = """
+    INSERT INTO Review (
+        id, source, author, content, rating, date, 
+        sentiment, topics, naverReviewId, option, images, productUrl,
+        createdAt, updatedAt
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 def generate_cuid():
     """Prisma cuid 형식과 유사한 ID 생성"""
     return 'c' + uuid.uuid4().hex[:24]
@@ -39,14 +67,262 @@ def parse_date(date_str):
     
     return datetime.now().isoformat()
 
+def connect_for_bulk(db_path=None):
+    """일괄 저장용 연결 (WAL + 쓰기 성능 PRAGMA)"""
+    conn = sqlite3.connect(db_path or DB_PATH, timeout=30)
+    # WAL: 저장 중에도 Next.js(Prisma)의 읽기가 막히지 않음 (설정은 DB 파일에 유지됨)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # WAL에서는 NORMAL로도 손상 없이 안전, 커밋마다 fsync하지 않음
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-20000")  # 약 20MB
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+def ensure_review_id_index(conn):
+    """ON CONFLICT(naverReviewId)에 필요한 유니크 인덱스 (Prisma 마이그레이션과 같은 이름)"""
+    conn.execute(
+        'CREATE UNIQUE INDEX IF NOT EXISTS "Review_naverReviewId_key" ON "Review"("naverReviewId")'
+    )
+
+def build_review_row(review, product_url, now):
+    """리뷰 dict를 INSERT_REVIEW_SQL 파라미터로 변환"""
+    images = review.get('images')
+    return (
+        generate_cuid(), "Naver SmartStore", review.get('author') or '익명', review.get('content') or '',
+        review.get('rating') or 5, parse_date(review.get('date')),
+        None, None, review.get('id'), review.get('option'),
+        json.dumps(images, ensure_ascii=False) if images else None, product_url,
+        now, now
+    )
+
+def review_fingerprint(content, rating, option, images):
+    """변경 감지용 지문 (내용, 평점, 옵션, 이미지의 16자리 해시)"""
+    # "4.5", "평점5"처럼 정수가 아닌 평점도 배치 전체를 깨뜨리지 않도록 문자열로 그대로 사용
+    try:
+        rating = int(rating or 0)
+    except (TypeError, ValueError):
+        rating = str(rating)
+    payload = json.dumps(
+        [content or '', rating, option or '', list(images or [])],
+        ensure_ascii=False, separators=(',', ':')
+    )
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=8).hexdigest()
+
+def ensure_fingerprint_table(conn):
+    """리뷰 지문 보조 테이블 (Prisma 스키마 밖, 없어지면 Review 행에서 다시 계산)"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS "ReviewFingerprint" (
+            "naverReviewId" TEXT NOT NULL PRIMARY KEY,
+            "fingerprint" TEXT NOT NULL
+        )
+    """)
+
+def get_stored_fingerprints(conn, review_ids):
+    """저장된 리뷰의 지문을 한 번의 쿼리로 조회 {naverReviewId: fingerprint}"""
+    placeholders = ','.join('?' * len(review_ids))
+    rows = conn.execute(f"""
+        SELECT r.naverReviewId, f.fingerprint, r.content, r.rating, r.option, r.images
+        FROM Review r LEFT JOIN ReviewFingerprint f ON f.naverReviewId = r.naverReviewId
+        WHERE r.naverReviewId IN ({placeholders})
+    """, review_ids).fetchall()
+    
+    stored = {}
+    for naver_review_id, fingerprint, content, rating, option, images in rows:
+        if not fingerprint:
+            # 지문이 없는 기존 행은 현재 값으로 계산 (첫 upsert에서 전체를 다시 쓰지 않도록)
+            try:
+                images = json.loads(images) if images else []
+            except ValueError:
+                images = []
+            fingerprint = review_fingerprint(content, rating, option, images)
+        stored[naver_review_id] = fingerprint
+    return stored
+
 def get_existing_review_ids(conn):
     """데이터베이스에서 기존 naverReviewId 목록 조회"""
     cursor = conn.cursor()
     cursor.execute("SELECT naverReviewId FROM Review WHERE naverReviewId IS NOT NULL")
     return set(row[0] for row in cursor.fetchall())
 
-def save_reviews_to_db(reviews, product_url=None):
+def get_known_review_ids(product_url):
+    """해당 상품으로 이미 저장된 naverReviewId 목록 (증분 크롤링 기준점)
+    
+    같은 상품이라도 쿼리스트링이 다른 URL로 저장될 수 있으므로 상품 번호로 비교합니다.
+    번호 뒤는 URL 끝, '?', '/'만 허용하여 /products/123이 /products/1234...와 섞이지 않게 합니다.
+    DB 파일이 없으면 새로 만들지 않고 빈 집합을 반환합니다.
+    """
+    match = re.search(r'/products/(\d+)', product_url or '')
+    try:
+        # mode=rw: 경로가 잘못되었을 때 빈 dev.db가 생기지 않도록 기존 파일만 연결
+        conn = sqlite3.connect(f"{Path(DB_PATH).resolve().as_uri()}?mode=rw", uri=True)
+    except sqlite3.OperationalError as e:
+        print(f"[DB] 기존 리뷰 DB를 열 수 없어 증분 기준점 없이 진행: {e}", file=sys.stderr)
+        return set()
+    try:
+        cursor = conn.cursor()
+        if match:
+            product_path = f"%/products/{match.group(1)}"
+            cursor.execute(
+                """SELECT naverReviewId FROM Review WHERE naverReviewId IS NOT NULL
+                   AND (productUrl LIKE ? OR productUrl LIKE ? OR productUrl LIKE ?)""",
+                (product_path, product_path + '?%', product_path + '/%')
+            )
+        else:
+            cursor.execute(
+                "SELECT naverReviewId FROM Review WHERE naverReviewId IS NOT NULL AND productUrl = ?",
+                (product_url,)
+            )
+        return set(row[0] for row in cursor.fetchall())
+    finally:
+        conn.close()
+
+def get_store_product_urls(store_name):
+    """리뷰를 저장한 적 있는 스토어 상품 URL 목록 (상품 번호별 하나, 정규화된 URL)"""
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        rows = conn.execute(
+            "SELECT DISTINCT productUrl FROM Review WHERE productUrl LIKE ?",
+            (f"%/{store_name}/products/%",)
+        ).fetchall()
+    finally:
+        conn.close()
+
+    product_ids = []
+    for (product_url,) in rows:
+        match = re.search(r'/products/(\d+)', product_url or '')
+        if match and match.group(1) not in product_ids:
+            product_ids.append(match.group(1))
+    return [f"https://smartstore.naver.com/{store_name}/products/{product_id}" for product_id in sorted(product_ids)]
+
+def save_reviews_bulk(reviews, product_url=None, batch_size=BULK_BATCH_SIZE, db_path=None):
+    """리뷰 일괄 저장 (한 트랜잭션, 중복은 ON CONFLICT로 DB가 건너뜀)
+    
+    기존 ID를 파이썬으로 읽어 오지 않으므로 저장 시간은 테이블 크기가 아니라 입력 건수에 비례합니다.
+    """
+    conn = connect_for_bulk(db_path)
+    try:
+        ensure_review_id_index(conn)
+        sql = INSERT_REVIEW_SQL.rstrip() + " ON CONFLICT(naverReviewId) DO NOTHING"
+        now = datetime.now().isoformat()
+        changes_before = conn.total_changes
+        
+        with conn:  # 전체를 하나의 트랜잭션으로 커밋 (오류 시 롤백)
+            for start in range(0, len(reviews), batch_size):
+                batch = reviews[start:start + batch_size]
+                conn.executemany(sql, [build_review_row(r, product_url, now) for r in batch])
+        
+        inserted_count = conn.total_changes - changes_before
+    finally:
+        conn.close()
+    
+    return {
+        "success": True,
+        "inserted": inserted_count,
+        "skipped": len(reviews) - inserted_count,
+        "total": len(reviews)
+    }
+
+def save_reviews_upsert(reviews, product_url=None, batch_size=BULK_BATCH_SIZE, db_path=None):
+    """변경 감지 저장: 새 리뷰는 추가하고, 지문이 달라진 기존 리뷰만 갱신
+    
+    갱신 대상 컬럼은 content, rating, option, images, updatedAt뿐이므로
+    sentiment, topics 등 분석 결과와 알림 관련 컬럼은 그대로 유지됩니다.
+    """
+    # 같은 ID가 여러 번 들어오면 마지막 것을 사용, ID가 없는 리뷰는 비교 없이 추가
+    by_id = {}
+    without_id = []
+    for review in reviews:
+        if review.get('id'):
+            by_id[str(review['id'])] = review
+        else:
+            without_id.append(review)
+    
+    conn = connect_for_bulk(db_path)
+    try:
+        ensure_review_id_index(conn)
+        ensure_fingerprint_table(conn)
+        insert_sql = INSERT_REVIEW_SQL.rstrip() + " ON CONFLICT(naverReviewId) DO NOTHING"
+        now = datetime.now().isoformat()
+        inserted_count = 0
+        updated_count = 0
+        
+        # IN (...) 파라미터 수 제한(구버전 SQLite 999개) 안쪽으로 유지
+        batch_size = min(batch_size, 900)
+        
+        with conn:  # 전체를 하나의 트랜잭션으로 커밋 (오류 시 롤백)
+            ids = list(by_id)
+            for start in range(0, len(ids), batch_size):
+                batch_ids = ids[start:start + batch_size]
+                stored = get_stored_fingerprints(conn, batch_ids)
+                
+                new_rows, changed_rows, fingerprints = [], [], []
+                for naver_review_id in batch_ids:
+                    review = by_id[naver_review_id]
+                    images = review.get('images') or []
+                    fingerprint = review_fingerprint(
+                        review.get('content'), review.get('rating') or 5, review.get('option'), images
+                    )
+                    old = stored.get(naver_review_id)
+                    if old is None:
+                        new_rows.append(build_review_row(review, product_url, now))
+                    elif old != fingerprint:
+                        changed_rows.append((
+                            review.get('content') or '', review.get('rating') or 5, review.get('option'),
+                            json.dumps(images, ensure_ascii=False) if images else None,
+                            now, naver_review_id
+                        ))
+                    else:
+                        continue
+                    fingerprints.append((naver_review_id, fingerprint))
+                
+                if new_rows:
+                    before = conn.total_changes
+                    conn.executemany(insert_sql, new_rows)
+                    inserted_count += conn.total_changes - before
+                if changed_rows:
+                    conn.executemany("""
+                        UPDATE Review SET content = ?, rating = ?, option = ?, images = ?, updatedAt = ?
+                        WHERE naverReviewId = ?
+                    """, changed_rows)
+                    updated_count += len(changed_rows)
+                if fingerprints:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO ReviewFingerprint (naverReviewId, fingerprint) VALUES (?, ?)",
+                        fingerprints
+                    )
+            
+            if without_id:
+                conn.executemany(insert_sql, [build_review_row(r, product_url, now) for r in without_id])
+                inserted_count += len(without_id)
+    finally:
+        conn.close()
+    
+    return {
+        "success": True,
+        "inserted": inserted_count,
+        "updated": updated_count,
+        "skipped": len(reviews) - inserted_count - updated_count,
+        "total": len(reviews)
+    }
+
+def save_reviews_to_db(reviews, product_url=None, mode='bulk', batch_size=BULK_BATCH_SIZE):
     """리뷰를 데이터베이스에 저장 (중복 방지)"""
+    if mode not in SAVE_MODES:
+        raise ValueError(f"알 수 없는 저장 모드: {mode} (지원: {', '.join(SAVE_MODES)})")
+    
+    if mode in ('bulk', 'upsert'):
+        try:
+            if mode == 'upsert':
+                return save_reviews_upsert(reviews, product_url, batch_size)
+            return save_reviews_bulk(reviews, product_url, batch_size)
+        except sqlite3.IntegrityError as e:
+            # 기존 데이터에 중복 ID가 있어 유니크 인덱스를 만들 수 없는 경우
+            print(f"일괄 저장 불가, 기존 방식으로 저장: {e}", file=sys.stderr)
+    
+    return save_reviews_one_by_one(reviews, product_url)
+
+def save_reviews_one_by_one(reviews, product_url=None):
+    """기존 방식: 기존 ID 전체를 읽어 와 비교하며 한 건씩 저장"""
     
     # 데이터베이스 연결
     conn = sqlite3.connect(DB_PATH)
@@ -54,7 +330,7 @@ def save_reviews_to_db(reviews, product_url=None):
     
     # 기존 리뷰 ID 조회
     existing_ids = get_existing_review_ids(conn)
-    print(f"기존 리뷰 수: {len(existing_ids)}")
+    print(f"기존 리뷰 수: {len(existing_ids)}", file=sys.stderr)
     
     inserted_count = 0
     skipped_count = 0
@@ -79,13 +355,7 @@ def save_reviews_to_db(reviews, product_url=None):
         now = datetime.now().isoformat()
         
         try:
-            cursor.execute("""
-                INSERT INTO Review (
-                    id, source, author, content, rating, date, 
-                    sentiment, topics, naverReviewId, option, images, productUrl,
-                    createdAt, updatedAt
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            cursor.execute(INSERT_REVIEW_SQL, (
                 review_id, source, author, content, rating, date,
                 None, None, naver_review_id, option, images, product_url,
                 now, now
@@ -95,9 +365,9 @@ def save_reviews_to_db(reviews, product_url=None):
         except sqlite3.IntegrityError as e:
             # UNIQUE 제약 조건 위반 (이미 존재하는 리뷰)
             skipped_count += 1
-            print(f"중복 리뷰 스킵: {naver_review_id}")
+            print(f"중복 리뷰 스킵: {naver_review_id}", file=sys.stderr)
         except Exception as e:
-            print(f"리뷰 저장 오류: {e}")
+            print(f"리뷰 저장 오류: {e}", file=sys.stderr)
     
     conn.commit()
     conn.close()
@@ -109,14 +379,81 @@ def save_reviews_to_db(reviews, product_url=None):
         "total": len(reviews)
     }
 
+def save_reviews_stream(lines, product_url=None, mode='bulk', batch_size=BULK_BATCH_SIZE):
+    """NDJSON 줄을 읽으면서 batch_size개씩 저장 (전체 리뷰를 메모리에 올리지 않음)"""
+    totals = {"success": True, "inserted": 0, "updated": 0, "skipped": 0, "total": 0}
+    batch = []
+    
+    def flush():
+        result = save_reviews_to_db(batch, product_url, mode, batch_size)
+        for key in ("inserted", "updated", "skipped", "total"):
+            totals[key] += result.get(key, 0)
+        print(f"{totals['total']}개 처리 (새로 저장 {totals['inserted']}개)", file=sys.stderr, flush=True)
+        batch.clear()
+    
+    for review in iter_ndjson_reviews(lines):
+        batch.append(review)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    
+    return totals
+
 def main():
     """메인 함수"""
     
+    mode = 'bulk'
+    batch_size = BULK_BATCH_SIZE
+    ndjson = False
+    product_url = None
+    
+    # 인자 파싱 (옵션을 제외한 나머지는 JSON파일, 상품URL 순서)
+    args = []
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] == '--mode' and i + 1 < len(sys.argv):
+            mode = sys.argv[i + 1]
+            i += 2
+        elif sys.argv[i] == '--batch-size' and i + 1 < len(sys.argv):
+            batch_size = max(1, int(sys.argv[i + 1]))
+            i += 2
+        elif sys.argv[i] == '--product-url' and i + 1 < len(sys.argv):
+            product_url = sys.argv[i + 1]
+            i += 2
+        elif sys.argv[i] == '--ndjson':
+            ndjson = True
+            i += 1
+        else:
+            args.append(sys.argv[i])
+            i += 1
+    
+    if mode not in SAVE_MODES:
+        print(json.dumps({"success": False, "error": f"알 수 없는 저장 모드: {mode}"}, ensure_ascii=False))
+        sys.exit(1)
+    
+    # NDJSON 스트림: 한 줄씩 읽으며 배치 단위로 바로 저장
+    if ndjson:
+        if len(args) > 1:
+            product_url = args[1]
+        try:
+            if args:
+                with open(args[0], 'r', encoding='utf-8-sig') as f:
+                    result = save_reviews_stream(f, product_url, mode, batch_size)
+            else:
+                stdin = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
+                result = save_reviews_stream(stdin, product_url, mode, batch_size)
+        except ValueError as e:
+            print(json.dumps({"success": False, "error": f"NDJSON 파싱 오류: {e}"}, ensure_ascii=False))
+            sys.exit(1)
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return
+    
     # JSON 데이터를 stdin에서 읽거나 파일에서 읽기
-    if len(sys.argv) > 1:
+    if args:
         # 파일 경로가 제공된 경우
-        json_file = sys.argv[1]
-        product_url = sys.argv[2] if len(sys.argv) > 2 else None
+        json_file = args[0]
+        product_url = args[1] if len(args) > 1 else product_url
         
         try:
             # 여러 인코딩 시도
@@ -141,14 +478,14 @@ def main():
         try:
             input_data = sys.stdin.read()
             data = json.loads(input_data)
-            product_url = None
         except Exception as e:
             print(json.dumps({"success": False, "error": f"JSON 파싱 오류: {e}"}))
             sys.exit(1)
     
     # 리뷰 데이터 추출
-    if isinstance(data, dict) and 'reviews' in data:
-        reviews = data['reviews']
+    if isinstance(data, dict) and ('reviews' in data or 'data' in data):
+        # 'data'는 Selenium 크롤러(naver_review_crawler.py)의 출력 형식
+        reviews = data['reviews'] if 'reviews' in data else data['data']
         product_url = data.get('product_url', product_url)
     elif isinstance(data, list):
         reviews = data
@@ -157,7 +494,7 @@ def main():
         sys.exit(1)
     
     # 데이터베이스에 저장
-    result = save_reviews_to_db(reviews, product_url)
+    result = save_reviews_to_db(reviews, product_url, mode, batch_size)
     print(json.dumps(result, ensure_ascii=False, indent=2))
 
 if __name__ == "__main__":
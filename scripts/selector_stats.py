@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+선택자/전략 성공 통계 (적응형 시도 순서)
+여러 선택자나 클릭 전략을 차례로 시도하는 곳에서, 최근에 성공했던 것부터 시도하도록 순서를 바꿉니다.
+네이버가 클래스명을 바꾸면 죽은 선택자는 몇 번의 실패 후 뒤로 밀려나고,
+매번 죽은 선택자와 타임아웃을 거친 뒤에야 동작하는 선택자에 도달하는 비용이 사라집니다.
+
+- 같은 동작을 하는 후보끼리 묶은 그룹(예: playwright.rating, drission.next_button)마다 후보별 성공/실패/소요 시간을 기록
+- 성공/실패 횟수는 최근 결과에 가중치를 두어 감쇠 (DECAY)
+- 통계는 crawl_cache.db의 selector_stats 테이블에 저장되어 다음 실행에서도 사용
+- 한 번도 시도하지 않은 후보는 원래 순서 그대로 중간(성공률 0.5)에 위치
+- record_exhausted=False로 호출하면 모든 후보가 실패했을 때(예: 마지막 페이지) 실패를 기록하지 않음
+
+CRAWLER_CACHE_DISABLED=1 이면 저장/불러오기 없이 현재 실행 안에서만 통계를 사용합니다.
+
+사용법:
+    python selector_stats.py            # 저장된 통계 출력 (JSON)
+    python selector_stats.py --reset    # 저장된 통계 삭제
+"""
+
+import sys
+import json
+import time
+import atexit
+import sqlite3
+import threading
+
+import crawl_cache
+
+
+# 기록할 때마다 기존 횟수에 곱하는 값 (작을수록 최근 결과에 민감)
+DECAY = 0.8
+
+# 시도한 적 없는 후보의 가상 성공률 = PRIOR_HITS / PRIOR_TOTAL
+PRIOR_HITS = 0.5
+PRIOR_TOTAL = 1.0
+
+
+class SelectorRegistry:
+    """선택자/전략별 성공 통계. 메모리에서 갱신하고 flush() 때 한 번에 저장"""
+
+    def __init__(self, persist=None):
+        self.persist = crawl_cache.ENABLED if persist is None else persist
+        self.stats = {}      # (group, key) -> {"hits", "misses", "attempts", "total_ms"}
+        self.dirty = {}      # (group, key) -> 저장 이후 늘어난 (attempts, total_ms)
+        self.loaded = False
+        self.lock = threading.Lock()
+
+    def _load(self):
+        if self.loaded:
+            return
+        self.loaded = True
+        if not self.persist:
+            return
+        try:
+            conn = connect()
+            try:
+                rows = conn.execute(
+                    "SELECT grp, selector, hits, misses, attempts, total_ms FROM selector_stats"
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[SELECTOR] Read error: {e}", file=sys.stderr)
+            return
+        for grp, selector, hits, misses, attempts, total_ms in rows:
+            self.stats[(grp, selector)] = {
+                "hits": hits, "misses": misses, "attempts": attempts, "total_ms": total_ms,
+            }
+
+    def score(self, group, key):
+        """감쇠 성공률 (시도한 적 없으면 PRIOR_HITS / PRIOR_TOTAL)"""
+        entry = self.stats.get((group, key))
+        if not entry:
+            return PRIOR_HITS / PRIOR_TOTAL
+        return (entry["hits"] + PRIOR_HITS) / (entry["hits"] + entry["misses"] + PRIOR_TOTAL)
+
+    def avg_ms(self, group, key):
+        entry = self.stats.get((group, key))
+        if not entry or not entry["attempts"]:
+            return 0.0
+        return entry["total_ms"] / entry["attempts"]
+
+    def ordered(self, group, candidates):
+        """성공률이 높은 순, 같으면 빠른 순, 그래도 같으면 원래 순서로 정렬한 후보 목록"""
+        with self.lock:
+            self._load()
+            indexed = list(enumerate(candidates))
+            indexed.sort(key=lambda pair: (
+                -round(self.score(group, pair[1]), 2), round(self.avg_ms(group, pair[1])), pair[0]
+            ))
+        return [candidate for _, candidate in indexed]
+
+    def record(self, group, key, hit, elapsed_ms):
+        with self.lock:
+            self._load()
+            entry = self.stats.setdefault((group, key), {"hits": 0.0, "misses": 0.0, "attempts": 0, "total_ms": 0.0})
+            entry["hits"] = entry["hits"] * DECAY + (1 if hit else 0)
+            entry["misses"] = entry["misses"] * DECAY + (0 if hit else 1)
+            entry["attempts"] += 1
+            entry["total_ms"] += elapsed_ms
+            attempts, total_ms = self.dirty.get((group, key), (0, 0.0))
+            self.dirty[(group, key)] = (attempts + 1, total_ms + elapsed_ms)
+
+    def first(self, group, candidates, attempt, record_exhausted=True):
+        """통계 순서대로 attempt(후보)를 실행하여 처음으로 참 값을 반환한 후보와 값을 반환
+
+        attempt에서 발생한 예외는 실패로 기록합니다. 모두 실패하면 (None, None).
+        record_exhausted=False면 모두 실패한 경우의 실패는 기록하지 않습니다
+        (선택자 문제가 아니라 대상이 원래 없는 경우, 예: 마지막 페이지의 다음 버튼).
+        """
+        misses = []
+        for candidate in self.ordered(group, candidates):
+            started = time.perf_counter()
+            try:
+                result = attempt(candidate)
+            except Exception:
+                result = None
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if not result:
+                misses.append((candidate, elapsed_ms))
+                continue
+            for missed, missed_ms in misses:
+                self.record(group, missed, False, missed_ms)
+            self.record(group, candidate, True, elapsed_ms)
+            return candidate, result
+        if record_exhausted:
+            for missed, missed_ms in misses:
+                self.record(group, missed, False, missed_ms)
+        return None, None
+
+    def flush(self):
+        """바뀐 통계를 DB에 저장 (감쇠 횟수는 덮어쓰고, 시도 횟수/시간은 누적)"""
+        with self.lock:
+            if not self.persist or not self.dirty:
+                self.dirty.clear()
+                return
+            rows = [
+                (grp, key, self.stats[(grp, key)]["hits"], self.stats[(grp, key)]["misses"],
+                 attempts, total_ms, time.time())
+                for (grp, key), (attempts, total_ms) in self.dirty.items()
+            ]
+            self.dirty.clear()
+        try:
+            conn = connect()
+            try:
+                with conn:
+                    conn.executemany("""
+                        INSERT INTO selector_stats (grp, selector, hits, misses, attempts, total_ms, updated_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(grp, selector) DO UPDATE SET
+                            hits = excluded.hits,
+                            misses = excluded.misses,
+                            attempts = attempts + excluded.attempts,
+                            total_ms = total_ms + excluded.total_ms,
+                            updated_at = excluded.updated_at
+                    """, rows)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[SELECTOR] Write error: {e}", file=sys.stderr)
+
+    def report(self):
+        """그룹별로 시도 순서대로 정렬한 통계"""
+        with self.lock:
+            self._load()
+            groups = {}
+            for (grp, key), entry in self.stats.items():
+                groups.setdefault(grp, []).append(key)
+        return {
+            grp: [
+                {
+                    "selector": key,
+                    "score": round(self.score(grp, key), 3),
+                    "attempts": self.stats[(grp, key)]["attempts"],
+                    "avg_ms": round(self.avg_ms(grp, key), 2),
+                }
+                for key in self.ordered(grp, sorted(keys))
+            ]
+            for grp, keys in sorted(groups.items())
+        }
+
+
+def connect():
+    """캐시 DB 연결 (selector_stats 테이블이 없으면 생성)"""
+    conn = crawl_cache.connect()
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS selector_stats (
+            grp TEXT NOT NULL,
+            selector TEXT NOT NULL,
+            hits REAL NOT NULL,
+            misses REAL NOT NULL,
+            attempts INTEGER NOT NULL,
+            total_ms REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (grp, selector)
+        )
+    """)
+    return conn
+
+
+_registry = None
+
+
+def get_registry():
+    """프로세스 공용 레지스트리 (종료 시 자동 저장)"""
+    global _registry
+    if _registry is None:
+        _registry = SelectorRegistry()
+        atexit.register(_registry.flush)
+    return _registry
+
+
+def first(group, candidates, attempt, record_exhausted=True):
+    """get_registry().first()의 축약형"""
+    return get_registry().first(group, candidates, attempt, record_exhausted)
+
+
+def flush():
+    if _registry is not None:
+        _registry.flush()
+
+
+def main():
+    reset = '--reset' in sys.argv[1:]
+
+    if reset:
+        try:
+            conn = connect()
+            try:
+                with conn:
+                    conn.execute("DELETE FROM selector_stats")
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[SELECTOR] Delete error: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps({"success": True, "reset": True}, ensure_ascii=False))
+        return
+
+    print(json.dumps(SelectorRegistry(persist=True).report(), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,15 @@ echo 2. 로그인 후 이 창은 닫지 마세요
 echo 3. 크롤링 페이지에서 "크롤링" 버튼을 클릭하세요
 echo.
 
-start chrome.exe --remote-debugging-port=9222 --user-data-dir="C:\selenium-chrome-profile"
+rem 포트를 지정하면 (start-chrome-debug.bat 9223) 포트별 프로필로 여러 개를 동시에 띄울 수 있음
+set PORT=%1
+set PROFILE=C:\selenium-chrome-profile-%PORT%
+if "%PORT%"=="" (
+    set PORT=9222
+    set PROFILE=C:\selenium-chrome-profile
+)
+
+start chrome.exe --remote-debugging-port=%PORT% --user-data-dir="%PROFILE%"
 
 echo.
 echo Chrome이 실행되었습니다.
@@ -1,7 +1,8 @@
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
-import time
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
 import urllib.request
 import os
 
@@ -26,15 +27,27 @@ url = "https://smartstore.naver.com/kproject/products/7024065775?nl-ts-pid=jg%2F
 driver.get(url)
 
 # ==========================================
-# [중요] 30초 대기 (이 시간 동안 캡차를 직접 풀어주세요)
-print("30초 대기 중입니다. 브라우저에서 캡차가 떴다면 직접 해결해주세요...")
-time.sleep(30) 
+# [중요] 최대 30초 대기 (이 시간 동안 캡차를 직접 풀어주세요)
+# 상세 이미지가 나타나면(캡차가 없거나 해결되면) 바로 진행합니다.
+print("최대 30초 대기 중입니다. 브라우저에서 캡차가 떴다면 직접 해결해주세요...")
+try:
+    WebDriverWait(driver, 30, poll_frequency=0.5).until(
+        lambda d: d.find_elements(By.CSS_SELECTOR, "div._23hmdt4MSk img")
+    )
+except TimeoutException:
+    pass
 # ==========================================
 
 # 스크롤 내려서 이미지 로딩 유도
 print("스크롤을 시작합니다.")
 driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-time.sleep(3)
+# 이미지가 모두 로드될 때까지 대기 (최대 3초)
+try:
+    WebDriverWait(driver, 3, poll_frequency=0.2).until(
+        lambda d: d.execute_script("return Array.from(document.images).every(function(img) { return img.complete; });")
+    )
+except TimeoutException:
+    pass
 
 # 이미지 수집 시작
 try: